@@ -0,0 +1,73 @@
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import importlib
+
+import fake_maya
+
+
+WORKERS = (1, 2, 4)
+SHOT_COUNT = 24
+SHOT_LENGTH = 100
+
+
+def build_shots(shots_cls, count, length):
+    """
+    :return: `count` back-to-back shots of `length` frames each.
+    :rtype: Shots
+    """
+    shots = shots_cls()
+    for row in range(count):
+        start = row * length
+        shots.insert_shot(row, "shot{:03}".format(row + 1), start, start + length - 1)
+    return shots
+
+def run(workers, count, length, open_seconds, frame_seconds):
+    """
+    Exports the same shots with every number of workers, using the stub worker,
+    printing the wall time and the number of exported shots.
+
+    :return: None
+    :rtype: None
+    """
+    fake_maya.install()
+    batch = importlib.import_module("gwScripts.tools.shots_data_manager.core.batch")
+    shots_module = importlib.import_module("gwScripts.tools.shots_data_manager.core.shots")
+    shots = build_shots(shots_module.Shots, count, length)
+
+    command = [
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_worker.py"),
+        '--open-seconds', str(open_seconds), '--frame-seconds', str(frame_seconds)
+    ]
+    print("{:>8} {:>8} {:>10} {:>9}".format("workers", "shots", "seconds", "exported"))
+    for worker_count in workers:
+        export_path = tempfile.mkdtemp()
+        try:
+            exporter = batch.BatchExporter(
+                "main.ma", export_path, workers=worker_count, command=command
+            )
+            with fake_maya.Timer() as timer:
+                results = list(exporter.export(shots))
+            exported = sum(1 for result in results if not result.error)
+            print("{:>8} {:>8} {:>10.4f} {:>9}".format(
+                worker_count, len(shots), timer.elapsed, exported
+            ))
+        finally:
+            shutil.rmtree(export_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the Shots Data Manager batch export.")
+    parser.add_argument('--workers', type=int, nargs='+', default=WORKERS,
+                        help="The numbers of worker processes to export with.")
+    parser.add_argument('--shots', type=int, default=SHOT_COUNT, help="The number of shots.")
+    parser.add_argument('--length', type=int, default=SHOT_LENGTH, help="The frames per shot.")
+    parser.add_argument('--open-seconds', type=float, default=1.0,
+                        help="The simulated time a worker takes to open the main file.")
+    parser.add_argument('--frame-seconds', type=float, default=0.001,
+                        help="The simulated time a worker takes to export a frame.")
+    args = parser.parse_args()
+    run(args.workers, args.shots, args.length, args.open_seconds, args.frame_seconds)
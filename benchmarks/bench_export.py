@@ -0,0 +1,148 @@
+
+import os
+import argparse
+import tempfile
+import importlib
+
+import fake_maya
+
+
+STRATEGIES = ('save', 'all', 'selected')
+SHOT_COUNT = 4
+SHOT_LENGTH = 100
+CHARACTERS = 20
+SET_GROUPS = 200
+NODES_PER_GROUP = 50
+CHANNELS = ('tx', 'ty', 'tz', 'rx', 'ry', 'rz')
+
+
+def build_fake_scene(scene, characters, set_groups, nodes_per_group, frames):
+    """
+    Builds a main file of animated character rigs and static set dressing,
+    each under its own DAG root, in the fake scene.
+
+    :return: The full paths of the characters' roots.
+    :rtype: list[str]
+    """
+    scene.new()
+    roots = []
+    for i in range(characters):
+        root = scene.add_node('transform', "char{}_grp".format(i))
+        roots.append(root)
+        for j in range(nodes_per_group):
+            node = scene.add_node('joint', "char{}_jnt{}".format(i, j), root)
+            for channel in CHANNELS:
+                scene.add_curve(
+                    "char{}_jnt{}_{}".format(i, j, channel),
+                    [(t, (t * (j + 1)) % 17) for t in range(0, frames, 5)],
+                    node, 'animCurveTA' if channel.startswith("r") else 'animCurveTL'
+                )
+    for i in range(set_groups):
+        root = scene.add_node('transform', "set{}_grp".format(i))
+        for j in range(nodes_per_group):
+            scene.add_node('mesh', "set{}_geo{}".format(i, j), root)
+    return roots
+
+def build_maya_scene(cmds, characters, set_groups, nodes_per_group, frames):
+    """
+    Builds the same main file as :func:`build_fake_scene`, in a real Maya scene.
+
+    :return: The full paths of the characters' roots.
+    :rtype: list[str]
+    """
+    cmds.file(new=True, force=True)
+    roots = []
+    for i in range(characters):
+        root = cmds.createNode('transform', name="char{}_grp".format(i))
+        roots.append(cmds.ls(root, long=True)[0])
+        for j in range(nodes_per_group):
+            node = cmds.createNode('joint', name="char{}_jnt{}".format(i, j), parent=root)
+            for channel in CHANNELS:
+                for t in range(0, frames, 5):
+                    cmds.setKeyframe(node, attribute=channel, t=t, v=(t * (j + 1)) % 17)
+    for i in range(set_groups):
+        root = cmds.createNode('transform', name="set{}_grp".format(i))
+        for j in range(nodes_per_group):
+            cmds.polyCube(name="set{}_geo{}".format(i, j))
+            cmds.parent("set{}_geo{}".format(i, j), root)
+    return roots
+
+def run(strategies, shot_count, shot_length, characters, set_groups, nodes_per_group, maya):
+    """
+    Exports the same shots from the same main file with every strategy,
+    printing the wall time per shot and, in the fake scene, the number of
+    nodes written per shot.
+
+    :return: None
+    :rtype: None
+    """
+    frames = shot_count * shot_length
+    if maya:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        import maya.cmds as cmds
+        scene = None
+        roots = build_maya_scene(cmds, characters, set_groups, nodes_per_group, frames)
+    else:
+        scene = fake_maya.install()
+        cmds = scene
+        roots = build_fake_scene(scene, characters, set_groups, nodes_per_group, frames)
+
+    export = importlib.import_module("gwScripts.tools.shots_data_manager.core.export")
+    shots = importlib.import_module("gwScripts.tools.shots_data_manager.core.shots").Shots()
+    for row in range(shot_count):
+        start = row * shot_length
+        shots.insert_shot(row, "shot{:03}".format(row + 1), start, start + shot_length - 1)
+
+    work_dir = tempfile.mkdtemp()
+    main_file = os.path.join(work_dir, "main.ma")
+    cmds.file(rename=main_file)
+    cmds.file(save=True, type='mayaAscii')
+
+    print("{:<10} {:>8} {:>14} {:>14}".format("strategy", "shots", "seconds/shot", "nodes/shot"))
+    for strategy in strategies:
+        export_path = os.path.join(work_dir, strategy)
+        os.makedirs(export_path)
+        exporter = export.ShotExporter(
+            main_file, export_path, normalize=0, strategy=strategy,
+            roots=roots if strategy == 'selected' else None
+        )
+        exporter.open_main_file()
+        if scene:
+            scene.exports.clear()
+            scene.disk = {main_file: scene.disk[main_file]}
+        with fake_maya.Timer() as timer:
+            for _ in exporter.export(shots):
+                pass
+        written = "-"
+        if scene:
+            files = list(scene.exports.values()) or [
+                state for path, state in scene.disk.items() if path != main_file
+            ]
+            written = sum(len(f) if isinstance(f, list) else len(f[1]) for f in files) // len(files)
+        print("{:<10} {:>8} {:>14.4f} {:>14}".format(
+            strategy, len(shots), timer.elapsed / len(shots), written
+        ))
+
+    if maya:
+        maya.standalone.uninitialize()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Shots Data Manager export strategies."
+    )
+    parser.add_argument('--strategies', nargs='+', default=STRATEGIES, choices=STRATEGIES)
+    parser.add_argument('--shots', type=int, default=SHOT_COUNT, help="The number of shots.")
+    parser.add_argument('--length', type=int, default=SHOT_LENGTH, help="The frames per shot.")
+    parser.add_argument('--characters', type=int, default=CHARACTERS,
+                        help="The number of animated character roots, which are exported.")
+    parser.add_argument('--sets', type=int, default=SET_GROUPS,
+                        help="The number of static set dressing roots, which aren't.")
+    parser.add_argument('--nodes', type=int, default=NODES_PER_GROUP,
+                        help="The number of nodes under each root.")
+    parser.add_argument('--maya', action='store_true',
+                        help="Run in a real Maya session, with mayapy, instead of the fake scene.")
+    args = parser.parse_args()
+    run(args.strategies, args.shots, args.length, args.characters, args.sets, args.nodes,
+        args.maya)
@@ -0,0 +1,103 @@
+
+import random
+import argparse
+import importlib
+
+import fake_maya
+
+
+SIZES = ((1000, 1000), (10000, 1000))
+SHOT = (2500, 7499)
+NORMALIZE = 1001
+TANGENTS = (2, 5, 17, 18)
+
+
+def build_curves(kernel, curve_count, key_count, seed=0):
+    """
+    Builds curves keyed on random whole frames, so that some keys land on
+    the cut frames, with random tangent types, and a few edge cases; empty
+    curves, single keys, and curves entirely before or after the shot.
+
+    :return: The curves, packed for the scalar and the vectorized kernels.
+    :rtype: tuple[PackedCurves, PackedCurves]
+    """
+    rng = random.Random(seed)
+    curves = []
+    for i in range(curve_count):
+        count = (0, 1, key_count)[i % 3] if i < 30 else key_count
+        first = rng.choice((0, 0, 0, SHOT[1] + 1)) if i < 60 else 0
+        times = sorted(rng.sample(range(first, first + key_count * 10), count))
+        curves.append((
+            [float(t) for t in times],
+            [rng.uniform(-100, 100) for _ in times],
+            [rng.choice(TANGENTS) for _ in times],
+            [rng.choice(TANGENTS) for _ in times],
+        ))
+    return (kernel.PackedCurves.pack(curves, use_numpy=False),
+            kernel.PackedCurves.pack(curves))
+
+def compare(expected, actual, tolerance=1e-9):
+    """
+    :return: The number of curves whose keys or tangents differ.
+    :rtype: int
+    """
+    mismatched = 0
+    for i in range(len(expected)):
+        start, end = expected.offsets[i], expected.offsets[i + 1]
+        a_start, a_end = int(actual.offsets[i]), int(actual.offsets[i + 1])
+        if end - start != a_end - a_start or any(
+            abs(expected.times[j] - actual.times[k]) > tolerance
+            or abs(expected.values[j] - actual.values[k]) > tolerance
+            or expected.in_tangents[j] != actual.in_tangents[k]
+            or expected.out_tangents[j] != actual.out_tangents[k]
+            for j, k in zip(range(start, end), range(a_start, a_end))
+        ):
+            mismatched += 1
+    return mismatched
+
+def run(sizes, scalar):
+    """
+    Cuts a single shot out of every size of curves with both kernels,
+    printing their wall times and the number of curves they disagree on.
+
+    :return: None
+    :rtype: None
+    """
+    fake_maya.install()
+    kernel = importlib.import_module("gwScripts.tools.shots_data_manager.core.kernel")
+    if kernel.numpy is None:
+        print("NumPy isn't installed, only the scalar kernel is benchmarked.")
+
+    print("{:>8} {:>8} {:>12} {:>12} {:>10}".format(
+        "curves", "keys", "scalar (s)", "numpy (s)", "mismatched"
+    ))
+    for curve_count, key_count in sizes:
+        scalar_curves, packed_curves = build_curves(kernel, curve_count, key_count)
+        expected = None
+        scalar_time = vector_time = "-"
+        if scalar or kernel.numpy is None:
+            with fake_maya.Timer() as timer:
+                expected = kernel.trim_curves_scalar(scalar_curves, SHOT[0], SHOT[1],
+                                                     NORMALIZE - SHOT[0])
+            scalar_time = "{:.4f}".format(timer.elapsed)
+
+        mismatched = "-"
+        if kernel.numpy is not None:
+            with fake_maya.Timer() as timer:
+                actual = kernel.trim_curves(packed_curves, SHOT[0], SHOT[1], NORMALIZE - SHOT[0])
+            vector_time = "{:.4f}".format(timer.elapsed)
+            if expected is not None:
+                mismatched = compare(expected, actual)
+        print("{:>8} {:>8} {:>12} {:>12} {:>10}".format(
+            curve_count, key_count, scalar_time, vector_time, mismatched
+        ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the shot cut kernels.")
+    parser.add_argument('--sizes', nargs='+', default=["{}x{}".format(*s) for s in SIZES],
+                        help="The sizes to cut, as CURVESxKEYS.")
+    parser.add_argument('--no-scalar', dest='scalar', action='store_false',
+                        help="Skip the scalar reference, and the comparison with it.")
+    args = parser.parse_args()
+    run([tuple(int(n) for n in size.split("x")) for size in args.sizes], args.scalar)
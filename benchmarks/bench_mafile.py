@@ -0,0 +1,136 @@
+
+import os
+import random
+import shutil
+import argparse
+import tempfile
+import importlib
+import tracemalloc
+
+import fake_maya
+
+
+CURVES = (1000, 10000, 50000)
+KEYS_PER_CURVE = 100
+SHOT = (250, 749)
+NORMALIZE = 1001
+
+
+def write_main_file(path, curve_count, key_count, seed=0):
+    """
+    Writes a Maya ASCII main file with `curve_count` linear anim curves
+    of `key_count` keys each, keyed every 10 frames.
+
+    :return: The (name, keys) of each curve.
+    :rtype: list[tuple[str, list[tuple[float, float]]]]
+    """
+    rng = random.Random(seed)
+    curves = []
+    with open(path, 'w') as f:
+        f.write('//Maya ASCII 2022 scene\n//Name: main.ma\nrequires maya "2022";\n')
+        f.write('currentUnit -l centimeter -a degree -t film;\n')
+        for i in range(curve_count):
+            name = "node{}_translateX".format(i)
+            keys = [(float(t * 10), round(rng.uniform(-100, 100), 3)) for t in range(key_count)]
+            curves.append((name, keys))
+            f.write('createNode animCurveTL -n "{}";\n'.format(name))
+            f.write('\trename -uid "{:08X}-0000-0000-0000-000000000000";\n'.format(i))
+            f.write('\tsetAttr ".tan" 2;\n\tsetAttr ".wgt" no;\n')
+            pairs = ["{:g} {:g}".format(t, v) for t, v in keys]
+            f.write('\tsetAttr -s {} ".ktv[0:{}]"  {};\n'.format(
+                key_count, key_count - 1,
+                "\n\t\t ".join(" ".join(pairs[j:j+10]) for j in range(0, key_count, 10))
+            ))
+        f.write('createNode script -n "sceneConfigurationScriptNode";\n')
+        f.write('\tsetAttr ".b" -type "string" '
+                '"playbackOptions -min 0 -max {0} -ast 0 -aet {0} ";\n'.format(key_count * 10))
+    return curves
+
+def read_keys(path):
+    """
+    :return: The keys of each anim curve in a Maya ASCII file written by the splitter.
+    :rtype: dict[str, list[tuple[float, float]]]
+    """
+    mafile = importlib.import_module("gwScripts.tools.shots_data_manager.core.mafile")
+    with open(path) as f:
+        return dict(
+            (kind[1], [(time, float(value)) for time, value in zip(block.times, block.values)])
+            for kind, lines in mafile._blocks(f) if kind
+            for block in [mafile.AnimCurveBlock(kind[0], kind[1], lines)]
+        )
+
+def check(scene, curves, path, start, end, normalize):
+    """
+    Compares the split shot with `Controller.apply_shot` on the same keys in the fake scene.
+
+    :return: The number of curves whose keys differ.
+    :rtype: int
+    """
+    controller = importlib.import_module("gwScripts.tools.shots_data_manager.ui.controller")
+    scene.new()
+    for name, keys in curves:
+        scene.add_curve(name, keys)
+    controller.Controller.apply_shot(start, end, normalize)
+
+    split = read_keys(path)
+    mismatched = 0
+    for name, _ in curves:
+        expected = scene.keys(name)
+        actual = split.get(name, [])
+        if len(expected) != len(actual) or any(
+            abs(t0 - t1) > 1e-6 or abs(v0 - v1) > 1e-6
+            for (t0, v0), (t1, v1) in zip(expected, actual)
+        ):
+            mismatched += 1
+    return mismatched
+
+def run(sizes, key_count, verify):
+    """
+    Splits a single shot out of main files of every size, printing the wall time,
+    the throughput and the peak memory of the split, measured in a second run.
+
+    :return: None
+    :rtype: None
+    """
+    scene = fake_maya.install()
+    mafile = importlib.import_module("gwScripts.tools.shots_data_manager.core.mafile")
+
+    print("{:>8} {:>10} {:>10} {:>10} {:>12} {:>10}".format(
+        "curves", "file MB", "seconds", "MB/s", "peak mem MB", "mismatched"
+    ))
+    work_dir = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            main_file = os.path.join(work_dir, "main.ma")
+            curves = write_main_file(main_file, size, key_count)
+            megabytes = os.path.getsize(main_file) / 1024.0 / 1024.0
+
+            splitter = mafile.MaShotSplitter(main_file, work_dir, NORMALIZE)
+            with fake_maya.Timer() as timer:
+                result = splitter.export_shot("shot", SHOT[0], SHOT[1])
+            tracemalloc.start()
+            splitter.export_shot("shot", SHOT[0], SHOT[1])
+            peak = tracemalloc.get_traced_memory()[1] / 1024.0 / 1024.0
+            tracemalloc.stop()
+
+            mismatched = "-"
+            if verify:
+                mismatched = check(scene, curves, result.file_path, SHOT[0], SHOT[1], NORMALIZE)
+            print("{:>8} {:>10.1f} {:>10.4f} {:>10.1f} {:>12.2f} {:>10}".format(
+                size, megabytes, timer.elapsed, megabytes / timer.elapsed, peak, mismatched
+            ))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Benchmark splitting shots out of Maya ASCII files without Maya."
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=CURVES,
+                        help="The numbers of anim curves in the main file.")
+    parser.add_argument('--keys', type=int, default=KEYS_PER_CURVE, help="The keys per curve.")
+    parser.add_argument('--check', action='store_true',
+                        help="Compare the split keys with Controller.apply_shot in the fake scene.")
+    args = parser.parse_args()
+    run(args.sizes, args.keys, args.check)
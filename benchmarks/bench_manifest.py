@@ -0,0 +1,108 @@
+
+import os
+import shutil
+import argparse
+import tempfile
+import importlib
+from collections import OrderedDict
+
+import fake_maya
+from bench_export import build_fake_scene
+
+
+SHOT_COUNT = 60
+SHOT_LENGTH = 100
+CHARACTERS = 2
+NODES_PER_GROUP = 10
+
+
+def export(modules, scene, main_file, export_path, shots, incremental):
+    """
+    Runs the same export as the tool's window; when incremental, fingerprints the shots,
+    skips the current ones, exports the rest and records them in the manifest,
+    otherwise exports every shot and forgets them from the manifest.
+    The fake scene saves to memory, so each exported shot is also written to disk.
+
+    :return: The number of exported shots.
+    :rtype: int
+    """
+    curves, export_module, manifest_module = modules
+    manifest = manifest_module.Manifest.load(export_path)
+    inputs = None
+    if incremental:
+        inputs = manifest_module.shot_inputs(
+            shots, manifest_module.fingerprint_shots(curves.query_curve_keys(), shots),
+            OrderedDict([('MainFile', main_file), ('Normalize', 0)])
+        )
+        shots, _ = manifest.outdated(shots, inputs)
+
+    exported = 0
+    exporter = export_module.ShotExporter(main_file, export_path, normalize=0)
+    for result in exporter.export(shots):
+        with open(result.file_path, 'w') as f:
+            f.write(repr(scene.disk[result.file_path]))
+        manifest.record(result, inputs.get(result.shot_name) if inputs else None)
+        exported += 1
+    manifest.save()
+    return exported
+
+def run(shot_count, shot_length, characters, nodes_per_group):
+    """
+    Exports every shot, then edits the animation of a single shot and
+    exports again, in full and incrementally, printing the wall times.
+
+    :return: None
+    :rtype: None
+    """
+    scene = fake_maya.install()
+    modules = [importlib.import_module("gwScripts.tools.shots_data_manager.core." + name)
+               for name in ("curves", "export", "manifest")]
+    shots = importlib.import_module("gwScripts.tools.shots_data_manager.core.shots").Shots()
+    for row in range(shot_count):
+        start = row * shot_length
+        shots.insert_shot(row, "shot{:03}".format(row + 1), start, start + shot_length - 1)
+
+    build_fake_scene(scene, characters, 0, nodes_per_group, shot_count * shot_length)
+    work_dir = tempfile.mkdtemp()
+    try:
+        main_file = os.path.join(work_dir, "main.ma")
+        scene.file(rename=main_file)
+        scene.file(save=True, type='mayaAscii')
+
+        print("{:<28} {:>10} {:>10}".format("export", "shots", "seconds"))
+        with fake_maya.Timer() as timer:
+            # nothing was recorded yet, so every shot is exported, and recorded
+            exported = export(modules, scene, main_file, work_dir, shots, incremental=True)
+        print("{:<28} {:>10} {:>10.3f}".format("full", exported, timer.elapsed))
+
+        # move a key in the middle of a shot, and save the main file
+        middle = shot_count // 2 * shot_length + shot_length // 2
+        curve = "char0_jnt0_tx"
+        keys = [(t, v + 1.0 if t == middle else v) for t, v in scene.keys(curve)]
+        scene.delete(curve)
+        scene.add_curve(curve, keys, "char0_grp|char0_jnt0")
+        scene.file(save=True, type='mayaAscii')
+
+        for incremental in (True, False):
+            with fake_maya.Timer() as timer:
+                exported = export(modules, scene, main_file, work_dir, shots, incremental)
+            print("{:<28} {:>10} {:>10.3f}".format(
+                "after edit, " + ("incremental" if incremental else "full"),
+                exported, timer.elapsed
+            ))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Benchmark re-exporting shots with the export manifest."
+    )
+    parser.add_argument('--shots', type=int, default=SHOT_COUNT, help="The number of shots.")
+    parser.add_argument('--length', type=int, default=SHOT_LENGTH, help="The frames per shot.")
+    parser.add_argument('--characters', type=int, default=CHARACTERS,
+                        help="The number of animated character roots.")
+    parser.add_argument('--nodes', type=int, default=NODES_PER_GROUP,
+                        help="The number of joints under each character.")
+    args = parser.parse_args()
+    run(args.shots, args.length, args.characters, args.nodes)
@@ -0,0 +1,99 @@
+
+import os
+import json
+import shutil
+import argparse
+import tempfile
+import importlib
+from collections import OrderedDict
+
+import fake_maya
+
+
+SIZES = (1000, 10000)
+REPEATS = 5
+
+
+def build_preset(preset_module, shots_module, file_path, shot_count):
+    """
+    :return: A preset of back to back shots, 100 frames each.
+    :rtype: Preset
+    """
+    shots = shots_module.Shots()
+    for row in range(shot_count):
+        shots.insert_shot(row, "shot{:05}".format((row + 1) * 10), row * 100, row * 100 + 99)
+    preset = preset_module.Preset(file_path)
+    preset.shots = shots
+    return preset
+
+def legacy_load(preset_module, shots_module, file_path):
+    """
+    Loads a preset the way it was loaded before the shots were parsed in one pass;
+    an OrderedDict per shot, merged into the preset, then copied into the shots.
+
+    :rtype: Preset
+    """
+    with open(file_path, 'r') as f:
+        loaded_data = json.load(f, object_pairs_hook=OrderedDict)
+    preset = preset_module.Preset(file_path)
+    preset.update(loaded_data)
+    preset.shots = shots_module.Shots.from_dict(preset.shots)
+    return preset
+
+def best_time(func, repeats):
+    """
+    :return: The fastest wall time of the given calls.
+    :rtype: float
+    """
+    times = []
+    for _ in range(repeats):
+        with fake_maya.Timer() as timer:
+            func()
+        times.append(timer.elapsed)
+    return min(times)
+
+def run(sizes, repeats):
+    """
+    Saves and loads presets of growing shot counts, indented and compact,
+    printing the best wall times and file sizes, along with the loading time
+    of the previous merge-then-copy loading for comparison.
+
+    :return: None
+    :rtype: None
+    """
+    fake_maya.install()
+    preset_module = importlib.import_module("gwScripts.tools.shots_data_manager.core.preset")
+    shots_module = importlib.import_module("gwScripts.tools.shots_data_manager.core.shots")
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        print("{:>8} {:<10} {:>10} {:>10} {:>12} {:>10}".format(
+            "shots", "format", "save (s)", "load (s)", "legacy (s)", "size (KB)"
+        ))
+        for shot_count in sizes:
+            for compact in (False, True):
+                file_path = os.path.join(work_dir, "preset_{}_{}.json".format(shot_count, compact))
+                preset = build_preset(preset_module, shots_module, file_path, shot_count)
+                save = best_time(lambda: preset.save(compact=compact), repeats)
+                load = best_time(lambda: preset_module.Preset.load(file_path), repeats)
+                legacy = ("{:>12.4f}".format(best_time(
+                    lambda: legacy_load(preset_module, shots_module, file_path), repeats
+                )) if not compact else "{:>12}".format("-"))
+                loaded = preset_module.Preset.load(file_path)
+                assert loaded.shots == preset.shots, "The loaded shots differ from the saved ones."
+                print("{:>8} {:<10} {:>10.4f} {:>10.4f} {} {:>10.1f}".format(
+                    shot_count, "compact" if compact else "indented", save, load, legacy,
+                    os.path.getsize(file_path) / 1024.0
+                ))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark saving and loading presets.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help="The numbers of shots to save and load.")
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help="The number of times each operation is timed, keeping the best.")
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
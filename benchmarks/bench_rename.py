@@ -0,0 +1,82 @@
+
+import argparse
+import importlib
+
+import fake_maya
+
+
+SIZES = (100, 1000, 10000, 100000)
+CHAIN_LENGTH = 10
+
+
+def build_scene(scene, size):
+    """
+    Builds `size` joints in chains of `CHAIN_LENGTH`, under a single group.
+
+    :return: The full paths of the group and of the joints, top-down.
+    :rtype: tuple[str, list[str]]
+    """
+    scene.new()
+    root = scene.add_node('transform', "rig_grp")
+    joints = []
+    parent = root
+    for i in range(size):
+        if i % CHAIN_LENGTH == 0:
+            parent = root
+        parent = scene.add_node('joint', "arm_l_jnt{}".format(i % CHAIN_LENGTH), parent)
+        joints.append(parent)
+    return root, joints
+
+def operations(core):
+    """
+    :return: The benchmarked operations as (name, operation, hierarchy) tuples,
+        where `hierarchy` selects the group instead of the joints.
+    :rtype: list[tuple[str, Callable, bool]]
+    """
+    return [
+        ('add_prefix', lambda: core.add_prefix("pre_"), False),
+        ('add_suffix', lambda: core.add_suffix("_suf"), False),
+        ('search_and_replace', lambda: core.search_and_replace("arm", "leg"), False),
+        ('search_and_replace (regex)',
+         lambda: core.search_and_replace(r"_l_(\w+?)(\d+)$", r"_L_\2\1", regex=True), False),
+        ('rename_and_number', lambda: core.rename_and_number("jnt", 1, 6), False),
+        ('rename_with_template',
+         lambda: core.rename_with_template("{side}_{parent}_{type}_{index:06}"), False),
+        ('preview (add_prefix)', lambda: core.add_prefix("pre_", preview=True), False),
+        ('add_prefix (hierarchy)', lambda: core.add_prefix("pre_", hierarchy=True), True),
+    ]
+
+def run(sizes, names=None):
+    """
+    Runs every operation on every scene size, printing the wall time
+    and the number of calls made to each command.
+
+    :return: None
+    :rtype: None
+    """
+    scene = fake_maya.install()
+    core = importlib.import_module("gwScripts.tools.comet_rename_plus.core")
+
+    print("{:<28} {:>8} {:>10}  {}".format("operation", "nodes", "seconds", "command calls"))
+    for size in sizes:
+        for name, operation, hierarchy in operations(core):
+            if names and name not in names:
+                continue
+            root, joints = build_scene(scene, size)
+            scene.select(root if hierarchy else joints)
+            scene.reset_calls()
+            with fake_maya.Timer() as timer:
+                operation()
+            print("{:<28} {:>8} {:>10.4f}  {}".format(
+                name, size, timer.elapsed,
+                ", ".join("{}={}".format(k, v) for k, v in sorted(scene.calls.items()))
+            ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the Comet Rename Plus+ core.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help="The numbers of nodes to rename.")
+    parser.add_argument('--ops', nargs='+', help="Only run the operations with these names.")
+    args = parser.parse_args()
+    run(args.sizes, args.ops)
@@ -0,0 +1,637 @@
+
+import os
+import re
+import sys
+import copy
+import time
+import types
+import bisect
+from collections import Counter, OrderedDict
+
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+# packages that are registered bare, so that the modules under test
+# can be imported without running their GUI-heavy `__init__` files
+PACKAGES = (
+    "gwScripts",
+    "gwScripts.plugins",
+    "gwScripts.tools",
+    "gwScripts.tools.comet_rename_plus",
+    "gwScripts.tools.comet_rename_plus.ui",
+    "gwScripts.tools.shots_data_manager",
+    "gwScripts.tools.shots_data_manager.core",
+    "gwScripts.tools.shots_data_manager.ui",
+    "gwScripts.utils",
+)
+
+ANIM_CURVE_TYPES = ('animCurveTL', 'animCurveTA', 'animCurveTT', 'animCurveTU')
+
+_INVALID_CHARS = re.compile(r"[^A-Za-z0-9_:]")
+_TRAILING_DIGITS = re.compile(r"\d+$")
+
+
+class _Node(object):
+    """
+    A node of the fake scene.
+    """
+    __slots__ = ('uuid', 'name', 'type', 'dag', 'parent', 'children',
+                 'referenced', 'locked', 'times', 'values', 'angle', 'curves', 'attrs')
+
+    def __init__(self, uuid, name, node_type, dag, parent=None):
+        self.uuid = uuid
+        self.name = name
+        self.type = node_type
+        self.dag = dag
+        self.parent = parent
+        self.children = OrderedDict()
+        self.referenced = False
+        self.locked = False
+        self.times = []
+        self.values = []
+        self.angle = 0.0
+        self.curves = []
+        self.attrs = {}
+
+
+class FakeCmds(object):
+    """
+    An in-memory stand-in for the `maya.cmds` calls used by the gwScripts tools.
+    It simulates DAG path semantics (full paths, short names, sibling name
+    clashes and auto-suffixing), animation curves and scene files saved
+    in memory, and counts every command call in `calls`.
+    """
+    COMMANDS = (
+        'ls', 'select', 'rename', 'listRelatives', 'createNode', 'delete',
+        'keyframe', 'setKeyframe', 'cutKey', 'findKeyframe', 'referenceQuery',
+        'playbackOptions', 'file', 'undoInfo', 'undo', 'internalVar', 'about',
+        'listConnections', 'setAttr', 'getAttr', 'keyTangent',
+    )
+
+    def __init__(self):
+        self.calls = Counter()
+        self.disk = {}
+        self.exports = {}
+        self.new()
+
+    # --- scene building -------------------------------------------------
+
+    def new(self):
+        """
+        Resets the scene, keeping the files saved to the fake disk.
+        """
+        self._uuids = {}
+        self._names = {}
+        self._root = OrderedDict()
+        self._selection = []
+        self._next_uuid = 0
+        self._playback = {'min': 1.0, 'max': 120.0, 'ast': 1.0, 'aet': 120.0}
+        self._undo_stack = []
+        self._chunks = []
+        self.scene_name = ""
+        self.scene_type = None
+        self.modified = False
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def add_node(self, node_type, name, parent=None, dag=True):
+        """
+        Adds a node to the scene without counting a command call.
+
+        :return: The full path of the new node (its name for DG nodes).
+        :rtype: str
+        """
+        parent_node = self._resolve(parent) if parent else None
+        siblings = parent_node.children if parent_node else self._root
+        self._next_uuid += 1
+        uuid = "{:08X}-0000-0000-0000-000000000000".format(self._next_uuid)
+        node = _Node(uuid, self._unique(_legal(name), siblings), node_type, dag, parent_node)
+        siblings[node.name] = node
+        self._uuids[uuid] = node
+        self._names.setdefault(node.name, set()).add(node)
+        self.modified = True
+        return self._path(node)
+
+    def add_curve(self, name, keys, node=None, curve_type='animCurveTL', referenced=False,
+                  angle=0.0):
+        """
+        Adds an animation curve with the given (time, value) keys,
+        optionally driving the given node, and the tangent angle of all its keys.
+
+        :return: The name of the new curve.
+        :rtype: str
+        """
+        curve = self._uuids[self._uuid_of(self.add_node(curve_type, name, dag=False))]
+        keys = sorted(keys)
+        curve.times = [float(t) for t, _ in keys]
+        curve.values = [float(v) for _, v in keys]
+        curve.referenced = referenced
+        curve.angle = float(angle)
+        if node:
+            self._resolve(node).curves.append(curve)
+        return curve.name
+
+    def keys(self, curve):
+        """
+        :return: The (time, value) keys of a curve.
+        :rtype: list[tuple[float, float]]
+        """
+        node = self._resolve(curve)
+        return list(zip(node.times, node.values))
+
+    # --- internals ------------------------------------------------------
+
+    def _uuid_of(self, path):
+        return self._resolve(path).uuid
+
+    def _path(self, node):
+        if not node.dag:
+            return node.name
+        names = []
+        while node:
+            names.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(names))
+
+    def _display(self, node):
+        if len(self._names.get(node.name, ())) == 1:
+            return node.name
+        return self._path(node)
+
+    def _resolve(self, obj):
+        if isinstance(obj, _Node):
+            return obj
+        if obj in self._uuids:
+            return self._uuids[obj]
+        obj = obj.split(".")[0]
+        if "|" in obj:
+            parts = obj.strip("|").split("|")
+            if obj.startswith("|"):
+                node = self._root.get(parts[0])
+                for part in parts[1:]:
+                    node = node.children.get(part) if node else None
+                if node:
+                    return node
+            else:
+                matches = [n for n in self._names.get(parts[-1], ())
+                           if self._path(n).endswith("|" + obj)]
+                if len(matches) == 1:
+                    return matches[0]
+                if matches:
+                    raise ValueError("More than one object matches name: {}".format(obj))
+            raise ValueError("No object matches name: {}".format(obj))
+        matches = self._names.get(obj)
+        if not matches:
+            raise ValueError("No object matches name: {}".format(obj))
+        if len(matches) > 1:
+            raise ValueError("More than one object matches name: {}".format(obj))
+        return next(iter(matches))
+
+    def _objects(self, args):
+        objects = []
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                objects.extend(arg)
+            elif arg is not None:
+                objects.append(arg)
+        return objects
+
+    def _all_nodes(self):
+        stack = list(reversed(list(self._root.values())))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(list(node.children.values())))
+
+    def _descendants(self, node):
+        stack = list(reversed(list(node.children.values())))
+        while stack:
+            child = stack.pop()
+            yield child
+            stack.extend(reversed(list(child.children.values())))
+
+    def _curves(self, objects):
+        curves = []
+        for obj in objects:
+            node = self._resolve(obj)
+            curves.extend([node] if node.type in ANIM_CURVE_TYPES else node.curves)
+        return curves
+
+    @staticmethod
+    def _unique(name, siblings):
+        if name not in siblings:
+            return name
+        base = _TRAILING_DIGITS.sub("", name)
+        i = 1
+        while "{}{}".format(base, i) in siblings:
+            i += 1
+        return "{}{}".format(base, i)
+
+    @staticmethod
+    def _range(t):
+        if t is None:
+            return None
+        if isinstance(t, (list, tuple)):
+            if len(t) == 1 and isinstance(t[0], (list, tuple)):
+                t = t[0]
+            if len(t) == 2:
+                return float(t[0]), float(t[1])
+            return float(t[0]), float(t[0])
+        return float(t), float(t)
+
+    # --- commands -------------------------------------------------------
+
+    def ls(self, *args, **kwargs):
+        sl = kwargs.get('sl', kwargs.get('selection', False))
+        longname = kwargs.get('long', kwargs.get('l', False))
+        uuid = kwargs.get('uuid', False)
+        show_type = kwargs.get('showType', kwargs.get('st', False))
+        node_types = kwargs.get('type', kwargs.get('typ'))
+        referenced = kwargs.get('referencedNodes', kwargs.get('rn', False))
+        dag_only = kwargs.get('dag', False)
+        if isinstance(node_types, str):
+            node_types = (node_types,)
+
+        objects = self._objects(args)
+        if sl:
+            nodes = list(self._selection)
+        elif objects:
+            nodes, seen = [], set()
+            for obj in objects:
+                try:
+                    node = self._resolve(obj)
+                except ValueError:
+                    continue
+                if node.uuid not in seen:
+                    seen.add(node.uuid)
+                    nodes.append(node)
+        else:
+            nodes = list(self._all_nodes())
+
+        if node_types:
+            nodes = [node for node in nodes if node.type in node_types]
+        if referenced:
+            nodes = [node for node in nodes if node.referenced]
+        if dag_only:
+            nodes = [node for node in nodes if node.dag]
+
+        result = []
+        for node in nodes:
+            if uuid:
+                result.append(node.uuid)
+            else:
+                result.append(self._path(node) if longname else self._display(node))
+            if show_type:
+                result.append(node.type)
+        return result
+
+    def select(self, *args, **kwargs):
+        # selection changes are undoable in Maya, each is a step of its own outside of a chunk
+        if not self._chunks:
+            self._undo_stack.append(("select", _Selection(self._selection)))
+        if kwargs.get('clear', kwargs.get('cl', False)):
+            self._selection = []
+            return
+        nodes = [self._resolve(obj) for obj in self._objects(args)]
+        if kwargs.get('add', False):
+            self._selection = self._selection + [n for n in nodes if n not in self._selection]
+        else:
+            self._selection = nodes
+
+    def rename(self, obj, new_name, **kwargs):
+        node = self._resolve(obj)
+        new_name = _legal(new_name)
+        if not new_name:
+            raise RuntimeError("New name has no legal characters.")
+        if new_name == node.name:
+            return node.name
+        siblings = node.parent.children if node.parent else self._root
+        del siblings[node.name]
+        self._names[node.name].discard(node)
+        node.name = self._unique(new_name, siblings)
+        siblings[node.name] = node
+        self._names.setdefault(node.name, set()).add(node)
+        self.modified = True
+        return node.name
+
+    def listRelatives(self, *args, **kwargs):
+        full_path = kwargs.get('fullPath', kwargs.get('f', False))
+        result = []
+        for obj in self._objects(args):
+            node = self._resolve(obj)
+            if kwargs.get('allDescendents', kwargs.get('ad', False)):
+                # like Maya, all descendants are listed deepest-first
+                relatives = list(reversed(list(self._descendants(node))))
+            elif kwargs.get('parent', kwargs.get('p', False)):
+                relatives = [node.parent] if node.parent else []
+            else:
+                relatives = list(node.children.values())
+            result.extend(self._path(n) if full_path else self._display(n) for n in relatives)
+        return result or None
+
+    def createNode(self, node_type, name=None, parent=None, **kwargs):
+        dag = node_type not in ANIM_CURVE_TYPES
+        return self._display(self._resolve(
+            self.add_node(node_type, name or node_type + "1", parent, dag=dag)
+        ))
+
+    def delete(self, *args, **kwargs):
+        for obj in self._objects(args):
+            node = self._resolve(obj)
+            for child in [node] + list(self._descendants(node)):
+                self._uuids.pop(child.uuid, None)
+                self._names.get(child.name, set()).discard(child)
+                if child in self._selection:
+                    self._selection.remove(child)
+            siblings = node.parent.children if node.parent else self._root
+            siblings.pop(node.name, None)
+            for other in self._uuids.values():
+                if node in other.curves:
+                    other.curves.remove(node)
+        self.modified = True
+
+    def keyframe(self, *args, **kwargs):
+        curves = self._curves(self._objects(args))
+        t = self._range(kwargs.get('time', kwargs.get('t')))
+
+        def in_range(time):
+            return t is None or t[0] <= time <= t[1]
+
+        if kwargs.get('query', kwargs.get('q', False)):
+            if kwargs.get('keyframeCount', kwargs.get('kc', False)):
+                return sum(sum(1 for time in c.times if in_range(time)) for c in curves)
+            if kwargs.get('name', kwargs.get('n', False)):
+                return [c.name for c in curves if c.times] or None
+            values = kwargs.get('valueChange', kwargs.get('vc', False))
+            result = []
+            for curve in curves:
+                for time, value in zip(curve.times, curve.values):
+                    if in_range(time):
+                        result.append(value if values else time)
+            return result or None
+
+        if kwargs.get('edit', kwargs.get('e', False)):
+            offset = float(kwargs.get('timeChange', kwargs.get('tc', 0)))
+            for curve in curves:
+                if curve.locked:
+                    raise RuntimeError("Cannot edit the locked curve {}.".format(curve.name))
+                curve.times = [time + offset if in_range(time) else time for time in curve.times]
+            self.modified = True
+            return len(curves)
+
+    def setKeyframe(self, *args, **kwargs):
+        times = kwargs.get('time', kwargs.get('t'))
+        if not isinstance(times, (list, tuple)):
+            times = [times]
+        curves = self._curves(self._objects(args))
+        for curve in curves:
+            if curve.locked:
+                raise RuntimeError("Cannot set a keyframe on the locked curve {}.".format(curve.name))
+        for curve in curves:
+            for time in times:
+                _insert_key(curve, float(time))
+        self.modified = True
+        return len(curves) * len(times)
+
+    def cutKey(self, *args, **kwargs):
+        t = self._range(kwargs.get('time', kwargs.get('t')))
+        count = 0
+        for curve in self._curves(self._objects(args)):
+            if curve.locked:
+                raise RuntimeError("Cannot cut keys on the locked curve {}.".format(curve.name))
+            keep = [i for i, time in enumerate(curve.times) if t and not t[0] <= time <= t[1]]
+            count += len(curve.times) - len(keep)
+            curve.times = [curve.times[i] for i in keep]
+            curve.values = [curve.values[i] for i in keep]
+        self.modified = True
+        return count
+
+    def listConnections(self, *args, **kwargs):
+        """
+        Only follows curves to the nodes they drive, where the driven
+        attribute is named after the last part of the curve's name.
+        """
+        result = []
+        for obj in self._objects(args):
+            curve = self._resolve(obj)
+            for node in list(self._uuids.values()):
+                if curve in node.curves:
+                    plug = "{}.{}".format(self._display(node), curve.name.rpartition("_")[-1])
+                    if kwargs.get('connections', kwargs.get('c', False)):
+                        result.append(curve.name + ".output")
+                    result.append(plug if kwargs.get('plugs', kwargs.get('p')) else node.name)
+        return result or None
+
+    def setAttr(self, plug, value, **kwargs):
+        node, _, attr = plug.rpartition(".")
+        self._resolve(node).attrs[attr] = value
+        self.modified = True
+
+    def getAttr(self, plug, **kwargs):
+        node, _, attr = plug.rpartition(".")
+        return self._resolve(node).attrs.get(attr, 0.0)
+
+    def keyTangent(self, *args, **kwargs):
+        # the fake curves are linear, with unit weights and the same tangent angle on every key
+        curves = self._curves(self._objects(args))
+        keys = sum(len(c.times) for c in curves)
+        for flag in ('inTangentType', 'outTangentType', 'itt', 'ott'):
+            if kwargs.get(flag):
+                return ['linear'] * keys or None
+        for flag in ('inWeight', 'outWeight', 'iw', 'ow'):
+            if kwargs.get(flag):
+                return [1.0] * keys or None
+        return [c.angle for c in curves for _ in c.times] or None
+
+    def findKeyframe(self, *args, **kwargs):
+        times = [time for c in self._curves(self._objects(args)) for time in c.times]
+        if not times:
+            return 0.0
+        which = kwargs.get('which', kwargs.get('w', 'next'))
+        return min(times) if which == 'first' else max(times)
+
+    def referenceQuery(self, obj, **kwargs):
+        return self._resolve(obj).referenced
+
+    def playbackOptions(self, **kwargs):
+        if kwargs.pop('query', kwargs.pop('q', False)):
+            for key in kwargs:
+                return self._playback[{'minTime': 'min', 'maxTime': 'max',
+                                       'animationStartTime': 'ast',
+                                       'animationEndTime': 'aet'}.get(key, key)]
+        for key, value in kwargs.items():
+            self._playback[key] = float(value)
+
+    def file(self, *args, **kwargs):
+        if kwargs.get('query', kwargs.get('q', False)):
+            if kwargs.get('sceneName', kwargs.get('sn', False)):
+                return self.scene_name
+            if kwargs.get('modified', False):
+                return self.modified
+            if kwargs.get('type', kwargs.get('typ', False)):
+                return [self.scene_type] if self.scene_type else []
+            return None
+        if 'rename' in kwargs:
+            self.scene_name = kwargs['rename']
+            return self.scene_name
+        if 'modified' in kwargs:
+            self.modified = bool(kwargs['modified'])
+            return None
+        if kwargs.get('save', kwargs.get('s', False)):
+            if not self.scene_name:
+                raise RuntimeError("The scene has never been saved, use `rename` first.")
+            self.disk[self.scene_name] = self._state()
+            self.scene_type = kwargs.get('type', self.scene_type)
+            self.modified = False
+            return self.scene_name
+        if kwargs.get('exportAll', kwargs.get('ea', False)):
+            self.exports[args[0]] = self._serialize(self._all_nodes())
+            return args[0]
+        if kwargs.get('exportSelected', kwargs.get('es', False)):
+            nodes = []
+            for node in self._selection:
+                nodes.append(node)
+                nodes.extend(self._descendants(node))
+            nodes.extend([curve for node in list(nodes) for curve in node.curves])
+            self.exports[args[0]] = self._serialize(nodes)
+            return args[0]
+        if kwargs.get('open', kwargs.get('o', False)):
+            path = args[0]
+            if path not in self.disk:
+                raise RuntimeError("File not found: {}".format(path))
+            self._restore(self.disk[path])
+            self.scene_name = path
+            self.scene_type = 'mayaBinary' if path.lower().endswith('.mb') else 'mayaAscii'
+            self.modified = False
+            return path
+        if list(kwargs) == ['type']:
+            self.scene_type = kwargs['type']
+            return None
+        raise RuntimeError("Unsupported `file` flags: {}".format(sorted(kwargs)))
+
+    def undoInfo(self, **kwargs):
+        if kwargs.get('query', kwargs.get('q', False)):
+            if kwargs.get('state', kwargs.get('st', False)):
+                return True
+            if kwargs.get('undoName', kwargs.get('un', False)):
+                return self._undo_stack[-1][0] if self._undo_stack else ""
+            return None
+        if kwargs.get('openChunk', False):
+            self._chunks.append((kwargs.get('chunkName', ""), self._state()))
+        elif kwargs.get('closeChunk', False) and self._chunks:
+            chunk = self._chunks.pop()
+            if not self._chunks:
+                self._undo_stack.append(chunk)
+
+    def undo(self):
+        if self._undo_stack:
+            _, state = self._undo_stack.pop()
+            if isinstance(state, _Selection):
+                self._selection = list(state)
+            else:
+                self._restore(state)
+
+    def internalVar(self, *args, **kwargs):
+        return "fake_maya"
+
+    def about(self, **kwargs):
+        if kwargs.get('batch', False):
+            return True
+        return "fake"
+
+    # --- scene state ----------------------------------------------------
+
+    def _serialize(self, nodes):
+        """
+        Writes the nodes as plain records, standing in for the text of an exported file.
+        """
+        return [(self._path(node) if node.dag else node.name, node.type,
+                 list(node.times), list(node.values), dict(node.attrs)) for node in nodes]
+
+    def _state(self):
+        return copy.deepcopy((self._root, self._uuids, self._names, self._playback, self._next_uuid))
+
+    def _restore(self, state):
+        root, uuids, names, playback, next_uuid = copy.deepcopy(state)
+        self._root, self._uuids, self._names = root, uuids, names
+        self._playback, self._next_uuid = playback, next_uuid
+        self._selection = []
+
+
+class _Selection(list):
+    """
+    The selection before an undoable selection change.
+    """
+
+
+def _legal(name):
+    name = _INVALID_CHARS.sub("_", name)
+    return "_" + name if name[:1].isdigit() else name
+
+def _insert_key(curve, time):
+    i = bisect.bisect_left(curve.times, time)
+    if i < len(curve.times) and curve.times[i] == time:
+        return
+    if not curve.times:
+        value = 0.0
+    elif i == 0:
+        value = curve.values[0]
+    elif i == len(curve.times):
+        value = curve.values[-1]
+    else:
+        t0, t1 = curve.times[i-1], curve.times[i]
+        v0, v1 = curve.values[i-1], curve.values[i]
+        value = v0 + (v1 - v0) * (time - t0) / (t1 - t0)
+    curve.times.insert(i, time)
+    curve.values.insert(i, value)
+
+
+def install():
+    """
+    Installs a fake `maya` package whose `cmds` module forwards to a new
+    :class:`FakeCmds` instance, counting every call, and registers the
+    gwScripts packages bare so their modules can be imported headless.
+
+    :return: The fake scene, whose `calls` counter is shared by all modules.
+    :rtype: FakeCmds
+    """
+    scene = FakeCmds()
+
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+    cmds = types.ModuleType("maya.cmds")
+    for command in FakeCmds.COMMANDS:
+        setattr(cmds, command, _counted(scene, command))
+    maya.cmds = cmds
+    sys.modules["maya"] = maya
+    sys.modules["maya.cmds"] = cmds
+
+    for package in PACKAGES:
+        module = types.ModuleType(package)
+        module.__path__ = [os.path.join(SCRIPTS_DIR, *package.split("."))]
+        sys.modules[package] = module
+
+    return scene
+
+def _counted(scene, command):
+    method = getattr(scene, command)
+
+    def call(*args, **kwargs):
+        scene.calls[command] += 1
+        return method(*args, **kwargs)
+    call.__name__ = command
+    return call
+
+
+class Timer(object):
+    """
+    Context manager that measures the wall time of its block.
+    """
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,56 @@
+
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+
+import fake_maya
+
+
+def main():
+    """
+    A stand-in for the shots export worker, speaking the same protocol
+    without Maya. Opening the main file and exporting each shot are
+    simulated with sleeps, and every shot is saved as an empty file.
+
+    :return: The exit code.
+    :rtype: int
+    """
+    fake_maya.install()
+    worker = importlib.import_module("gwScripts.tools.shots_data_manager.core.worker")
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--open-seconds', type=float, default=1.0,
+                        help="The time it takes to open the main file.")
+    parser.add_argument('--frame-seconds', type=float, default=0.005,
+                        help="The time it takes to export a single frame.")
+    parser.add_argument('--fail', action='append', default=[],
+                        help="The name of a shot to fail, may be repeated.")
+    stub_args, argv = parser.parse_known_args()
+    args = worker.parse_args(argv)
+
+    time.sleep(stub_args.open_seconds)
+    worker.send({'event': 'ready', 'pid': os.getpid()})
+
+    ext = ".ma" if args.file_type == 'mayaAscii' else ".mb"
+    for line in iter(sys.stdin.readline, ""):
+        job = json.loads(line)
+        start_time = time.time()
+        time.sleep((job['end_frame'] - job['start_frame'] + 1) * stub_args.frame_seconds)
+        if job['shot_name'] in stub_args.fail:
+            worker.send({'event': 'error', 'row': job['row'],
+                         'shot_name': job['shot_name'], 'message': "Simulated failure."})
+            continue
+        file_path = os.path.join(args.export_path, job['shot_name'] + ext)
+        open(file_path, 'w').close()
+        worker.send({'event': 'done', 'row': job['row'], 'shot_name': job['shot_name'],
+                     'file_path': file_path, 'failed_anim_curves': [], 'pruned_anim_curves': [],
+                     'error': None, 'seconds': time.time() - start_time, 'curve_count': 0,
+                     'file_size': 0})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
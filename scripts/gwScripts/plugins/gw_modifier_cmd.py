@@ -0,0 +1,48 @@
+
+import maya.api.OpenMaya as om
+
+from gwScripts.utils import apiundo
+
+
+def maya_useNewAPI():
+    """
+    Tells Maya that this plugin uses the Python API 2.0.
+    """
+    pass
+
+
+class ModifierCmd(om.MPxCommand):
+    """
+    An undoable command that executes the modifier passed through
+    :func:`gwScripts.utils.apiundo.commit`, keeping it around so that
+    Maya can undo and redo all of its operations as a single step.
+    """
+    def __init__(self):
+        super(ModifierCmd, self).__init__()
+        self._modifier = None
+
+    @staticmethod
+    def creator():
+        return ModifierCmd()
+
+    def doIt(self, args):
+        self._modifier = apiundo.take()
+        self._modifier.doIt()
+
+    def redoIt(self):
+        self._modifier.doIt()
+
+    def undoIt(self):
+        self._modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(plugin):
+    fn_plugin = om.MFnPlugin(plugin, "Guy Wolfus", "1.0")
+    fn_plugin.registerCommand(apiundo.COMMAND_NAME, ModifierCmd.creator)
+
+def uninitializePlugin(plugin):
+    fn_plugin = om.MFnPlugin(plugin)
+    fn_plugin.deregisterCommand(apiundo.COMMAND_NAME)
@@ -1,7 +1,6 @@
 
 import sys
 
-from gwScripts.tools.comet_rename_plus.ui.window import Window
 from gwScripts.utils import logutil
 
 
@@ -25,6 +24,8 @@ def run(reset=False):
         self.window = None
 
     if not self.window:
+        # imported here, so the core stays importable in headless sessions
+        from gwScripts.tools.comet_rename_plus.ui.window import Window
         self.window = Window(logger=self.logger)
 
     self.window.display_ui()
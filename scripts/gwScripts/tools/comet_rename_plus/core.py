@@ -1,20 +1,166 @@
 
+import re
+import string
+from collections import Counter, defaultdict, namedtuple
+
 import maya.cmds as cmds
 
 
-def _selected():
+# a planned rename of a single node, where `node` is the node's uuid
+Rename = namedtuple('Rename', ['node', 'old_name', 'new_name'])
+
+# names that Maya accepts as-is, anything else gets altered on rename
+_VALID_NAME = re.compile(r"^[A-Za-z_:][A-Za-z0-9_:]*$")
+
+# side tokens in names such as "L_arm", "arm_r" or "spine_C_01"
+_SIDE = re.compile(r"(?:^|_)(l|r|c|left|right|center|centre)(?:_|$)", re.IGNORECASE)
+
+# the fields a rename template can use, e.g. "{side}_{type}_{index:03}"
+TEMPLATE_FIELDS = ('name', 'parent', 'type', 'index', 'side')
+
+# the ways a plan can be applied; one `cmds.rename` call per node,
+# or a single OpenMaya modifier that is undone in one step
+BACKENDS = ('cmds', 'api')
+
+
+class RenamePlan(list):
+    """
+    A data class that holds the planned renames of a batch,
+    as an ordered list of :class:`Rename` tuples.
     """
-    By using a generator of flattened names for selected nodes,
-    we guarantee that we never try to access non-existing node names
-    which might happen when renaming nodes in a tree structure.
+    def __init__(self, renames=(), longnames=(), conflicts=(), invalid=()):
+        """
+        Initializes the plan.
 
-    :yields: Names of selected nodes.
-    :rtype: str
+        :param renames: The planned renames, in selection order.
+        :type renames: list[Rename]
+
+        :param longnames: The full paths of the nodes at planning time,
+            in the same order as `renames`.
+        :type longnames: list[str]
+
+        :param conflicts: Renames that clash with a sibling's name,
+            which Maya would resolve by auto-suffixing a number.
+        :type conflicts: list[Rename]
+
+        :param invalid: Renames to names that Maya would not accept as-is.
+        :type invalid: list[Rename]
+
+        :return: None
+        :rtype: None
+        """
+        super(RenamePlan, self).__init__(renames)
+        self.longnames = list(longnames)
+        self.conflicts = list(conflicts)
+        self.invalid = list(invalid)
+
+    @property
+    def changes(self):
+        """
+        :return: The renames that actually change a node's name.
+        :rtype: list[Rename]
+        """
+        return [rename for rename in self if rename.old_name != rename.new_name]
+
+    def diff(self):
+        """
+        A human readable preview of the plan, one line per changed node.
+        Lines of conflicting or invalid renames are marked with a "!".
+
+        :return: The preview text.
+        :rtype: str
+        """
+        flagged = set(rename.node for rename in self.conflicts + self.invalid)
+        return "\n".join(
+            "{} {} -> {}".format(
+                "!" if rename.node in flagged else " ", rename.old_name, rename.new_name
+            )
+            for rename in self.changes
+        )
+
+
+def _snapshot(hierarchy=False):
+    """
+    Takes a single snapshot of the selection as stable handles.
+    Each selected node is stored by its UUID alongside the full path
+    it had at the time of the snapshot.
+
+    :param hierarchy: Include all the descendants of the selected nodes,
+        listed top-down after the selected nodes.
+    :type hierarchy: bool, optional
+
+    :return: Pairs of (uuid, long name) in selection order.
+    :rtype: list[tuple[str, str]]
     """
-    i = 0
-    while i < len(cmds.ls(sl=True, fl=True)):
-        yield cmds.ls(sl=True, fl=True)[i]
-        i += 1
+    uuids = _unique(cmds.ls(sl=True, uuid=True) or [])
+    if not uuids:
+        return []
+
+    longnames = cmds.ls(uuids, long=True) or []
+    if len(longnames) != len(uuids):
+        raise RuntimeError("Failed to resolve the selected nodes from their UUIDs.")
+    snapshot = list(zip(uuids, longnames))
+
+    if hierarchy:
+        # the descendants of all roots are fetched at once, deepest-first,
+        # so reversing them lists every hierarchy from the top down
+        selected = set(longnames)
+        descendants = _unique(
+            longname
+            for longname in reversed(cmds.listRelatives(longnames, ad=True, fullPath=True) or [])
+            if longname not in selected
+        )
+        if descendants:
+            descendant_uuids = cmds.ls(descendants, uuid=True) or []
+            if len(descendant_uuids) != len(descendants):
+                raise RuntimeError("Failed to resolve the UUIDs of the selected hierarchies.")
+            snapshot.extend(zip(descendant_uuids, descendants))
+
+    return snapshot
+
+def _unique(sequence):
+    """
+    Removes duplicates from a sequence while keeping its order,
+    e.g. components of the same node which share the node's uuid.
+
+    :param sequence: The input sequence to filter.
+    :type sequence: Iterable[str]
+
+    :return: The unique items, in their original order.
+    :rtype: list[str]
+    """
+    seen = set()
+    unique = []
+    for item in sequence:
+        if item not in seen:
+            seen.add(item)
+            unique.append(item)
+    return unique
+
+def _depth(longname):
+    """
+    :param longname: Unique flattened path of the node.
+    :type longname: str
+
+    :return: The depth of a node in the DAG, 0 for world-level and DG nodes.
+    :rtype: int
+    """
+    return max(longname.count("|") - 1, 0)
+
+def _sibling_index():
+    """
+    Indexes the short names of every node in the scene by their parent's path,
+    using a single query. World-level DAG nodes and DG nodes share the
+    empty parent, since their names must be unique against each other.
+
+    :return: A name counter per parent path.
+    :rtype: dict[str, collections.Counter]
+    """
+    index = defaultdict(Counter)
+    for longname in cmds.ls(long=True) or []:
+        parent, _, name = longname.rpartition("|")
+        index[parent][name] += 1
+    return index
 
 def _shortname(longname):
     """
@@ -29,49 +175,271 @@ def _shortname(longname):
     """
     return longname.rpartition("|")[-1]
 
-def add_prefix(prefix):
+def _node_types(longnames):
+    """
+    Queries the node types of all the given nodes in a single call.
+
+    :param longnames: Full paths of the nodes.
+    :type longnames: list[str]
+
+    :return: The node types, in the same order as `longnames`.
+    :rtype: list[str]
+    """
+    result = cmds.ls(longnames, long=True, showType=True) or []
+    types = dict(zip(result[::2], result[1::2]))
+    return [types.get(longname, "") for longname in longnames]
+
+def _side(name):
+    """
+    Extracts the side of a node from its name.
+
+    :param name: Short name of the node.
+    :type name: str
+
+    :return: "L", "R" or "C", or an empty string if the name has no side token.
+    :rtype: str
+    """
+    match = _SIDE.search(name)
+    return match.group(1)[0].upper() if match else ""
+
+def compile_template(template):
+    """
+    Validates a rename template once, ahead of renaming a batch.
+
+    :param template: The template, using the fields in `TEMPLATE_FIELDS`.
+    :type template: str
+
+    :raises ValueError: If the template is malformed or uses an unknown field.
+
+    :return: The names of the fields used by the template.
+    :rtype: set[str]
+    """
+    fields = set()
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field is None:
+            continue
+        if field not in TEMPLATE_FIELDS:
+            raise ValueError("Unknown template field \"{{{}}}\", expected one of: {}.".format(
+                field, ", ".join("{{{}}}".format(f) for f in TEMPLATE_FIELDS)
+            ))
+        fields.add(field)
+    return fields
+
+def plan_rename(name_func, snapshot=None):
+    """
+    Plans the renaming of the selected nodes without changing the scene.
+    The renames are simulated in order against an index of sibling names,
+    flagging every rename that Maya would not apply verbatim.
+
+    :param name_func: Called as `name_func(index, short_name)` for each
+        selected node, returns the node's new name.
+    :type name_func: Callable[[int, str], str]
+
+    :param snapshot: A selection snapshot that was already taken
+        by the caller, as returned by :func:`_snapshot`.
+    :type snapshot: list[tuple[str, str]], optional
+
+    :return: The planned renames.
+    :rtype: RenamePlan
+    """
+    snapshot = _snapshot() if snapshot is None else snapshot
+    if not snapshot:
+        return RenamePlan()
+
+    index = _sibling_index()
+    renames, longnames, conflicts, invalid = [], [], [], []
+    for i, (uuid, longname) in enumerate(snapshot):
+        parent, _, old_name = longname.rpartition("|")
+        rename = Rename(uuid, old_name, name_func(i, old_name))
+        renames.append(rename)
+        longnames.append(longname)
+        if rename.new_name == old_name:
+            continue
+
+        if not _VALID_NAME.match(rename.new_name):
+            invalid.append(rename)
+        siblings = index[parent]
+        siblings[old_name] -= 1
+        if siblings[rename.new_name] > 0:
+            conflicts.append(rename)
+        siblings[rename.new_name] += 1
+
+    return RenamePlan(renames, longnames, conflicts, invalid)
+
+def apply_plan(plan, backend='cmds'):
+    """
+    Applies a planned batch of renames in a single pass.
+    Nodes are renamed deepest-first, so none of the ancestors of a node
+    are renamed before it is, and every path stored in the plan is
+    still valid at the time it is used.
+
+    :param plan: The plan to apply, as returned by :func:`plan_rename`.
+    :type plan: RenamePlan
+
+    :param backend: One of `BACKENDS`; "cmds" renames each node with `cmds.rename`,
+        "api" queues all the renames into a single OpenMaya modifier that is
+        committed, and undone, as one step.
+    :type backend: str, optional
+
+    :return: The resulting names of the renamed nodes, in the order they were renamed.
+    :rtype: list[str]
+    """
+    if backend not in BACKENDS:
+        raise ValueError("Backend must be one of: {}.".format(", ".join(BACKENDS)))
+
+    order = sorted(
+        (i for i, rename in enumerate(plan) if rename.old_name != rename.new_name),
+        key=lambda i: _depth(plan.longnames[i]),
+        reverse=True
+    )
+    if backend == 'api':
+        return _apply_modifier(plan, order)
+    return [cmds.rename(plan.longnames[i], plan[i].new_name) for i in order]
+
+def _apply_modifier(plan, order):
+    """
+    Applies the renames of a plan through a single `MDGModifier`,
+    skipping the per-command overhead of `cmds.rename`.
+
+    :param plan: The plan to apply.
+    :type plan: RenamePlan
+
+    :param order: The indices of the renames to apply, in order.
+    :type order: list[int]
+
+    :return: The resulting names of the renamed nodes, in the order they were renamed.
+    :rtype: list[str]
+    """
+    # imported here, so the rest of the module only depends on `maya.cmds`
+    import maya.api.OpenMaya as om
+    from gwScripts.utils import apiundo
+
+    # resolve every node before the first rename, while all paths are valid
+    selection = om.MSelectionList()
+    for i in order:
+        selection.add(plan.longnames[i])
+    nodes = [selection.getDependNode(k) for k in range(selection.length())]
+
+    modifier = om.MDGModifier()
+    for node, i in zip(nodes, order):
+        modifier.renameNode(node, plan[i].new_name)
+    apiundo.commit(modifier)
+
+    return [om.MFnDependencyNode(node).name() for node in nodes]
+
+def batch_rename(name_func, hierarchy=False, preview=False, snapshot=None, backend='cmds'):
+    """
+    Renames the selected nodes in a single pass.
+    The selection is queried once, every new name is computed
+    in Python, and only then are the renames applied.
+
+    :param name_func: Called as `name_func(index, short_name)` for each
+        selected node, returns the node's new name.
+    :type name_func: Callable[[int, str], str]
+
+    :param hierarchy: Also rename all the descendants of the selected nodes.
+    :type hierarchy: bool, optional
+
+    :param preview: Only plan the renames, without applying them.
+    :type preview: bool, optional
+
+    :param snapshot: A selection snapshot that was already taken
+        by the caller, as returned by :func:`_snapshot`.
+        Overrides `hierarchy` if passed.
+    :type snapshot: list[tuple[str, str]], optional
+
+    :param backend: The backend used to apply the renames, see :func:`apply_plan`.
+    :type backend: str, optional
+
+    :return: The planned renames.
+    :rtype: RenamePlan
+    """
+    snapshot = _snapshot(hierarchy) if snapshot is None else snapshot
+    plan = plan_rename(name_func, snapshot)
+    if not preview:
+        apply_plan(plan, backend)
+    return plan
+
+def add_prefix(prefix, hierarchy=False, preview=False, backend='cmds'):
     """
     Adds the prefix text to the selected nodes.
 
     :param prefix: Prefix string.
     :type prefix: str
 
-    :return: None
-    :rtype: None
+    :param hierarchy: Also rename all the descendants of the selected nodes.
+    :type hierarchy: bool, optional
+
+    :param preview: Only plan the renames, without applying them.
+    :type preview: bool, optional
+
+    :param backend: The backend used to apply the renames, see :func:`apply_plan`.
+    :type backend: str, optional
+
+    :return: The planned renames.
+    :rtype: RenamePlan
     """
-    for node in _selected():
-        cmds.rename(node, prefix + _shortname(node))
+    return batch_rename(lambda i, name: prefix + name, hierarchy, preview, backend=backend)
 
-def add_suffix(suffix):
+def add_suffix(suffix, hierarchy=False, preview=False, backend='cmds'):
     """
     Adds the suffix text to the selected nodes.
 
     :param suffix: Suffix string.
     :type suffix: str
 
-    :return: None
-    :rtype: None
+    :param hierarchy: Also rename all the descendants of the selected nodes.
+    :type hierarchy: bool, optional
+
+    :param preview: Only plan the renames, without applying them.
+    :type preview: bool, optional
+
+    :param backend: The backend used to apply the renames, see :func:`apply_plan`.
+    :type backend: str, optional
+
+    :return: The planned renames.
+    :rtype: RenamePlan
     """
-    for node in _selected():
-        cmds.rename(node, _shortname(node) + suffix)
+    return batch_rename(lambda i, name: name + suffix, hierarchy, preview, backend=backend)
 
-def search_and_replace(search, replace):
+def search_and_replace(search, replace, regex=False, hierarchy=False, preview=False,
+                       backend='cmds'):
     """
     Searches and replaces the texts for the selected nodes.
 
-    :param search: Search string.
+    :param search: Search string, or a regular expression if `regex` is set.
     :type search: str
 
-    :param replace: Replace string.
+    :param replace: Replace string, which may contain group
+        references such as "\\1" if `regex` is set.
     :type replace: str
 
-    :return: None
-    :rtype: None
+    :param regex: Treat the search string as a regular expression.
+    :type regex: bool, optional
+
+    :param hierarchy: Also rename all the descendants of the selected nodes.
+    :type hierarchy: bool, optional
+
+    :param preview: Only plan the renames, without applying them.
+    :type preview: bool, optional
+
+    :param backend: The backend used to apply the renames, see :func:`apply_plan`.
+    :type backend: str, optional
+
+    :raises re.error: If `regex` is set and the search string is not a valid expression.
+
+    :return: The planned renames.
+    :rtype: RenamePlan
     """
-    for node in _selected():
-        cmds.rename(node, _shortname(node).replace(search, replace))
+    if regex:
+        pattern = re.compile(search)
+        name_func = lambda i, name: pattern.sub(replace, name)
+    else:
+        name_func = lambda i, name: name.replace(search, replace)
+    return batch_rename(name_func, hierarchy, preview, backend=backend)
 
-def rename_and_number(new_name, start_num, padding):
+def rename_and_number(new_name, start_num, padding, hierarchy=False, preview=False,
+                      backend='cmds'):
     """
     Renames and renumbers the selected nodes.
 
@@ -84,9 +452,66 @@ def rename_and_number(new_name, start_num, padding):
     :param padding: Amount of padding to the numbering.
     :type padding: int
 
-    :return: None
-    :rtype: None
+    :param hierarchy: Also rename all the descendants of the selected nodes.
+    :type hierarchy: bool, optional
+
+    :param preview: Only plan the renames, without applying them.
+    :type preview: bool, optional
+
+    :param backend: The backend used to apply the renames, see :func:`apply_plan`.
+    :type backend: str, optional
+
+    :return: The planned renames.
+    :rtype: RenamePlan
     """
-    for i, node in enumerate(_selected()):
-        k = i + start_num
-        cmds.rename(node, new_name + str(k).zfill(padding))
+    return batch_rename(
+        lambda i, name: new_name + str(i + start_num).zfill(padding),
+        hierarchy, preview, backend=backend
+    )
+
+def rename_with_template(template, start_num=0, hierarchy=False, preview=False,
+                         backend='cmds'):
+    """
+    Renames the selected nodes based on a template, e.g. "{side}_{name}_{index:03}".
+    The available fields are:
+
+    * `{name}`: The node's current short name.
+    * `{parent}`: The short name of the node's parent, empty for world-level nodes.
+    * `{type}`: The node's type.
+    * `{index}`: The node's number in the selection, counting from `start_num`.
+    * `{side}`: "L", "R" or "C" based on the side token in the node's name, if any.
+
+    :param template: The template string.
+    :type template: str
+
+    :param start_num: The starting number for the `{index}` field.
+    :type start_num: int, optional
+
+    :param hierarchy: Also rename all the descendants of the selected nodes.
+    :type hierarchy: bool, optional
+
+    :param preview: Only plan the renames, without applying them.
+    :type preview: bool, optional
+
+    :param backend: The backend used to apply the renames, see :func:`apply_plan`.
+    :type backend: str, optional
+
+    :raises ValueError: If the template is malformed or uses an unknown field.
+
+    :return: The planned renames.
+    :rtype: RenamePlan
+    """
+    fields = compile_template(template)
+    snapshot = _snapshot(hierarchy)
+    longnames = [longname for _, longname in snapshot]
+
+    # only query what the template actually uses, in bulk
+    types = _node_types(longnames) if 'type' in fields else [""] * len(longnames)
+    parents = [_shortname(longname.rpartition("|")[0]) for longname in longnames]
+
+    def name_func(i, name):
+        return template.format(
+            name=name, parent=parents[i], type=types[i], index=i + start_num, side=_side(name)
+        )
+
+    return batch_rename(name_func, hierarchy, preview, snapshot, backend)
@@ -1,4 +1,6 @@
 
+import re
+
 import maya.cmds as cmds
 try:
     from PySide6 import QtCore
@@ -48,6 +50,8 @@ class Window(Dialog):
         # replace
         self.lnedit_search = QtWidgets.QLineEdit()
         self.lnedit_replace = QtWidgets.QLineEdit()
+        self.chkbox_regex = QtWidgets.QCheckBox(self.settings.get('regex'))
+        self.chkbox_regex.setToolTip(self.settings.get('regex_tooltip'))
         self.btn_replace = QtWidgets.QPushButton(self.settings.get('btn_replace'))
 
         # prefix
@@ -64,13 +68,29 @@ class Window(Dialog):
         self.lnedit_padding = QtWidgets.QLineEdit()
         self.btn_rename = QtWidgets.QPushButton(self.settings.get('btn_rename'))
 
+        # template
+        self.lnedit_template = QtWidgets.QLineEdit()
+        self.lnedit_template.setToolTip(self.settings.get('template_tooltip'))
+        self.btn_template = QtWidgets.QPushButton(self.settings.get('btn_template'))
+
+        # options
+        self.chkbox_hierarchy = QtWidgets.QCheckBox(self.settings.get('hierarchy'))
+        self.chkbox_hierarchy.setToolTip(self.settings.get('hierarchy_tooltip'))
+        self.chkbox_preview = QtWidgets.QCheckBox(self.settings.get('preview'))
+        self.chkbox_preview.setToolTip(self.settings.get('preview_tooltip'))
+        self.combo_backend = QtWidgets.QComboBox()
+        self.combo_backend.setToolTip(self.settings.get('backend_tooltip'))
+        for backend in core.BACKENDS:
+            self.combo_backend.addItem(self.settings.get('backends')[backend], backend)
+
         # set specific line edit settings
         for lnedit in [
             self.lnedit_search,
             self.lnedit_replace,
             self.lnedit_prefix,
             self.lnedit_suffix,
-            self.lnedit_rename
+            self.lnedit_rename,
+            self.lnedit_template
         ]:
             lnedit.setClearButtonEnabled(True)
 
@@ -109,6 +129,7 @@ class Window(Dialog):
         self.main_layout.addLayout(self._add_lnedit(
             self.settings.get('replace'), self.lnedit_replace)
         )
+        self.main_layout.addWidget(self.chkbox_regex)
         self.main_layout.addWidget(self.btn_replace)
         self.main_layout.addWidget(add_line())
 
@@ -137,6 +158,21 @@ class Window(Dialog):
             self.settings.get('padding'), self.lnedit_padding, True)
         )
         self.main_layout.addWidget(self.btn_rename)
+        self.main_layout.addWidget(add_line())
+
+        # template
+        self.main_layout.addLayout(self._add_lnedit(
+            self.settings.get('template'), self.lnedit_template)
+        )
+        self.main_layout.addWidget(self.btn_template)
+        self.main_layout.addWidget(add_line())
+
+        # options
+        self.main_layout.addWidget(self.chkbox_hierarchy)
+        self.main_layout.addWidget(self.chkbox_preview)
+        self.main_layout.addLayout(self._add_lnedit(
+            self.settings.get('backend'), self.combo_backend)
+        )
 
     def create_connections(self):
         """
@@ -150,6 +186,7 @@ class Window(Dialog):
         self.btn_prefix.clicked.connect(self.add_prefix)
         self.btn_suffix.clicked.connect(self.add_suffix)
         self.btn_rename.clicked.connect(self.rename_and_number)
+        self.btn_template.clicked.connect(self.rename_with_template)
 
     def _add_lnedit(self, label_text, lnedit_widget, add_stretch=False):
         """
@@ -158,8 +195,8 @@ class Window(Dialog):
         :param label_text: The text for the label.
         :type label_text: str
 
-        :param lnedit_widget: The line edit widget to insert.
-        :type lnedit_widget: QtWidgets.QLineEdit
+        :param lnedit_widget: The line edit (or any other input) widget to insert.
+        :type lnedit_widget: QtWidgets.QWidget
 
         :param add_stretch: Whether to add stretch space to the layout.
         :type add_stretch: bool, optional
@@ -192,7 +229,7 @@ class Window(Dialog):
         if not cmds.ls(sl=True):
             self.logger.warning(self.settings.get('no_objects_selected_warning'))
             return
-        core.add_prefix(prefix)
+        self._run(core.add_prefix, prefix)
 
     @undo_chunk
     def add_suffix(self):
@@ -209,7 +246,7 @@ class Window(Dialog):
         if not cmds.ls(sl=True):
             self.logger.warning(self.settings.get('no_objects_selected_warning'))
             return
-        core.add_suffix(suffix)
+        self._run(core.add_suffix, suffix)
 
     @undo_chunk
     def search_and_replace(self):
@@ -227,7 +264,10 @@ class Window(Dialog):
         if not cmds.ls(sl=True):
             self.logger.warning(self.settings.get('no_objects_selected_warning'))
             return
-        core.search_and_replace(search, replace)
+        try:
+            self._run(core.search_and_replace, search, replace, self.chkbox_regex.isChecked())
+        except re.error as e:
+            self.logger.error("{} {}".format(self.settings.get('regex_error'), e))
 
     @undo_chunk
     def rename_and_number(self):
@@ -246,4 +286,97 @@ class Window(Dialog):
             return
         start_num = int(self.lnedit_start_num.text())
         padding = int(self.lnedit_padding.text())
-        core.rename_and_number(new_name, start_num, padding)
+        self._run(core.rename_and_number, new_name, start_num, padding)
+
+    @undo_chunk
+    def rename_with_template(self):
+        """
+        Renames the selected nodes based on the template text,
+        numbering them from the "Start #" value.
+
+        :return: None
+        :rtype: None
+        """
+        template = self.lnedit_template.text()
+        if not template:
+            self.logger.warning(self.settings.get('template_missing_warning'))
+            return
+        try:
+            core.compile_template(template)
+        except ValueError as e:
+            self.logger.error("{} {}".format(self.settings.get('template_error'), e))
+            return
+        if not cmds.ls(sl=True):
+            self.logger.warning(self.settings.get('no_objects_selected_warning'))
+            return
+        start_num = int(self.lnedit_start_num.text())
+        try:
+            self._run(core.rename_with_template, template, start_num)
+        except (ValueError, IndexError, KeyError) as e:
+            self.logger.error("{} {}".format(self.settings.get('template_error'), e))
+
+    def _run(self, operation, *args):
+        """
+        Runs a renaming operation from the core module on the selected nodes,
+        or their whole hierarchies if the hierarchy option is checked,
+        previewing its plan first if the preview option is checked,
+        and applying it with the selected backend.
+
+        :param operation: The core renaming function to run.
+        :type operation: Callable
+
+        :param args: The arguments to pass to the operation.
+        :type args: tuple
+
+        :return: None
+        :rtype: None
+        """
+        hierarchy = self.chkbox_hierarchy.isChecked()
+        backend = self.combo_backend.currentData()
+        if not self.chkbox_preview.isChecked():
+            operation(*args, hierarchy=hierarchy, backend=backend)
+            return
+
+        plan = operation(*args, hierarchy=hierarchy, preview=True)
+        if self.preview_dialog(plan):
+            core.apply_plan(plan, backend)
+
+    def preview_dialog(self, plan):
+        """
+        Prompt the user with a preview of the planned renames.
+
+        :param plan: The planned renames to preview.
+        :type plan: core.RenamePlan
+
+        :return: Whether the user confirmed the renames.
+        :rtype: bool
+        """
+        summary = self.settings.get('preview_summary').format(
+            len(plan.changes), len(plan.conflicts), len(plan.invalid)
+        )
+        if plan.conflicts or plan.invalid:
+            self.logger.warning(summary)
+
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle(self.settings.get('preview_title'))
+        dialog.resize(int(self.settings.get('window_width') * 1.5), self.settings.get('window_height'))
+
+        text = QtWidgets.QPlainTextEdit(dialog)
+        text.setReadOnly(True)
+        text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+        text.setPlainText(plan.diff())
+
+        buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok|QtWidgets.QDialogButtonBox.Cancel, parent=dialog
+        )
+        buttons.button(QtWidgets.QDialogButtonBox.Ok).setEnabled(bool(plan.changes))
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+
+        layout = QtWidgets.QVBoxLayout(dialog)
+        layout.addWidget(QtWidgets.QLabel(summary, dialog))
+        layout.addWidget(text)
+        layout.addWidget(buttons)
+
+        return dialog.exec_() == QtWidgets.QDialog.Accepted
@@ -10,7 +10,7 @@ from gwScripts.utils import logutil
 # maintain a reference to the current active camera
 self = sys.modules[__name__]
 self.logger = logutil.get_logger(__name__, __file__)
-self.active_camera = cmds.lookThru(q=True)
+self.active_camera = None if cmds.about(batch=True) else cmds.lookThru(q=True)
 
 
 def toggle():
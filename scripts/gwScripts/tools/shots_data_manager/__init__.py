@@ -1,7 +1,6 @@
 
 import sys
 
-from gwScripts.tools.shots_data_manager.ui.window import Window
 from gwScripts.tools.shots_data_manager.ui.controller import Controller
 from gwScripts.utils import logutil
 
@@ -27,6 +26,8 @@ def run(reset=False):
         self.window = None
 
     if not self.window:
+        # imported here, so the core stays importable in headless sessions
+        from gwScripts.tools.shots_data_manager.ui.window import Window
         self.window = Window(controller=Controller, logger=self.logger)
 
     self.window.display_ui()
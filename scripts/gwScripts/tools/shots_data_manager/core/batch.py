@@ -0,0 +1,259 @@
+
+import os
+import sys
+import json
+import platform
+import threading
+import subprocess
+from collections import deque
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from gwScripts.tools.shots_data_manager.core import worker
+from gwScripts.tools.shots_data_manager.core.shots import ShotResult
+
+
+def find_mayapy():
+    """
+    Finds the `mayapy` interpreter of the running Maya version.
+
+    :return: The path of `mayapy`, or None if not found.
+    :rtype: str | None
+    """
+    executable = "mayapy.exe" if platform.system() == 'Windows' else "mayapy"
+    candidates = [os.path.join(os.path.dirname(sys.executable), executable)]
+    if os.environ.get('MAYA_LOCATION'):
+        candidates.append(os.path.join(os.environ['MAYA_LOCATION'], "bin", executable))
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+class BatchExporter(object):
+    """
+    Exports shots from a saved main file in parallel, by fanning them out
+    to a pool of headless `mayapy` worker processes. Each worker opens the
+    main file once and keeps exporting shots until there are none left,
+    streaming every result back as soon as it's done.
+    """
+    def __init__(self, main_file, export_path, normalize=None, file_type='mayaAscii',
+                 mode='restore', prune=False, strategy='save', roots=None, backend='cmds',
+                 workers=2, command=None, profile_dir=None):
+        """
+        Initializes the exporter.
+
+        :param main_file: The path of the saved main file to split into shots.
+        :type main_file: str
+
+        :param export_path: The directory to save the shots to.
+        :type export_path: str
+
+        :param normalize: The frame to move the start of every shot to, or None.
+        :type normalize: int, optional
+
+        :param file_type: The Maya file type to save the shots as,
+            either 'mayaAscii' or 'mayaBinary'.
+        :type file_type: str, optional
+
+        :param mode: How each worker brings back the main file's state between shots,
+            see :class:`ShotExporter`.
+        :type mode: str, optional
+
+        :param prune: Remove the anim curves that are static throughout each shot.
+        :type prune: bool, optional
+
+        :param strategy: How each shot is written, see :class:`ShotExporter`.
+        :type strategy: str, optional
+
+        :param roots: The DAG roots to export with the "selected" strategy.
+        :type roots: list[str], optional
+
+        :param backend: How the keys are edited, see :meth:`Controller.apply_shot`.
+        :type backend: str, optional
+
+        :param workers: The maximum number of worker processes.
+        :type workers: int, optional
+
+        :param command: The command that starts a worker, before the worker's
+            arguments. Defaults to running the worker module with `mayapy`,
+            and may be replaced with a stub worker speaking the same protocol.
+        :type command: list[str], optional
+
+        :param profile_dir: The directory for each worker to write its export profile to,
+            see :class:`Profile`.
+        :type profile_dir: str, optional
+
+        :return: None
+        :rtype: None
+        """
+        self.main_file = main_file
+        self.export_path = export_path
+        self.normalize = normalize
+        self.file_type = file_type
+        self.mode = mode
+        self.prune = prune
+        self.strategy = strategy
+        self.roots = list(roots or [])
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.command = command
+        self.profile_dir = profile_dir
+
+    def worker_command(self):
+        """
+        :raises RuntimeError: If no command was given and `mayapy` can't be found.
+
+        :return: The full command that starts a worker.
+        :rtype: list[str]
+        """
+        command = self.command
+        if not command:
+            mayapy = find_mayapy()
+            if not mayapy:
+                raise RuntimeError("Failed to find mayapy, set the MAYA_LOCATION variable.")
+            command = [mayapy, os.path.splitext(worker.__file__)[0] + ".py"]
+
+        args = [self.main_file, self.export_path,
+                '--file-type', self.file_type, '--mode', self.mode]
+        if self.normalize is not None:
+            args += ['--normalize', str(self.normalize)]
+        if self.prune:
+            args.append('--prune')
+        args += ['--strategy', self.strategy, '--backend', self.backend]
+        if self.roots:
+            args += ['--roots'] + self.roots
+        if self.profile_dir:
+            args += ['--profile', self.profile_dir]
+        return list(command) + args
+
+    def export(self, shots, poll=None):
+        """
+        Exports all the shots using the worker pool.
+        Shots are handed out one at a time to whichever worker is free,
+        so that long shots don't hold back the rest of the sequence.
+
+        :param shots: The shots to export.
+        :type shots: Shots
+
+        :param poll: The seconds to wait for a worker before yielding None,
+            so that the caller can keep its UI responsive while the shots export.
+            Waits for each result without yielding None if not passed.
+        :type poll: float, optional
+
+        :yields: The result of each shot, in the order they finished,
+            or None whenever no worker reported back within `poll` seconds.
+        :rtype: ShotResult | None
+        """
+        jobs = deque(
+            {'row': row,
+             'shot_name': shots.get_shot_name(row),
+             'start_frame': shots.get_shot_start(row),
+             'end_frame': shots.get_shot_end(row)}
+            for row in shots
+        )
+        if not jobs:
+            return
+
+        messages = queue.Queue()
+        processes = []
+        in_progress = {}
+        reason = "No workers were left to export the shot."
+        try:
+            for i in range(min(self.workers, len(jobs))):
+                process = subprocess.Popen(
+                    self.worker_command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    universal_newlines=True, bufsize=1
+                )
+                processes.append(process)
+                reader = threading.Thread(target=self._read, args=(i, process, messages))
+                reader.daemon = True
+                reader.start()
+
+            running = len(processes)
+            while running:
+                try:
+                    i, message = messages.get(timeout=poll)
+                except queue.Empty:
+                    yield None
+                    continue
+
+                # the worker exited, fail the shot it was working on, if any
+                if message is None:
+                    running -= 1
+                    job = in_progress.pop(i, None)
+                    if job:
+                        yield self._failed(job, "The worker exited unexpectedly.")
+                    continue
+
+                event = message.get('event')
+                if event == 'done':
+                    in_progress.pop(i, None)
+                    yield ShotResult(*(message.get(field) for field in ShotResult._fields))
+                elif event == 'error':
+                    yield self._failed(in_progress.pop(i), message['message'])
+                elif event == 'fatal':
+                    reason = message['message']
+                    continue
+
+                # hand the next shot to the free worker, or let it exit
+                if event in ('ready', 'done', 'error'):
+                    self._next_job(i, processes[i], jobs, in_progress)
+
+            # every worker is gone, fail the shots that were never exported
+            while jobs:
+                yield self._failed(jobs.popleft(), reason)
+        finally:
+            for process in processes:
+                self._close(process)
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+
+    def _next_job(self, i, process, jobs, in_progress):
+        """
+        Sends the next job to a worker, or closes the worker's input if there are no jobs left.
+
+        :return: None
+        :rtype: None
+        """
+        if not jobs:
+            self._close(process)
+            return
+        job = jobs.popleft()
+        in_progress[i] = job
+        try:
+            process.stdin.write(json.dumps(job) + "\n")
+            process.stdin.flush()
+        except (IOError, OSError):
+            # the worker is exiting, its reader will report the shot as failed
+            pass
+
+    @staticmethod
+    def _read(i, process, messages):
+        """
+        Forwards the messages of a worker to the main thread, followed by None once it exits.
+
+        :return: None
+        :rtype: None
+        """
+        for line in iter(process.stdout.readline, ""):
+            message = worker.receive(line)
+            if message is not None:
+                messages.put((i, message))
+        process.stdout.close()
+        messages.put((i, None))
+
+    @staticmethod
+    def _close(process):
+        try:
+            if not process.stdin.closed:
+                process.stdin.close()
+        except (IOError, OSError):
+            pass
+
+    @staticmethod
+    def _failed(job, message):
+        return ShotResult(job['shot_name'], None, [], [], message, None, None, None)
@@ -0,0 +1,197 @@
+import os
+import sqlite3
+from collections import namedtuple
+
+from gwScripts.tools.shots_data_manager.core.manifest import MANIFEST_FILENAME
+from gwScripts.tools.shots_data_manager.core.preset import Preset
+from gwScripts.tools.shots_data_manager.core.shots import exact_frame
+
+
+CATALOG_FILENAME = "presets_catalog.sqlite"
+# bump to rebuild the catalogs made by older versions of the tool
+CATALOG_VERSION = 2
+
+# a shot found in the catalog, along with the preset it's in
+CatalogMatch = namedtuple(
+    'CatalogMatch', ['file_path', 'shot_name', 'start_frame', 'end_frame', 'export_path', 'save_as']
+)
+
+_SCHEMA = """
+CREATE TABLE presets (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    valid INTEGER NOT NULL,
+    export_path TEXT,
+    save_as TEXT,
+    shot_count INTEGER
+);
+CREATE TABLE shots (
+    preset_id INTEGER NOT NULL REFERENCES presets(id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    shot_name TEXT NOT NULL,
+    start_frame REAL NOT NULL,
+    end_frame REAL NOT NULL
+);
+CREATE INDEX shots_preset ON shots (preset_id);
+CREATE INDEX shots_start ON shots (start_frame);
+"""
+
+
+class PresetCatalog(object):
+    """
+    An SQLite index of the presets under a root directory, stored in the root, that finds
+    the presets containing a shot, or a frame, without loading every preset's JSON.
+    It indexes each preset's shot names and frame ranges, export path and file type,
+    and is refreshed incrementally; only the presets whose modification time or size
+    changed are loaded again, see :meth:`refresh`.
+    """
+    def __init__(self, root_path):
+        """
+        Initializes the catalog, creating its file if it doesn't exist yet.
+
+        :param root_path: The directory to find the presets in, recursively.
+        :type root_path: str
+
+        :return: None
+        :rtype: None
+        """
+        self.root_path = os.path.abspath(root_path)
+        self._connection = sqlite3.connect(self.file_path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_VERSION:
+            with self._connection:
+                self._connection.executescript(
+                    "DROP TABLE IF EXISTS shots; DROP TABLE IF EXISTS presets;" + _SCHEMA
+                )
+                self._connection.execute("PRAGMA user_version = {:d}".format(CATALOG_VERSION))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def file_path(self):
+        return os.path.join(self.root_path, CATALOG_FILENAME)
+
+    def close(self):
+        self._connection.close()
+
+    def refresh(self):
+        """
+        Brings the catalog up to date with the presets under the root directory;
+        indexes the new and modified presets, and forgets the removed ones.
+        Files that aren't valid presets are remembered as such, so that they're
+        only loaded again once they change.
+
+        :return: The number of presets indexed again, and the number forgotten.
+        :rtype: tuple[int, int]
+        """
+        indexed = dict(
+            (path, (preset_id, mtime, size)) for preset_id, path, mtime, size
+            in self._connection.execute("SELECT id, path, mtime, size FROM presets")
+        )
+        updated = 0
+        with self._connection:
+            for path in self._preset_paths():
+                try:
+                    stat = os.stat(os.path.join(self.root_path, path))
+                except OSError:
+                    continue
+                preset_id, mtime, size = indexed.pop(path, (None, None, None))
+                if mtime == stat.st_mtime and size == stat.st_size:
+                    continue
+                if preset_id is not None:
+                    self._connection.execute("DELETE FROM presets WHERE id = ?", (preset_id,))
+                self._index(path, stat)
+                updated += 1
+            for preset_id, _, _ in indexed.values():
+                self._connection.execute("DELETE FROM presets WHERE id = ?", (preset_id,))
+        return updated, len(indexed)
+
+    def search(self, text="", frame=None, limit=500):
+        """
+        Finds the shots whose name contains the given text, ignoring case,
+        in every indexed preset.
+
+        :param text: The text to look for in the shots' names, all the shots if empty.
+        :type text: str
+
+        :param frame: Only find the shots containing this frame.
+        :type frame: int | float, optional
+
+        :param limit: The most shots to find.
+        :type limit: int
+
+        :return: The shots found, by preset path and row.
+        :rtype: list[CatalogMatch]
+        """
+        # no index serves a match within the names, the shots are scanned in a single query
+        query = ("SELECT presets.path, shots.shot_name, shots.start_frame, shots.end_frame,"
+                 " presets.export_path, presets.save_as"
+                 " FROM shots JOIN presets ON presets.id = shots.preset_id"
+                 " WHERE shots.shot_name LIKE ? ESCAPE '\\'")
+        like = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params = ["%{}%".format(like)]
+        if frame is not None:
+            query += " AND shots.start_frame <= ? AND shots.end_frame >= ?"
+            params += [frame, frame]
+        query += " ORDER BY presets.path, shots.row LIMIT ?"
+        params.append(limit)
+        return [
+            CatalogMatch(os.path.join(self.root_path, path), shot_name,
+                         exact_frame(start_frame), exact_frame(end_frame), export_path, save_as)
+            for path, shot_name, start_frame, end_frame, export_path, save_as
+            in self._connection.execute(query, params)
+        ]
+
+    def _preset_paths(self):
+        """
+        :return: The paths of the JSON files under the root directory, relative to it,
+            except for the export manifests, which aren't presets.
+        :rtype: Iterator[str]
+        """
+        for dir_path, _, file_names in os.walk(self.root_path):
+            for file_name in file_names:
+                if file_name.lower().endswith(".json") and file_name != MANIFEST_FILENAME:
+                    yield os.path.relpath(os.path.join(dir_path, file_name), self.root_path)
+
+    def _index(self, path, stat):
+        """
+        Loads a preset, and adds it and its shots to the catalog.
+
+        :param path: The path of the preset, relative to the root directory.
+        :type path: str
+
+        :param stat: The preset file's status, as it was indexed.
+        :type stat: os.stat_result
+
+        :return: None
+        :rtype: None
+        """
+        try:
+            preset = Preset.load(os.path.join(self.root_path, path))
+            names, starts, ends = preset.shots.columns()
+            shots = [(row, name or "", float(start), float(end))
+                     for row, (name, start, end) in enumerate(zip(names, starts, ends))]
+            export_path, save_as = preset.export_path, preset.save_as
+        except (IOError, OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._connection.execute(
+                "INSERT INTO presets (path, mtime, size, valid) VALUES (?, ?, ?, 0)",
+                (path, stat.st_mtime, stat.st_size)
+            )
+            return
+        preset_id = self._connection.execute(
+            "INSERT INTO presets (path, mtime, size, valid, export_path, save_as, shot_count)"
+            " VALUES (?, ?, ?, 1, ?, ?, ?)",
+            (path, stat.st_mtime, stat.st_size, export_path, save_as, len(shots))
+        ).lastrowid
+        self._connection.executemany(
+            "INSERT INTO shots (preset_id, row, shot_name, start_frame, end_frame)"
+            " VALUES (?, ?, ?, ?, ?)",
+            ((preset_id,) + shot for shot in shots)
+        )
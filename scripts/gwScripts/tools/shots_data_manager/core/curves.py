@@ -0,0 +1,163 @@
+
+import maya.cmds as cmds
+
+from gwScripts.tools.shots_data_manager.core import profile
+
+# counted while the export is profiled
+cmds = profile.counted(cmds)
+
+
+ANIM_CURVE_TYPES = ['animCurveTL', 'animCurveTA', 'animCurveTT', 'animCurveTU']
+
+# the tangent queries that, along with the keys' times and values, define a curve's shape
+TANGENT_QUERIES = ('inTangentType', 'outTangentType', 'inAngle', 'outAngle', 'inWeight', 'outWeight')
+
+# the largest difference between the key values of a curve considered static
+STATIC_TOLERANCE = 1e-6
+
+# how the keys of the anim curves are edited; with keyframe commands, or with MFnAnimCurve
+BACKENDS = ('cmds', 'api')
+
+
+class CurveIndex(object):
+    """
+    A data class that indexes the scene's anim curves; their names,
+    whether they are referenced, and the range of their keys.
+    Built once per export run and reused across all shots,
+    as long as the same main file is reopened for each shot.
+    """
+    def __init__(self, curves=(), referenced=(), key_ranges=None, key_counts=None):
+        """
+        Initializes the index.
+
+        :param curves: The names of the anim curves.
+        :type curves: list[str]
+
+        :param referenced: The names of the referenced anim curves.
+        :type referenced: list[str]
+
+        :param key_ranges: The (first, last) key times of each curve that has keys.
+        :type key_ranges: dict[str, tuple[float, float]], optional
+
+        :param key_counts: The number of keys of each curve that has keys.
+        :type key_counts: dict[str, int], optional
+
+        :return: None
+        :rtype: None
+        """
+        self.curves = list(curves)
+        self.referenced = set(referenced)
+        self.key_ranges = dict(key_ranges or {})
+        self.key_counts = dict(key_counts or {})
+        self.key_count = sum(self.key_counts.values())
+
+        # the global key range, so shots never need to pull every key through Python
+        if self.key_ranges:
+            self.first_key = min(first for first, _ in self.key_ranges.values())
+            self.last_key = max(last for _, last in self.key_ranges.values())
+        else:
+            self.first_key = None
+            self.last_key = None
+
+    def __len__(self):
+        return len(self.curves)
+
+    @property
+    def local_curves(self):
+        """
+        :return: The names of the non-referenced anim curves.
+        :rtype: list[str]
+        """
+        return [curve for curve in self.curves if curve not in self.referenced]
+
+    def curves_before(self, frame):
+        """
+        :return: The names of the anim curves that have keys before the given frame.
+        :rtype: list[str]
+        """
+        return [curve for curve in self.curves
+                if curve in self.key_ranges and self.key_ranges[curve][0] < frame]
+
+    def curves_after(self, frame):
+        """
+        :return: The names of the anim curves that have keys after the given frame.
+        :rtype: list[str]
+        """
+        return [curve for curve in self.curves
+                if curve in self.key_ranges and self.key_ranges[curve][1] > frame]
+
+    @classmethod
+    def from_scene(cls):
+        """
+        Constructor method for the class.
+        Indexes all the anim curves in the currently open scene.
+
+        :return: An index of the scene's anim curves.
+        :rtype: CurveIndex
+        """
+        curves = cmds.ls(type=ANIM_CURVE_TYPES)
+        if not curves:
+            return cls()
+
+        referenced = cmds.ls(curves, referencedNodes=True)
+        key_ranges = {}
+        key_counts = {}
+        for curve in curves:
+            # keys are stored sorted by time on each curve
+            times = cmds.keyframe(curve, q=True)
+            if times:
+                key_ranges[curve] = (times[0], times[-1])
+                key_counts[curve] = len(times)
+
+        return cls(curves, referenced, key_ranges, key_counts)
+
+    def matches_scene(self):
+        """
+        A quick check that the open scene's anim curves still match the index,
+        comparing the number of keys and the key range of every indexed curve.
+        The key times of all the curves are queried with a single command,
+        and split back into curves by the indexed key counts, so that a curve
+        whose number of keys changed shifts the ranges of the curves after it.
+
+        :return: Whether the scene matches the index.
+        :rtype: bool
+        """
+        if not self.curves:
+            return not cmds.ls(type=ANIM_CURVE_TYPES)
+        try:
+            if cmds.keyframe(self.curves, q=True, keyframeCount=True) != self.key_count:
+                return False
+            keyed_curves = [curve for curve in self.curves if curve in self.key_counts]
+            times = cmds.keyframe(keyed_curves, q=True) if keyed_curves else []
+        except ValueError:
+            # some of the indexed curves no longer exist
+            return False
+
+        start = 0
+        for curve in keyed_curves:
+            end = start + self.key_counts[curve]
+            if (times[start], times[end - 1]) != self.key_ranges[curve]:
+                return False
+            start = end
+        return True
+
+
+def query_curve_keys(curves=None):
+    """
+    Queries the keys of the anim curves, with a fixed number of commands per curve.
+
+    :param curves: The anim curves to query, all of the scene's anim curves if not passed.
+    :type curves: list[str], optional
+
+    :yields: The name, key times, key values, and per key tangents of each curve,
+        as (in type, out type, in angle, out angle, in weight, out weight).
+    :rtype: tuple[str, list[float], list[float], list[tuple]]
+    """
+    if curves is None:
+        curves = cmds.ls(type=ANIM_CURVE_TYPES) or []
+    for curve in curves:
+        times = cmds.keyframe(curve, q=True) or []
+        values = cmds.keyframe(curve, q=True, valueChange=True) or []
+        tangents = [cmds.keyTangent(curve, q=True, **{query: True}) or []
+                    for query in TANGENT_QUERIES]
+        yield curve, times, values, list(zip(*tangents))
@@ -0,0 +1,187 @@
+
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+
+from gwScripts.tools.shots_data_manager.core import profile
+from gwScripts.tools.shots_data_manager.core.curves import CurveIndex
+from gwScripts.utils import apiundo
+
+# counted while the export is profiled
+cmds = profile.counted(cmds)
+
+
+CURVE_TYPES = (
+    oma.MFnAnimCurve.kAnimCurveTL, oma.MFnAnimCurve.kAnimCurveTA,
+    oma.MFnAnimCurve.kAnimCurveTT, oma.MFnAnimCurve.kAnimCurveTU
+)
+
+
+class AnimCurveEdit(object):
+    """
+    Runs an edit of anim curves through `MFnAnimCurve`, recording every change
+    in an `MAnimCurveChange`, so that Maya can undo and redo the whole edit
+    as a single step once committed with :func:`gwScripts.utils.apiundo.commit`.
+    """
+    def __init__(self, edit):
+        """
+        Initializes the edit.
+
+        :param edit: Called with the `MAnimCurveChange` to record into,
+            returns the result of the edit.
+        :type edit: Callable
+
+        :return: None
+        :rtype: None
+        """
+        self.edit = edit
+        self.result = None
+        self._change = oma.MAnimCurveChange()
+        self._done = False
+
+    def doIt(self):
+        if self._done:
+            self._change.redoIt()
+            return
+        self._done = True
+        self.result = self.edit(self._change)
+
+    def undoIt(self):
+        self._change.undoIt()
+
+
+def iter_anim_curves():
+    """
+    Iterates over the time-based anim curves in the scene.
+
+    :yields: The function set of each anim curve.
+    :rtype: maya.api.OpenMayaAnim.MFnAnimCurve
+    """
+    iterator = om.MItDependencyNodes(om.MFn.kAnimCurve)
+    while not iterator.isDone():
+        fn_curve = oma.MFnAnimCurve(iterator.thisNode())
+        if fn_curve.animCurveType in CURVE_TYPES:
+            yield fn_curve
+        iterator.next()
+
+def index_scene():
+    """
+    The API 2.0 counterpart of :meth:`CurveIndex.from_scene`, reading
+    the key range of every anim curve through `MFnAnimCurve`.
+
+    :return: An index of the scene's anim curves.
+    :rtype: CurveIndex
+    """
+    unit = om.MTime.uiUnit()
+    curves = []
+    referenced = []
+    key_ranges = {}
+    key_counts = {}
+    for fn_curve in iter_anim_curves():
+        name = fn_curve.name()
+        curves.append(name)
+        if fn_curve.isFromReferencedFile:
+            referenced.append(name)
+        if fn_curve.numKeys:
+            key_ranges[name] = (
+                fn_curve.input(0).asUnits(unit),
+                fn_curve.input(fn_curve.numKeys - 1).asUnits(unit)
+            )
+            key_counts[name] = fn_curve.numKeys
+    return CurveIndex(curves, referenced, key_ranges, key_counts)
+
+def curve_objects(curves):
+    """
+    :param curves: The names of the anim curves.
+    :type curves: list[str]
+
+    :return: The anim curves' nodes, looked up by name in a single selection list.
+    :rtype: list[maya.api.OpenMaya.MObject]
+    """
+    selection = om.MSelectionList()
+    for curve in curves:
+        selection.add(curve)
+    return [selection.getDependNode(i) for i in range(selection.length())]
+
+def apply_shot(start_frame, end_frame, normalize, curve_index=None):
+    """
+    The API 2.0 counterpart of :meth:`Controller.apply_shot`.
+    Keys every non-referenced anim curve at the cut frames through `MFnAnimCurve`,
+    skipping the argument parsing and undo recording of a keyframe command per
+    curve, while the keying is still undone in a single step. All the curves are
+    then cut and shifted in time with the same commands as the "cmds" backend,
+    including those that failed keying, as a single command per step.
+
+    :param start_frame: The start frame of the shot.
+    :type start_frame: int
+
+    :param end_frame: The end frame of the shot.
+    :type end_frame: int
+
+    :param normalize: The normalization value by which to push all the keyframes back.
+    :type normalize: int
+
+    :param curve_index: The index of the scene's anim curves, when exporting
+        several shots from the same main file. Built from the scene if not passed.
+    :type curve_index: CurveIndex, optional
+
+    :return: List of curves that failed the keying operation, or empty list.
+    :rtype: list[str]
+    """
+    adjust_value = 0
+    if normalize is not None:
+        adjust_value = normalize - start_frame
+
+    if curve_index is None:
+        with profile.stage('index'):
+            curve_index = index_scene()
+
+    local_curves = curve_objects(curve_index.local_curves)
+    edit = AnimCurveEdit(lambda change: _key_curves(local_curves, start_frame, end_frame, change))
+    with profile.stage('key'):
+        apiundo.commit(edit)
+
+    with profile.stage('cut'):
+        if curve_index.first_key is not None and curve_index.first_key < start_frame:
+            cmds.cutKey(curve_index.curves_before(start_frame),
+                        t=(curve_index.first_key, start_frame-1))
+        if curve_index.last_key is not None and curve_index.last_key > end_frame:
+            cmds.cutKey(curve_index.curves_after(end_frame),
+                        t=(end_frame+1, curve_index.last_key))
+
+    if curve_index.curves and adjust_value:
+        with profile.stage('shift'):
+            cmds.keyframe(curve_index.curves, e=True, r=True, tc=adjust_value)
+
+    with profile.stage('playback'):
+        cmds.playbackOptions(
+            min=start_frame + adjust_value, ast=start_frame + adjust_value,
+            max=end_frame + adjust_value, aet=end_frame + adjust_value
+        )
+    return edit.result
+
+def _key_curves(curves, start_frame, end_frame, change):
+    """
+    Keys the curves at the cut frames with linear tangents, at their evaluated values.
+
+    :return: List of curves that failed the keying operation, or empty list.
+    :rtype: list[str]
+    """
+    unit = om.MTime.uiUnit()
+    linear = oma.MFnAnimCurve.kTangentLinear
+    cut_times = [om.MTime(frame, unit) for frame in sorted(set([start_frame, end_frame]))]
+
+    failed_anim_curves = []
+    for curve in curves:
+        fn_curve = oma.MFnAnimCurve(curve)
+        try:
+            for time in cut_times:
+                index = fn_curve.find(time)
+                if index is None:
+                    fn_curve.addKey(time, fn_curve.evaluate(time), linear, linear, change)
+                else:
+                    fn_curve.setInTangentType(index, linear, change)
+                    fn_curve.setOutTangentType(index, linear, change)
+        except RuntimeError:
+            failed_anim_curves.append(fn_curve.name())
+    return failed_anim_curves
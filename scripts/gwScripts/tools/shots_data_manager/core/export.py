@@ -0,0 +1,334 @@
+
+import os
+import time
+import maya.cmds as cmds
+
+from gwScripts.tools.shots_data_manager.core import profile
+from gwScripts.tools.shots_data_manager.core.curves import BACKENDS, CurveIndex
+from gwScripts.tools.shots_data_manager.core.shots import ShotResult
+from gwScripts.tools.shots_data_manager.ui.controller import Controller
+
+# counted while the export is profiled
+cmds = profile.counted(cmds)
+
+
+# the ways the main file's state is brought back between shots;
+# reopening it from disk, or rolling back the shot's changes in memory
+EXPORT_MODES = ('reload', 'restore')
+
+# the ways each shot is written; saving the whole scene under the shot's name,
+# or exporting all of it or only the given DAG roots, keeping the main file's name
+EXPORT_STRATEGIES = ('save', 'all', 'selected')
+
+FILE_TYPES = {
+    'ma': 'mayaAscii',
+    'mb': 'mayaBinary'
+}
+
+
+class SceneEditedError(RuntimeError):
+    """
+    Raised when the open scene was edited in between the shots of an export.
+    """
+
+
+class ShotExporter(object):
+    """
+    Exports shots from a main file into separate scene files.
+    Every shot starts from the main file's state, either by reopening it
+    from disk or, when possible, by undoing the shot's changes in memory
+    after it was saved, which skips the full scene load per shot.
+    """
+    _UNDO_CHUNK = "gwExportShot"
+
+    def __init__(self, main_file, export_path, normalize=None, file_type='mayaAscii',
+                 mode='restore', prune=False, strategy='save', roots=None,
+                 backend='cmds', controller=Controller, logger=None):
+        """
+        Initializes the exporter.
+
+        :param main_file: The path of the saved main file to split into shots.
+        :type main_file: str
+
+        :param export_path: The directory to save the shots to.
+        :type export_path: str
+
+        :param normalize: The frame to move the start of every shot to, or None.
+        :type normalize: int, optional
+
+        :param file_type: The Maya file type to save the shots as,
+            either 'mayaAscii' or 'mayaBinary'.
+        :type file_type: str, optional
+
+        :param mode: One of `EXPORT_MODES`; how the main file's state is
+            brought back between shots. "restore" falls back to "reload"
+            whenever the state can't be restored in memory.
+        :type mode: str, optional
+
+        :param prune: Remove the anim curves that are static throughout each shot
+            before saving it, see :meth:`Controller.prune_shot`.
+        :type prune: bool, optional
+
+        :param strategy: One of `EXPORT_STRATEGIES`; how each shot is written.
+            "all" and "selected" export the shot without renaming the open scene,
+            and "selected" only exports `roots` with their upstream connections,
+            such as their animation, constraints and shaders.
+        :type strategy: str, optional
+
+        :param roots: The full paths of the DAG roots to export with the "selected" strategy.
+        :type roots: list[str], optional
+
+        :param backend: One of `BACKENDS`; how the keys are edited,
+            see :meth:`Controller.apply_shot`.
+        :type backend: str, optional
+
+        :param controller: The controller that applies each shot to the scene.
+        :type controller: Controller, optional
+
+        :param logger: Pass a specific logger for the exporter.
+        :type logger: logging.Logger, optional
+
+        :return: None
+        :rtype: None
+        """
+        if mode not in EXPORT_MODES:
+            raise ValueError("Mode must be one of: {}.".format(", ".join(EXPORT_MODES)))
+        if file_type not in FILE_TYPES.values():
+            raise ValueError("File type must be one of: {}.".format(", ".join(FILE_TYPES.values())))
+        if strategy not in EXPORT_STRATEGIES:
+            raise ValueError("Strategy must be one of: {}.".format(", ".join(EXPORT_STRATEGIES)))
+        if strategy == 'selected' and not roots:
+            raise ValueError("The \"selected\" strategy requires the roots to export.")
+        if backend not in BACKENDS:
+            raise ValueError("Backend must be one of: {}.".format(", ".join(BACKENDS)))
+
+        self.main_file = main_file
+        self.export_path = export_path
+        self.normalize = normalize
+        self.file_type = file_type
+        self.mode = mode
+        self.prune = prune
+        self.strategy = strategy
+        self.roots = list(roots or [])
+        self.backend = backend
+        self.controller = controller
+        self.logger = logger
+        self.curve_index = None
+        self._playback_range = None
+        self._main_file_type = None
+
+    def export(self, shots):
+        """
+        Exports all the shots, one at a time.
+        The main file is left open in between the shots, and opened again once
+        all shots were exported, or if the export is stopped early.
+        When the export is stepped through, e.g. from Qt's event loop, the scene
+        can be edited in between the shots; the export is then stopped, keeping
+        the edits instead of reopening the main file over them.
+
+        :param shots: The shots to export.
+        :type shots: Shots
+
+        :raises SceneEditedError: If the scene was edited in between the shots.
+
+        :yields: The result of each exported shot.
+        :rtype: ShotResult
+        """
+        self.open_main_file()
+        in_between = False
+        try:
+            for row in shots:
+                in_between = False
+                result = self.export_shot(
+                    shots.get_shot_name(row), shots.get_shot_start(row), shots.get_shot_end(row)
+                )
+                # reopened now rather than before the next shot, so that edits can be told apart
+                if not self._is_main_file_open():
+                    self._reload()
+                in_between = True
+                yield result
+                if not self._is_main_file_open():
+                    raise SceneEditedError(
+                        "The scene was edited during the export of \"{}\".".format(self.main_file)
+                    )
+        finally:
+            # the main file was left open in between the shots, anything else is an edit
+            if not in_between:
+                self.finalize()
+
+    def open_main_file(self, force=False):
+        """
+        Makes sure the main file is the open scene, and indexes its anim curves.
+
+        :param force: Reopen the main file from disk even if it's already open,
+            e.g. after a shot failed halfway through.
+        :type force: bool, optional
+
+        :return: None
+        :rtype: None
+        """
+        if force or not self._is_main_file_open():
+            self._reload()
+        with profile.stage('index'):
+            self.curve_index = CurveIndex.from_scene()
+        self._playback_range = {
+            key: cmds.playbackOptions(q=True, **{key: True}) for key in ('min', 'max', 'ast', 'aet')
+        }
+        # saving a shot under the "save" strategy sets the session's file type to the shots'
+        file_type = cmds.file(q=True, type=True)
+        self._main_file_type = file_type[0] if file_type else None
+
+    def export_shot(self, shot_name, start_frame, end_frame):
+        """
+        Applies a single shot to the main file's state and saves it,
+        then brings the main file's state back for the next shot.
+
+        :param shot_name: The name of the shot, used as its file name.
+        :type shot_name: str
+
+        :param start_frame: The start frame of the shot.
+        :type start_frame: int | float
+
+        :param end_frame: The end frame of the shot.
+        :type end_frame: int | float
+
+        :return: The result of the exported shot, with the error that stopped it,
+            if any; the main file's state is brought back either way.
+        :rtype: ShotResult
+        """
+        start_time = time.time()
+        with profile.shot(shot_name):
+            if self.curve_index is None:
+                self.open_main_file()
+            elif not self._is_main_file_open():
+                self._reload()
+
+            restore = self.mode == 'restore' and cmds.undoInfo(q=True, state=True)
+            if restore:
+                cmds.undoInfo(openChunk=True, chunkName=self._UNDO_CHUNK)
+            failed_anim_curves, pruned_anim_curves, file_path, error = [], [], None, None
+            try:
+                failed_anim_curves = self.controller.apply_shot(
+                    start_frame, end_frame, self.normalize, self.curve_index, self.backend
+                )
+                if self.prune:
+                    with profile.stage('prune'):
+                        pruned_anim_curves = self.controller.prune_shot(
+                            self.curve_index, skip=failed_anim_curves
+                        )
+                # saved within the chunk, as selecting the roots to export is undoable
+                with profile.stage('save'):
+                    file_path = self._save(shot_name)
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+                self._warning("Failed to export \"{}\": {}".format(shot_name, error))
+            finally:
+                if restore:
+                    cmds.undoInfo(closeChunk=True, chunkName=self._UNDO_CHUNK)
+
+            if restore:
+                with profile.stage('restore'):
+                    restored = self._restore()
+                if not restored:
+                    self._warning(
+                        "Failed to restore the main file in memory, reopening it from disk."
+                    )
+                    self._reload()
+            elif error:
+                # start the next shot from a clean main file
+                self._reload()
+
+        return ShotResult(
+            shot_name, file_path if error is None else None, failed_anim_curves,
+            pruned_anim_curves, error, time.time() - start_time,
+            len(self.curve_index.curves), _file_size(file_path) if error is None else None
+        )
+
+    def finalize(self):
+        """
+        Leaves the main file as the open scene, reopening it only if needed.
+
+        :return: None
+        :rtype: None
+        """
+        if not self._is_main_file_open():
+            self._reload()
+
+    def _is_main_file_open(self):
+        """
+        :return: Whether the open scene is the main file, without any changes.
+        :rtype: bool
+        """
+        return (cmds.file(q=True, sn=True) == self.main_file
+                and not cmds.file(q=True, modified=True))
+
+    def _save(self, shot_name):
+        """
+        Writes the open scene as the given shot, using the exporter's strategy.
+
+        :return: The path of the saved shot.
+        :rtype: str
+        """
+        if self.strategy == 'save':
+            cmds.file(rename=os.path.join(self.export_path, shot_name))
+            return cmds.file(save=True, force=True, type=self.file_type)
+
+        extension = next(ext for ext, file_type in FILE_TYPES.items() if file_type == self.file_type)
+        file_path = os.path.join(self.export_path, "{}.{}".format(shot_name, extension))
+        if self.strategy == 'all':
+            cmds.file(file_path, exportAll=True, preserveReferences=True,
+                      force=True, type=self.file_type)
+        else:
+            cmds.select(self.roots, replace=True)
+            cmds.file(file_path, exportSelected=True, preserveReferences=True,
+                      constructionHistory=True, channels=True, constraints=True,
+                      expressions=True, shader=True, force=True, type=self.file_type)
+            cmds.select(clear=True)
+        return file_path
+
+    def _restore(self):
+        """
+        Undoes the changes of the last shot to get back to the main file's state,
+        verifying that the anim curves match the main file's index afterwards.
+
+        :return: Whether the main file's state was restored.
+        :rtype: bool
+        """
+        if cmds.undoInfo(q=True, undoName=True) != self._UNDO_CHUNK:
+            return False
+        try:
+            cmds.undo()
+        except RuntimeError:
+            return False
+        cmds.playbackOptions(**self._playback_range)
+        cmds.file(rename=self.main_file)
+        if self.strategy == 'save' and self._main_file_type:
+            cmds.file(type=self._main_file_type)
+        if not self.curve_index.matches_scene():
+            return False
+        cmds.file(modified=False)
+        return True
+
+    def _reload(self):
+        """
+        Reopens the main file from disk.
+
+        :return: None
+        :rtype: None
+        """
+        with profile.stage('reload'):
+            cmds.file(self.main_file, open=True, force=True, loadReferenceDepth="all")
+
+    def _warning(self, message):
+        if self.logger:
+            self.logger.warning(message)
+
+
+def _file_size(file_path):
+    """
+    :return: The size of the file in bytes, or None if it wasn't written.
+    :rtype: int | None
+    """
+    if not os.path.isfile(file_path):
+        return None
+    return os.path.getsize(file_path)
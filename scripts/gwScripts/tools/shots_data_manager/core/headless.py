@@ -0,0 +1,236 @@
+
+import os
+import sys
+import types
+import logging
+import argparse
+
+
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 4))
+
+
+def export_preset(main_file, preset, export_path=None, mode='restore', prune=False,
+                  strategy='save', roots=None, backend='cmds', workers=1, offline=False,
+                  logger=None, profile_dir=None):
+    """
+    Exports the shots of a preset from a main file, without any GUI.
+    Runs the same pipeline as the tool's window, using the preset's
+    shots and export settings; the rename settings are ignored, as
+    the shot names are already stored in the preset.
+
+    :param main_file: The path of the saved main file to split into shots.
+    :type main_file: str
+
+    :param preset: The preset, or the path of a preset file saved by the tool.
+    :type preset: Preset | str
+
+    :param export_path: Overrides the preset's export path.
+        Created if it doesn't exist.
+    :type export_path: str, optional
+
+    :param mode: How the main file's state is brought back between shots,
+        see :class:`ShotExporter`.
+    :type mode: str, optional
+
+    :param prune: Remove the anim curves that are static throughout each shot.
+    :type prune: bool, optional
+
+    :param strategy: How each shot is written, see :class:`ShotExporter`.
+    :type strategy: str, optional
+
+    :param roots: The DAG roots to export with the "selected" strategy.
+    :type roots: list[str], optional
+
+    :param backend: How the keys are edited, see :meth:`Controller.apply_shot`.
+    :type backend: str, optional
+
+    :param workers: The number of headless Maya processes to export with,
+        or 1 to export in the current session.
+    :type workers: int, optional
+
+    :param offline: Split the main file as Maya ASCII text, without Maya,
+        see :class:`MaShotSplitter`. Pruning, strategies, backends and workers don't apply.
+    :type offline: bool, optional
+
+    :param logger: Pass a specific logger for the export.
+    :type logger: logging.Logger, optional
+
+    :param profile_dir: The directory for the workers to write their export profiles to,
+        see :class:`Profile`. Profile the current session with :class:`Profile` instead.
+    :type profile_dir: str, optional
+
+    :raises ValueError: If the preset has no shots or export path,
+        or if it doesn't save Maya ASCII files when splitting offline.
+    :raises IOError: If the main file doesn't exist.
+
+    :yields: The result of each exported shot.
+    :rtype: ShotResult
+    """
+    # imported here, so the command-line entry point can initialize Maya first
+    from gwScripts.tools.shots_data_manager.core.preset import Preset
+
+    if not isinstance(preset, Preset):
+        preset = Preset.load(preset)
+    if not preset.shots:
+        raise ValueError("The preset \"{}\" has no shots.".format(preset.file_path))
+
+    main_file = os.path.abspath(main_file)
+    if not os.path.isfile(main_file):
+        raise IOError("The main file \"{}\" doesn't exist.".format(main_file))
+
+    export_path = export_path or preset.export_path
+    if not export_path:
+        raise ValueError("The preset \"{}\" has no export path.".format(preset.file_path))
+    if not os.path.isdir(export_path):
+        os.makedirs(export_path)
+
+    normalize = preset.normalize_frame if preset.normalize else None
+
+    if offline:
+        from gwScripts.tools.shots_data_manager.core.mafile import MaShotSplitter
+        if preset.save_as != 'ma':
+            raise ValueError("Only Maya ASCII files can be split offline.")
+        exporter = MaShotSplitter(main_file, export_path, normalize, logger=logger)
+        for result in exporter.export(preset.shots):
+            yield result
+        return
+
+    from gwScripts.tools.shots_data_manager.core.batch import BatchExporter
+    from gwScripts.tools.shots_data_manager.core.export import FILE_TYPES, ShotExporter
+    file_type = FILE_TYPES[preset.save_as]
+
+    if workers > 1:
+        exporter = BatchExporter(
+            main_file, export_path, normalize, file_type,
+            mode=mode, prune=prune, strategy=strategy, roots=roots, backend=backend,
+            workers=workers, profile_dir=profile_dir
+        )
+    else:
+        exporter = ShotExporter(
+            main_file, export_path, normalize, file_type,
+            mode=mode, prune=prune, strategy=strategy, roots=roots, backend=backend,
+            logger=logger
+        )
+    for result in exporter.export(preset.shots):
+        yield result
+
+def parse_args(argv=None):
+    """
+    :return: The parsed command-line arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Splits a main file into shots using a Shots Data Manager preset."
+    )
+    parser.add_argument('main_file', help="The path of the saved main file.")
+    parser.add_argument('preset', help="The path of the preset file saved by the tool.")
+    parser.add_argument('--export-path', default=None,
+                        help="Overrides the preset's export path.")
+    parser.add_argument('--mode', default='restore', choices=['reload', 'restore'],
+                        help="How the main file's state is brought back between shots.")
+    parser.add_argument('--prune', action='store_true',
+                        help="Remove the anim curves that are static throughout each shot.")
+    parser.add_argument('--strategy', default='save', choices=['save', 'all', 'selected'],
+                        help="How each shot is written.")
+    parser.add_argument('--roots', nargs='+', default=None,
+                        help="The DAG roots to export with the \"selected\" strategy.")
+    parser.add_argument('--backend', default='cmds', choices=['cmds', 'api'],
+                        help="Edit the keys with keyframe commands, or with MFnAnimCurve.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="The number of headless Maya processes to export with.")
+    parser.add_argument('--offline', action='store_true',
+                        help="Split the Maya ASCII main file as text, without Maya.")
+    parser.add_argument('--profile', default=None,
+                        help="The directory to write the export's profile to, "
+                             "see core/profile.py for a report of the slowest stages.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    The command-line entry point, run with `mayapy`, or with any Python
+    interpreter when splitting offline:
+
+        mayapy shots_data_manager/core/headless.py main.ma preset.json
+        python shots_data_manager/core/headless.py main.ma preset.json --offline
+
+    :return: The exit code; 0 if all the shots were exported, otherwise 1.
+    :rtype: int
+    """
+    args = parse_args(argv)
+
+    logger = logging.getLogger("gwScripts: Shots Data Manager")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+
+    # Maya must be initialized before any gwScripts module is imported
+    sys.path.insert(0, SCRIPTS_DIR)
+    if args.offline:
+        _register_packages()
+    else:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+        # imported before profiling, so that their commands are counted
+        import gwScripts.tools.shots_data_manager.core.export
+    from gwScripts.tools.shots_data_manager.core import profile
+
+    failed = 0
+    results = export_preset(
+        args.main_file, args.preset, args.export_path, args.mode, args.prune,
+        args.strategy, args.roots, args.backend, args.workers, args.offline, logger,
+        profile_dir=args.profile
+    )
+    run_profile = profile.Profile(
+        profile.profile_path(args.profile) if args.profile else None,
+        main_file=os.path.abspath(args.main_file), preset=args.preset, mode=args.mode,
+        prune=args.prune, strategy=args.strategy, backend=args.backend,
+        workers=args.workers, offline=args.offline
+    )
+    try:
+        with run_profile:
+            for result in results:
+                if result.error:
+                    failed += 1
+                    logger.error("Failed to export \"{}\": {}".format(
+                        result.shot_name, result.error
+                    ))
+                    continue
+                logger.info("Exported \"{}\" in {:.1f}s ({} anim curves, {:.1f} MB).".format(
+                    result.file_path, result.seconds or 0.0, result.curve_count or 0,
+                    (result.file_size or 0) / 1048576.0
+                ))
+                for anim_curve in result.failed_anim_curves:
+                    logger.warning("Skipped keying \"{}\" in \"{}\".".format(
+                        anim_curve, result.shot_name
+                    ))
+    except (IOError, ValueError) as e:
+        logger.error(str(e))
+        return 1
+    except KeyboardInterrupt:
+        # stop the exporter, which brings the main file back or stops the workers
+        results.close()
+        logger.warning("Export cancelled.")
+        return 1
+    finally:
+        if not args.offline:
+            maya.standalone.uninitialize()
+
+    return 1 if failed else 0
+
+def _register_packages():
+    """
+    Registers the packages of the core modules without running their `__init__` files,
+    which import Maya, so that the Maya-free core modules can be imported offline.
+
+    :return: None
+    :rtype: None
+    """
+    for package in ("gwScripts", "gwScripts.tools", "gwScripts.tools.shots_data_manager",
+                    "gwScripts.tools.shots_data_manager.core"):
+        if package not in sys.modules:
+            module = types.ModuleType(package)
+            module.__path__ = [os.path.join(SCRIPTS_DIR, *package.split("."))]
+            sys.modules[package] = module
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+
+from bisect import bisect_left, bisect_right, insort
+
+
+# the problems a shot's range can have, see :meth:`ShotIntervals.problems`
+INVALID = "invalid"
+OVERLAP = "overlap"
+GAP = "gap"
+
+
+class ShotIntervals(object):
+    """
+    An index of the shots' frame ranges, that finds the shots containing
+    a frame, the shots overlapping each other and the gaps in between them.
+
+    The shots are kept sorted by start frame, under a segment tree of their
+    largest end frames, so that the shots overlapping a range are found in
+    O(log n + k); a binary search bounds the shots that start before the range
+    ends, and the tree skips every subtree of them that ends before it starts.
+    Shots are updated one at a time in a binary search as well, so that an edited
+    range only re-checks the shots around it, see :meth:`set_shot`, and the tree
+    is rebuilt on the next query.
+    Shots that end before they start are flagged, and left out of every query.
+    """
+    def __init__(self, shots=None):
+        """
+        Initializes the index.
+
+        :param shots: The shots to index.
+        :type shots: Shots, optional
+
+        :return: None
+        :rtype: None
+        """
+        # the (start frame, row) of every valid shot, sorted
+        self._by_start = []
+        # the segment tree of the largest end frame over the shots in `_by_start`,
+        # as a flat list where node i has the children 2i and 2i+1, built when queried
+        self._max_ends = None
+        # the (start frame, end frame) of every shot, by row
+        self._ranges = {}
+        self._invalid = set()
+        if shots is not None:
+            for row in shots:
+                start, end = shots.get_shot_start(row), shots.get_shot_end(row)
+                self._ranges[row] = (start, end)
+                if end < start:
+                    self._invalid.add(row)
+                else:
+                    self._by_start.append((start, row))
+            self._by_start.sort()
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, row):
+        return row in self._ranges
+
+    def set_shot(self, row, start_frame, end_frame):
+        """
+        Adds a shot to the index, or updates its range.
+
+        :param row: The row of the shot.
+        :type row: int
+
+        :param start_frame: The start frame of the shot.
+        :type start_frame: int | float
+
+        :param end_frame: The end frame of the shot.
+        :type end_frame: int | float
+
+        :return: The rows whose problems may have changed, see :meth:`problems`.
+        :rtype: set[int]
+        """
+        changed = self.remove_shot(row)
+        changed.update(self._first_rows())
+        self._ranges[row] = (start_frame, end_frame)
+        if end_frame < start_frame:
+            self._invalid.add(row)
+        else:
+            insort(self._by_start, (start_frame, row))
+            self._max_ends = None
+            changed.update(self._neighbours(start_frame, end_frame))
+        changed.add(row)
+        return changed
+
+    def remove_shot(self, row):
+        """
+        Removes a shot from the index, if it's indexed.
+
+        :param row: The row of the shot.
+        :type row: int
+
+        :return: The rows whose problems may have changed, see :meth:`problems`.
+        :rtype: set[int]
+        """
+        if row not in self._ranges:
+            return set()
+        start, end = self._ranges.pop(row)
+        if row in self._invalid:
+            self._invalid.discard(row)
+            return set()
+        changed = self._first_rows()
+        del self._by_start[bisect_left(self._by_start, (start, row))]
+        self._max_ends = None
+        changed.update(self._neighbours(start, end))
+        changed.discard(row)
+        return changed
+
+    def rows_at(self, frame):
+        """
+        :param frame: The frame to look up.
+        :type frame: int | float
+
+        :return: The rows of the shots containing the frame, sorted by start frame.
+        :rtype: list[int]
+        """
+        return self.rows_overlapping(frame, frame)
+
+    def rows_overlapping(self, start_frame, end_frame):
+        """
+        :param start_frame: The first frame of the range.
+        :type start_frame: int | float
+
+        :param end_frame: The last frame of the range, included.
+        :type end_frame: int | float
+
+        :return: The rows of the shots sharing any frame with the range, sorted by start frame.
+        :rtype: list[int]
+        """
+        if not self._by_start or end_frame < start_frame:
+            return []
+        if self._max_ends is None:
+            self._max_ends = self._build_max_ends()
+        max_ends = self._max_ends
+        # only the shots starting before the range ends, and ending after it starts
+        last = bisect_right(self._by_start, (end_frame, float('inf')))
+        rows = []
+        stack = [(1, 0, len(max_ends) // 2)]  # (node, first shot, number of shots)
+        while stack:
+            node, first, count = stack.pop()
+            if first >= last or max_ends[node] < start_frame:
+                continue
+            if count == 1:
+                rows.append(self._by_start[first][1])
+                continue
+            half = count // 2
+            # the right child is popped last, to keep the rows sorted by start frame
+            stack.append((2 * node + 1, first + half, half))
+            stack.append((2 * node, first, half))
+        return rows
+
+    def problems(self, row):
+        """
+        :param row: The row of the shot.
+        :type row: int
+
+        :return: The problems of the shot's range; INVALID if it ends before it starts,
+            OVERLAP if it shares frames with another shot and GAP if the frame before it
+            isn't part of any shot, while other shots start before it.
+        :rtype: set[str]
+        """
+        if row in self._invalid:
+            return {INVALID}
+        problems = set()
+        start, end = self._ranges[row]
+        if any(other != row for other in self.rows_overlapping(start, end)):
+            problems.add(OVERLAP)
+        if self._by_start[0][0] < start and not self.rows_at(start - 1):
+            problems.add(GAP)
+        return problems
+
+    def invalid(self):
+        """
+        :return: The rows of the shots that end before they start.
+        :rtype: list[int]
+        """
+        return sorted(self._invalid)
+
+    def overlaps(self):
+        """
+        Sweeps the shots by start frame, where each shot only visits
+        the shots it overlaps, in O(n + k) for k pairs.
+
+        :return: Every pair of overlapping shots' rows, sorted by their start frames.
+        :rtype: list[tuple[int, int]]
+        """
+        pairs = []
+        for i, (_, row) in enumerate(self._by_start):
+            end = self._ranges[row][1]
+            for j in range(i + 1, len(self._by_start)):
+                other_start, other = self._by_start[j]
+                if other_start > end:
+                    break
+                pairs.append((row, other))
+        return pairs
+
+    def gaps(self):
+        """
+        :return: The (first frame, last frame) of every gap in between the shots.
+        :rtype: list[tuple[int | float, int | float]]
+        """
+        gaps = []
+        covered = None
+        for start, row in self._by_start:
+            if covered is not None and start > covered + 1:
+                gaps.append((covered + 1, start - 1))
+            end = self._ranges[row][1]
+            covered = end if covered is None else max(covered, end)
+        return gaps
+
+    def _build_max_ends(self):
+        """
+        :return: The segment tree of the largest end frame, over a power of two
+            of leaves, where the leaves past the shots end at minus infinity.
+        :rtype: list[int | float]
+        """
+        size = 1
+        while size < len(self._by_start):
+            size *= 2
+        max_ends = [float('-inf')] * (2 * size)
+        for i, (_, row) in enumerate(self._by_start):
+            max_ends[size + i] = self._ranges[row][1]
+        for node in range(size - 1, 0, -1):
+            max_ends[node] = max(max_ends[2 * node], max_ends[2 * node + 1])
+        return max_ends
+
+    def _neighbours(self, start_frame, end_frame):
+        """
+        :return: The rows whose problems depend on the given range being covered;
+            the shots overlapping it or starting right after it, along with
+            the first shots, which have no gap before them.
+        :rtype: set[int]
+        """
+        return set(self.rows_overlapping(start_frame, end_frame + 1)) | self._first_rows()
+
+    def _first_rows(self):
+        """
+        :return: The rows of the shots with the earliest start frame.
+        :rtype: set[int]
+        """
+        if not self._by_start:
+            return set()
+        first_start = self._by_start[0][0]
+        return set(row for _, row in self._by_start[:bisect_right(
+            self._by_start, (first_start, float('inf'))
+        )])
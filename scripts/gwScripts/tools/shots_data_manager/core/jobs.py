@@ -0,0 +1,156 @@
+from collections import deque
+
+try:
+    from PySide6 import QtCore
+except:
+    from PySide2 import QtCore
+
+
+class ExportJob(object):
+    """
+    A queued export run; started once it's first in the queue,
+    then stepped through one shot at a time.
+    """
+    def __init__(self, start, total=0, context=None):
+        """
+        Initializes the job.
+
+        :param start: Called with the job once it starts, returns the iterator
+            of the shots' results, where a None result means the export is still
+            waiting on a shot, e.g. :meth:`BatchExporter.export` with `poll`.
+            Called this late so that the job prepares from the main file's state
+            at that time, not at the time it was queued.
+        :type start: Callable[[ExportJob], Iterator[ShotResult | None]]
+
+        :param total: The number of shots to export, may be updated by `start`.
+        :type total: int, optional
+
+        :param context: Any state the job's owner keeps along with the job.
+        :type context: dict, optional
+
+        :return: None
+        :rtype: None
+        """
+        self.start = start
+        self.total = total
+        self.context = context if context is not None else {}
+        self.results = None
+        self.done = 0
+        self.cancelled = False
+        self.error = None
+
+
+class ExportQueue(QtCore.QObject):
+    """
+    Runs export jobs one after the other from Qt's event loop, exporting a
+    single shot per timer tick, so that the UI and Maya's viewport stay
+    responsive in between shots and more jobs can be queued while one runs.
+    Maya commands must run on the main thread, hence a timer and not a thread.
+    """
+    job_started = QtCore.Signal(object)
+    shot_exported = QtCore.Signal(object, object)
+    job_finished = QtCore.Signal(object)
+
+    def __init__(self, parent=None):
+        """
+        Initializes the queue.
+
+        :param parent: Use to parent the queue to another object.
+        :type parent: QtCore.QObject, optional
+
+        :return: None
+        :rtype: None
+        """
+        super(ExportQueue, self).__init__(parent)
+        self._jobs = deque()
+        self.current = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def __len__(self):
+        """
+        :return: The number of jobs, including the running one.
+        :rtype: int
+        """
+        return len(self._jobs) + (1 if self.current else 0)
+
+    @property
+    def pending(self):
+        """
+        :return: The number of jobs waiting for the running one.
+        :rtype: int
+        """
+        return len(self._jobs)
+
+    def enqueue(self, job):
+        """
+        Adds a job to the queue, starting it on the next tick if the queue is idle.
+
+        :param job: The job to run.
+        :type job: ExportJob
+
+        :return: None
+        :rtype: None
+        """
+        self._jobs.append(job)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self):
+        """
+        Cancels the running job and all the pending ones.
+        The running job is stopped between shots, closing its iterator
+        so that the exporter brings the main file back or stops its workers.
+
+        :return: None
+        :rtype: None
+        """
+        pending = list(self._jobs)
+        self._jobs.clear()
+        for job in pending:
+            job.cancelled = True
+            self.job_finished.emit(job)
+        if self.current:
+            self.current.cancelled = True
+            self._finish()
+
+    def _step(self):
+        """
+        Starts the next job if none is running, or gets the next result of the running job.
+
+        :return: None
+        :rtype: None
+        """
+        if self.current is None:
+            if not self._jobs:
+                self._timer.stop()
+                return
+            self.current = self._jobs.popleft()
+            try:
+                self.current.results = iter(self.current.start(self.current))
+            except Exception as e:
+                self.current.error = e
+                self._finish()
+                return
+            self.job_started.emit(self.current)
+            return
+
+        try:
+            result = next(self.current.results)
+        except StopIteration:
+            self._finish()
+            return
+        except Exception as e:
+            self.current.error = e
+            self._finish()
+            return
+        if result is not None:
+            self.current.done += 1
+            self.shot_exported.emit(self.current, result)
+
+    def _finish(self):
+        job, self.current = self.current, None
+        if job.results is not None and hasattr(job.results, 'close'):
+            job.results.close()
+        self.job_finished.emit(job)
@@ -0,0 +1,291 @@
+
+from bisect import bisect_left
+
+try:
+    import numpy
+except ImportError:
+    # Maya doesn't ship with NumPy, the scalar kernel is used instead
+    numpy = None
+
+
+# the tangent types of the cut keys, as in `MFnAnimCurve` and Maya ASCII files
+LINEAR_TANGENT = 2
+STEP_TANGENT = 5
+STEP_NEXT_TANGENT = 17
+
+
+class PackedCurves(object):
+    """
+    A data class that packs the keys of many anim curves into flat arrays,
+    one after the other, where the keys of curve `i` are in the range
+    `offsets[i]:offsets[i+1]` and sorted by time.
+    The arrays are NumPy arrays when NumPy is installed, otherwise lists.
+    """
+    def __init__(self, times, values, offsets, in_tangents=None, out_tangents=None, names=None,
+                 sources=None):
+        """
+        Initializes the packed curves.
+
+        :param times: The times of all the keys.
+        :type times: list[float]
+
+        :param values: The values of all the keys.
+        :type values: list[float]
+
+        :param offsets: The index of the first key of each curve, followed by the number of keys.
+        :type offsets: list[int]
+
+        :param in_tangents: The in tangent types of all the keys, or None if unknown.
+        :type in_tangents: list[int], optional
+
+        :param out_tangents: The out tangent types of all the keys, or None if unknown.
+        :type out_tangents: list[int], optional
+
+        :param names: The names of the curves.
+        :type names: list[str], optional
+
+        :param sources: For cut curves, the index of each key in the curves they were
+            cut from, or -1 for the new cut keys, see :func:`trim_curves`.
+        :type sources: list[int], optional
+
+        :return: None
+        :rtype: None
+        """
+        self.times = times
+        self.values = values
+        self.offsets = offsets
+        self.in_tangents = in_tangents
+        self.out_tangents = out_tangents
+        self.names = names
+        self.sources = sources
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def curve(self, i):
+        """
+        :return: The (times, values) of a single curve, as lists.
+        :rtype: tuple[list[float], list[float]]
+        """
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return list(self.times[start:end]), list(self.values[start:end])
+
+    @classmethod
+    def pack(cls, curves, names=None, use_numpy=True):
+        """
+        Constructor method for the class.
+        Packs curves from any source of per-curve keys, e.g. the keys
+        read from `MFnAnimCurve` or parsed from a Maya ASCII file.
+
+        :param curves: The (times, values) or (times, values, in tangents, out tangents)
+            of each curve.
+        :type curves: list[tuple[list[float], ...]]
+
+        :param names: The names of the curves.
+        :type names: list[str], optional
+
+        :param use_numpy: Pack into NumPy arrays, if NumPy is installed.
+        :type use_numpy: bool, optional
+
+        :return: The packed curves.
+        :rtype: PackedCurves
+        """
+        times, values, in_tangents, out_tangents = [], [], [], []
+        offsets = [0]
+        has_tangents = True
+        for curve in curves:
+            times.extend(curve[0])
+            values.extend(curve[1])
+            if len(curve) > 2 and has_tangents:
+                in_tangents.extend(curve[2])
+                out_tangents.extend(curve[3])
+            else:
+                has_tangents = False
+            offsets.append(len(times))
+        if not has_tangents:
+            in_tangents = out_tangents = None
+
+        if numpy is not None and use_numpy:
+            times = numpy.asarray(times, dtype=numpy.float64)
+            values = numpy.asarray(values, dtype=numpy.float64)
+            offsets = numpy.asarray(offsets, dtype=numpy.int64)
+            if has_tangents:
+                in_tangents = numpy.asarray(in_tangents, dtype=numpy.int32)
+                out_tangents = numpy.asarray(out_tangents, dtype=numpy.int32)
+        return cls(times, values, offsets, in_tangents, out_tangents, names)
+
+
+def trim_curves(curves, start_frame, end_frame, adjust_value=0, cut_values=None):
+    """
+    Applies the same cut as :meth:`Controller.apply_shot` to all the curves at once;
+    keys them at the cut frames with linear tangents, removes the keys outside
+    of them and shifts the remaining keys in time. The values of the cut keys
+    are the given ones, evaluated by the source of the curves, e.g. along their
+    tangents, otherwise they are interpolated linearly, holding the first and
+    last keys outside of the curves' range, and stepped segments keep their
+    stepped values. Empty curves stay empty.
+
+    Runs as a handful of array operations when the curves are packed into
+    NumPy arrays, otherwise falls back to :func:`trim_curves_scalar`.
+
+    :param curves: The packed curves.
+    :type curves: PackedCurves
+
+    :param start_frame: The start frame of the shot.
+    :type start_frame: int | float
+
+    :param end_frame: The end frame of the shot.
+    :type end_frame: int | float
+
+    :param adjust_value: The offset to shift the keys by.
+    :type adjust_value: int | float, optional
+
+    :param cut_values: The value of each curve at the start frame, and at the end frame.
+    :type cut_values: tuple[list[float], list[float]], optional
+
+    :return: The cut curves, packed the same way, along with the source of each key.
+    :rtype: PackedCurves
+    """
+    if numpy is None or not isinstance(curves.times, numpy.ndarray):
+        return trim_curves_scalar(curves, start_frame, end_frame, adjust_value, cut_values)
+
+    times, values, offsets = curves.times, curves.values, curves.offsets
+    counts = numpy.diff(offsets)
+    curve_count = len(counts)
+    curve_ids = numpy.repeat(numpy.arange(curve_count), counts)
+    has_tangents = curves.in_tangents is not None
+
+    # the cut keys; one per curve and frame that has keys but no key on that frame
+    cut_frames = sorted(set([start_frame, end_frame]))
+    cut_curves, cut_times, cut_keys, cut_ranks = [], [], [], []
+    for rank, frame in zip((0, 2), cut_frames):
+        before = numpy.bincount(curve_ids, weights=times < frame, minlength=curve_count)
+        before = before.astype(numpy.int64)
+        nxt = offsets[:-1] + before  # the first key on or after the frame
+        has_next = before < counts
+        has_prev = before > 0
+        on_frame = numpy.zeros(curve_count, dtype=bool)
+        on_frame[has_next] = times[nxt[has_next]] == frame
+        needed = (counts > 0) & ~on_frame
+
+        prev_i = numpy.where(has_prev, nxt - 1, 0)
+        next_i = numpy.where(has_next, nxt, 0)
+        if len(times):
+            t0, t1 = times[prev_i], times[next_i]
+            v0, v1 = values[prev_i], values[next_i]
+        else:
+            t0 = t1 = v0 = v1 = numpy.zeros(curve_count)
+        span = numpy.where(t1 > t0, t1 - t0, 1.0)
+        value = numpy.where(
+            has_prev & has_next, v0 + (v1 - v0) * (frame - t0) / span,
+            numpy.where(has_prev, v0, v1)
+        )
+        if cut_values is not None:
+            value = numpy.asarray(cut_values[0 if frame == start_frame else 1], dtype=numpy.float64)
+        elif has_tangents and len(times):
+            step = curves.out_tangents[prev_i]
+            stepped = has_prev & has_next
+            value = numpy.where(stepped & (step == STEP_TANGENT), v0, value)
+            value = numpy.where(stepped & (step == STEP_NEXT_TANGENT), v1, value)
+
+        ids = numpy.nonzero(needed)[0]
+        cut_curves.append(ids)
+        cut_times.append(numpy.full(len(ids), frame, dtype=numpy.float64))
+        cut_keys.append(value[ids])
+        cut_ranks.append(numpy.full(len(ids), rank, dtype=numpy.int64))
+
+    # the keys within the cut, merged with the cut keys in (curve, time) order
+    keep = (times >= start_frame) & (times <= end_frame)
+    all_curves = numpy.concatenate([curve_ids[keep]] + cut_curves)
+    all_times = numpy.concatenate([times[keep]] + cut_times)
+    all_values = numpy.concatenate([values[keep]] + cut_keys)
+    ranks = numpy.concatenate(
+        [numpy.ones(int(keep.sum()), dtype=numpy.int64)] + cut_ranks
+    )
+    order = numpy.argsort(all_curves * 3 + ranks, kind='stable')
+    sources = numpy.concatenate(
+        [numpy.nonzero(keep)[0]] + [numpy.full(len(ids), -1, dtype=numpy.int64) for ids in cut_curves]
+    )[order]
+
+    new_counts = numpy.bincount(all_curves, minlength=curve_count)
+    new_offsets = numpy.concatenate([[0], numpy.cumsum(new_counts)]).astype(numpy.int64)
+    new_times = all_times[order]
+
+    in_tangents = out_tangents = None
+    if has_tangents:
+        cut_tangents = [numpy.full(len(ids), LINEAR_TANGENT, dtype=numpy.int32)
+                        for ids in cut_curves]
+        in_tangents = numpy.concatenate([curves.in_tangents[keep]] + cut_tangents)[order]
+        out_tangents = numpy.concatenate([curves.out_tangents[keep]] + cut_tangents)[order]
+        on_cut = (new_times == start_frame) | (new_times == end_frame)
+        in_tangents[on_cut] = LINEAR_TANGENT
+        out_tangents[on_cut] = LINEAR_TANGENT
+
+    return PackedCurves(
+        new_times + adjust_value, all_values[order], new_offsets,
+        in_tangents, out_tangents, curves.names, sources
+    )
+
+def trim_curves_scalar(curves, start_frame, end_frame, adjust_value=0, cut_values=None):
+    """
+    The scalar reference of :func:`trim_curves`, one curve and key at a time.
+    Used when NumPy isn't installed, and to verify the vectorized kernel.
+
+    :return: The cut curves, packed into lists.
+    :rtype: PackedCurves
+    """
+    has_tangents = curves.in_tangents is not None
+    cut_frames = sorted(set([start_frame, end_frame]))
+    trimmed, sources = [], []
+    for i in range(len(curves)):
+        start, end = curves.offsets[i], curves.offsets[i + 1]
+        times = list(curves.times[start:end])
+        values = list(curves.values[start:end])
+        in_tangents = list(curves.in_tangents[start:end]) if has_tangents else []
+        out_tangents = list(curves.out_tangents[start:end]) if has_tangents else []
+        if not times:
+            trimmed.append(([], [], [], []))
+            continue
+
+        keys = []  # (time, value, in tangent, out tangent, source)
+        for frame in cut_frames:
+            j = bisect_left(times, frame)
+            if j < len(times) and times[j] == frame:
+                continue
+            if cut_values is not None:
+                value = cut_values[0 if frame == start_frame else 1][i]
+            elif j == 0:
+                value = values[0]
+            elif j == len(times):
+                value = values[-1]
+            elif has_tangents and out_tangents[j - 1] == STEP_TANGENT:
+                value = values[j - 1]
+            elif has_tangents and out_tangents[j - 1] == STEP_NEXT_TANGENT:
+                value = values[j]
+            else:
+                t0, t1 = times[j - 1], times[j]
+                v0, v1 = values[j - 1], values[j]
+                value = v0 + (v1 - v0) * (frame - t0) / (t1 - t0)
+            keys.append((float(frame), value, LINEAR_TANGENT, LINEAR_TANGENT, -1))
+        for j, time in enumerate(times):
+            if start_frame <= time <= end_frame:
+                if time in cut_frames:
+                    keys.append((time, values[j], LINEAR_TANGENT, LINEAR_TANGENT, start + j))
+                elif has_tangents:
+                    keys.append((time, values[j], in_tangents[j], out_tangents[j], start + j))
+                else:
+                    keys.append((time, values[j], None, None, start + j))
+        keys.sort(key=lambda key: key[0])
+        trimmed.append((
+            [time + adjust_value for time, _, _, _, _ in keys],
+            [value for _, value, _, _, _ in keys],
+            [in_tangent for _, _, in_tangent, _, _ in keys],
+            [out_tangent for _, _, _, out_tangent, _ in keys]
+        ))
+        sources.extend(source for _, _, _, _, source in keys)
+
+    if not has_tangents:
+        trimmed = [curve[:2] for curve in trimmed]
+    packed = PackedCurves.pack(trimmed, curves.names, use_numpy=False)
+    packed.sources = sources
+    return packed
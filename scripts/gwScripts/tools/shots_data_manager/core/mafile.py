@@ -0,0 +1,683 @@
+
+import io
+import os
+import re
+import math
+import time
+from bisect import bisect_left
+from collections import namedtuple
+
+from gwScripts.tools.shots_data_manager.core import kernel
+from gwScripts.tools.shots_data_manager.core.shots import ShotResult
+
+
+# the same types as `curves.ANIM_CURVE_TYPES`, repeated so that this module never imports Maya
+ANIM_CURVE_TYPES = ('animCurveTL', 'animCurveTA', 'animCurveTT', 'animCurveTU')
+
+# the animCurve tangent types written in Maya ASCII files
+LINEAR_TANGENT = 2
+FLAT_TANGENT = 3
+SPLINE_TANGENT = 4
+STEP_TANGENT = 5
+CLAMPED_TANGENT = 8
+PLATEAU_TANGENT = 9
+STEP_NEXT_TANGENT = 17
+AUTO_TANGENT = 18
+
+# the tangents that Maya computes from the neighbouring keys
+_SMOOTH_TANGENTS = (SPLINE_TANGENT, CLAMPED_TANGENT, PLATEAU_TANGENT, AUTO_TANGENT)
+
+# the number of anim curves cut at once by `MaShotSplitter`
+BATCH_CURVES = 1000
+
+# per-key tangent values, recomputed by Maya for the linear boundary keys
+_TANGENT_VALUES = ('kix', 'kiy', 'kox', 'koy')
+
+# the scene's units, as set by `currentUnit`; the frames per second, and the centimeters
+# and radians per linear and angular unit, which the stored tangents are measured in
+SceneUnits = namedtuple('SceneUnits', ['fps', 'linear', 'angular'])
+DEFAULT_UNITS = SceneUnits(24.0, 1.0, math.pi / 180.0)
+
+_FPS = {'game': 15.0, 'film': 24.0, 'pal': 25.0, 'ntsc': 30.0,
+        'show': 48.0, 'palf': 50.0, 'ntscf': 60.0}
+_LINEAR_UNITS = {'mm': 0.1, 'millimeter': 0.1, 'cm': 1.0, 'centimeter': 1.0,
+                 'm': 100.0, 'meter': 100.0, 'km': 100000.0, 'kilometer': 100000.0,
+                 'in': 2.54, 'inch': 2.54, 'ft': 30.48, 'foot': 30.48,
+                 'yd': 91.44, 'yard': 91.44, 'mi': 160934.4, 'mile': 160934.4}
+_ANGULAR_UNITS = {'deg': math.pi / 180.0, 'degree': math.pi / 180.0,
+                  'rad': 1.0, 'radian': 1.0,
+                  'min': math.pi / 10800.0, 'sec': math.pi / 648000.0}
+_CURRENT_UNIT_FLAG = re.compile(r'-(l|a|t)\s+([\w.]+)')
+_REFERENCE = re.compile(r'^file\b.*\s-r(?:di)?\s')
+
+_CREATE_CURVE = re.compile(r'^createNode ({})\b.*?-n "([^"]+)"'.format("|".join(ANIM_CURVE_TYPES)))
+_INDEXED_SETATTR = re.compile(
+    r'^\s*setAttr\s+(?:-s\s+\d+\s+)?"\.(\w+)\[(\d+)(?::(\d+))?\]"\s+(.*?)\s*;\s*$', re.DOTALL
+)
+_SETATTR = re.compile(r'^\s*setAttr\s+"\.(\w+)"\s+(.*?)\s*;\s*$', re.DOTALL)
+_PLAYBACK_FLAG = re.compile(r'(-(?:min|max|ast|aet) )(-?[\d.]+)')
+
+
+class MaFileError(ValueError):
+    """
+    Raised when a file can't be split as Maya ASCII text.
+    """
+
+
+class AnimCurveBlock(object):
+    """
+    The text of a single animCurve node in a Maya ASCII file, parsed into its
+    keys and per-key attributes, with every other statement kept verbatim.
+    """
+    def __init__(self, node_type, name, lines):
+        """
+        Parses the node's lines.
+
+        :param node_type: The type of the anim curve.
+        :type node_type: str
+
+        :param name: The name of the anim curve.
+        :type name: str
+
+        :param lines: The node's lines, starting with its `createNode` line.
+        :type lines: list[str]
+
+        :raises MaFileError: If the keys can't be parsed.
+
+        :return: None
+        :rtype: None
+        """
+        self.node_type = node_type
+        self.name = name
+        self.lines = lines
+        self.header = lines[0]
+        self.statements = []  # the other statements, with None where the keys are written
+        self.times = []
+        self.values = []  # kept as written, only the cut keys' values are computed
+        self.key_attrs = {}
+        self.attrs = {}
+
+        keys = {}
+        statement = ""
+        for line in lines[1:]:
+            statement += line
+            if not statement.rstrip().endswith(";"):
+                continue
+            self._parse(statement, keys)
+            statement = ""
+        if statement:
+            raise MaFileError("Unterminated statement in \"{}\".".format(name))
+
+        # keys are stored by position in time, in case they were written sparse or unsorted
+        old_indices = sorted(keys)
+        self.times = [keys[index][0] for index in old_indices]
+        self.values = [keys[index][1] for index in old_indices]
+        if old_indices and (old_indices[-1] != len(old_indices) - 1
+                            or any(a > b for a, b in zip(self.times, self.times[1:]))):
+            old_indices.sort(key=lambda index: keys[index][0])
+            self.times = [keys[index][0] for index in old_indices]
+            self.values = [keys[index][1] for index in old_indices]
+            remap = dict((index, i) for i, index in enumerate(old_indices))
+            self.key_attrs = dict(
+                (attr, dict((remap[index], value) for index, value in values.items()
+                            if index in remap))
+                for attr, values in self.key_attrs.items()
+            )
+
+    def _parse(self, statement, keys):
+        match = _INDEXED_SETATTR.match(statement)
+        if not match:
+            simple = _SETATTR.match(statement)
+            if simple:
+                self.attrs[simple.group(1)] = simple.group(2)
+            self.statements.append(statement)
+            return
+
+        attr, first, last, data = match.groups()
+        first = int(first)
+        last = int(last) if last is not None else first
+        tokens = data.split()
+        if attr == 'ktv':
+            if len(tokens) != 2 * (last - first + 1):
+                raise MaFileError("Mismatched keys in \"{}\".".format(self.name))
+            try:
+                times = [float(token) for token in tokens[0::2]]
+            except ValueError:
+                raise MaFileError("Invalid keys in \"{}\".".format(self.name))
+            keys.update(zip(range(first, last + 1), zip(times, tokens[1::2])))
+        else:
+            if len(tokens) != last - first + 1:
+                raise MaFileError("Mismatched \".{}\" values in \"{}\".".format(attr, self.name))
+            values = self.key_attrs.setdefault(attr, {})
+            for i, index in enumerate(range(first, last + 1)):
+                values[index] = tokens[i]
+
+        # the keys are all written back at the position of the first key statement
+        if None not in self.statements:
+            self.statements.append(None)
+
+    def tangent(self, attr, index):
+        """
+        :return: The in (`kit`) or out (`kot`) tangent type of a key,
+            defaulting to the curve's tangent type, or None if unknown.
+        :rtype: int | None
+        """
+        value = self.key_attrs.get(attr, {}).get(index, self.attrs.get('tan'))
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def evaluate(self, time, units=DEFAULT_UNITS):
+        """
+        Evaluates the curve at the given time from its keys.
+        Exact on the keys and outside of them, unless the curve cycles, and within
+        the segments whose tangents are known; linear, flat and stepped tangents,
+        those whose handles are stored in the file, and the spline, clamped, plateau
+        and auto tangents Maya computes from the neighbouring keys, see :meth:`_smooth_slope`,
+        which are evaluated as Maya does, along the Bezier segment between the keys.
+        Any other segment is interpolated linearly as an approximation.
+
+        :param units: The scene's units, which the stored tangents are measured in,
+            or None if they are unknown.
+        :type units: SceneUnits, optional
+
+        :return: The value, and whether it is exact.
+        :rtype: tuple[float, bool]
+        """
+        if time <= self.times[0]:
+            return float(self.values[0]), (time == self.times[0]
+                                           or self.attrs.get('pre', '0') == '0')
+        if time >= self.times[-1]:
+            return float(self.values[-1]), (time == self.times[-1]
+                                            or self.attrs.get('pst', '0') == '0')
+
+        i = bisect_left(self.times, time)
+        if self.times[i] == time:
+            return float(self.values[i]), True
+        out_type = self.tangent('kot', i - 1)
+        if out_type == STEP_TANGENT:
+            return float(self.values[i - 1]), True
+        if out_type == STEP_NEXT_TANGENT:
+            return float(self.values[i]), True
+
+        t0, t1 = self.times[i - 1], self.times[i]
+        v0, v1 = float(self.values[i - 1]), float(self.values[i])
+        if out_type == LINEAR_TANGENT and self.tangent('kit', i) == LINEAR_TANGENT:
+            return v0 + (v1 - v0) * (time - t0) / (t1 - t0), True
+
+        out_handle = self._handle(i - 1, i, units)
+        in_handle = self._handle(i, i - 1, units)
+        if out_handle is None or in_handle is None:
+            return v0 + (v1 - v0) * (time - t0) / (t1 - t0), False
+        return _bezier(
+            (t0, v0), (t0 + out_handle[0], v0 + out_handle[1]),
+            (t1 + in_handle[0], v1 + in_handle[1]), (t1, v1), time
+        ), True
+
+    def _handle(self, i, j, units):
+        """
+        :return: The (time, value) offset of the Bezier handle of key `i`
+            towards its neighbouring key `j`, a third of the tangent's length,
+            or None if the tangent is unknown.
+        :rtype: tuple[float, float] | None
+        """
+        out = j > i
+        tangent_type = self.tangent('kot' if out else 'kit', i)
+        span = self.times[j] - self.times[i]
+        x = self.key_attrs.get('kox' if out else 'kix', {}).get(i)
+        y = self.key_attrs.get('koy' if out else 'kiy', {}).get(i)
+        if tangent_type == LINEAR_TANGENT:
+            slope = (float(self.values[j]) - float(self.values[i])) / span
+        elif tangent_type == FLAT_TANGENT:
+            slope = 0.0
+        elif tangent_type in _SMOOTH_TANGENTS and (x is None or y is None):
+            slope = self._smooth_slope(i, tangent_type)
+        else:
+            scale = self._value_scale(units)
+            if x is None or y is None or scale is None:
+                return None
+            # stored in seconds and internal units, pointing forward in time
+            x, y = float(x) * units.fps, float(y) * scale
+            if x <= 0:
+                return None
+            if self.attrs.get('wgt') in ('yes', '1', 'true'):
+                sign = 1.0 if out else -1.0
+                return sign * x / 3.0, sign * y / 3.0
+            slope = y / x
+        return span / 3.0, slope * span / 3.0
+
+    def _smooth_slope(self, i, tangent_type):
+        """
+        Computes the slope of a key's tangent from its neighbouring keys, as Maya does
+        when it opens the file. Spline tangents follow the line between the neighbours,
+        or the line to the single neighbour of the first and last keys. Clamped tangents
+        are flat next to a key of the same value. Auto and plateau tangents are flat
+        on the first and last keys and on peaks and troughs, and otherwise limited
+        so that the curve doesn't overshoot the neighbouring values.
+
+        :return: The slope of the key's tangent, in values per frame.
+        :rtype: float
+        """
+        times = self.times
+        value = float(self.values[i])
+        previous = float(self.values[i - 1]) if i > 0 else None
+        following = float(self.values[i + 1]) if i + 1 < len(times) else None
+        if previous is None and following is None:
+            return 0.0
+        if tangent_type in (AUTO_TANGENT, PLATEAU_TANGENT):
+            if (previous is None or following is None
+                    or (value - previous) * (following - value) <= 0):
+                return 0.0
+        if tangent_type == CLAMPED_TANGENT and value in (previous, following):
+            return 0.0
+        if previous is None:
+            return (following - value) / (times[i + 1] - times[i])
+        if following is None:
+            return (value - previous) / (times[i] - times[i - 1])
+
+        slope = (following - previous) / (times[i + 1] - times[i - 1])
+        if tangent_type in (AUTO_TANGENT, PLATEAU_TANGENT):
+            # the handles, a third of the way to each neighbour, stay within their values
+            limit = 3.0 * min(abs(value - previous) / (times[i] - times[i - 1]),
+                              abs(following - value) / (times[i + 1] - times[i]))
+            slope = max(-limit, min(limit, slope))
+        return slope
+
+    def _value_scale(self, units):
+        """
+        :return: The curve's values per internal unit of its stored tangents,
+            or None if unknown.
+        :rtype: float | None
+        """
+        if units is None:
+            return None
+        if self.node_type == 'animCurveTL':
+            return 1.0 / units.linear
+        if self.node_type == 'animCurveTA':
+            return 1.0 / units.angular
+        if self.node_type == 'animCurveTT':
+            return units.fps
+        return 1.0
+
+    def trim(self, start_frame, end_frame, adjust_value=0, units=DEFAULT_UNITS):
+        """
+        Applies the same cut as :meth:`Controller.apply_shot` to the curve;
+        keys it at the cut frames with linear tangents, removes the keys
+        outside of them and shifts the remaining keys in time.
+        Cutting many curves at once with :func:`trim_blocks` is faster.
+
+        :param units: The scene's units, see :meth:`evaluate`.
+        :type units: SceneUnits, optional
+
+        :return: Whether the values of the new cut keys are exact.
+        :rtype: bool
+        """
+        return not trim_blocks([self], start_frame, end_frame, adjust_value, units)
+
+    def write(self, stream):
+        """
+        Writes the curve back as Maya ASCII text.
+
+        :return: None
+        :rtype: None
+        """
+        stream.write(self.header)
+        for statement in self.statements:
+            if statement is not None:
+                stream.write(statement)
+                continue
+
+            count = len(self.times)
+            if not count:
+                continue
+            pairs = [_number(t) + " " + v for t, v in zip(self.times, self.values)]
+            stream.write('\tsetAttr -s {} ".ktv[0:{}]"  {};\n'.format(
+                count, count - 1, "\n\t\t ".join(
+                    " ".join(pairs[i:i+10]) for i in range(0, count, 10)
+                )
+            ))
+            for attr in sorted(self.key_attrs):
+                for first, last in _runs(sorted(self.key_attrs[attr])):
+                    indices = "{}:{}".format(first, last) if last > first else str(first)
+                    stream.write('\tsetAttr -s {} ".{}[{}]"  {};\n'.format(
+                        count, attr, indices,
+                        " ".join(self.key_attrs[attr][i] for i in range(first, last + 1))
+                    ))
+
+
+class MaShotSplitter(object):
+    """
+    Splits shots out of a Maya ASCII main file as plain text, without Maya.
+    The file is streamed line by line, holding a batch of `BATCH_CURVES` anim curves
+    in memory at a time, and every anim curve gets the same cut as :meth:`Controller.apply_shot`.
+    Referenced curves aren't stored in the main file, so they are left as they are,
+    and the shots of a file with references can't be normalized.
+    """
+    def __init__(self, main_file, export_path, normalize=None, logger=None):
+        """
+        Initializes the splitter.
+
+        :param main_file: The path of the Maya ASCII main file to split into shots.
+        :type main_file: str
+
+        :param export_path: The directory to save the shots to.
+        :type export_path: str
+
+        :param normalize: The frame to move the start of every shot to, or None.
+        :type normalize: int, optional
+
+        :param logger: Pass a specific logger for the splitter.
+        :type logger: logging.Logger, optional
+
+        :raises MaFileError: If the main file isn't a Maya ASCII file.
+
+        :return: None
+        :rtype: None
+        """
+        with io.open(main_file, 'r', encoding='latin-1', newline='') as f:
+            if not f.readline().startswith("//Maya ASCII"):
+                raise MaFileError("\"{}\" isn't a Maya ASCII file.".format(main_file))
+
+        self.main_file = main_file
+        self.export_path = export_path
+        self.normalize = normalize
+        self.logger = logger
+
+    def export(self, shots):
+        """
+        Splits all the shots, one at a time.
+
+        :param shots: The shots to split.
+        :type shots: Shots
+
+        :yields: The result of each split shot.
+        :rtype: ShotResult
+        """
+        for row in shots:
+            yield self.export_shot(
+                shots.get_shot_name(row), shots.get_shot_start(row), shots.get_shot_end(row)
+            )
+
+    def export_shot(self, shot_name, start_frame, end_frame):
+        """
+        Writes a single shot as a new Maya ASCII file.
+
+        :param shot_name: The name of the shot, used as its file name.
+        :type shot_name: str
+
+        :param start_frame: The start frame of the shot.
+        :type start_frame: int | float
+
+        :param end_frame: The end frame of the shot.
+        :type end_frame: int | float
+
+        :return: The result of the split shot, where the failed curves
+            couldn't be parsed and were written unchanged. The shot fails,
+            without a file, if the cut keys of any curve can't be computed
+            exactly, see :meth:`AnimCurveBlock.evaluate`.
+        :rtype: ShotResult
+        """
+        start_time = time.time()
+        adjust_value = 0
+        if self.normalize is not None:
+            adjust_value = self.normalize - start_frame
+        playback = {
+            'min': start_frame + adjust_value, 'ast': start_frame + adjust_value,
+            'max': end_frame + adjust_value, 'aet': end_frame + adjust_value
+        }
+
+        file_path = os.path.join(self.export_path, shot_name + ".ma")
+        failed_anim_curves = []
+        approximated = []
+        curve_count = 0
+        units = DEFAULT_UNITS
+        referenced = False
+        pending = []  # the curves and lines to write, in order
+        batch = []
+
+        def flush():
+            if batch:
+                approximated.extend(curve.name for curve in trim_blocks(
+                    batch, start_frame, end_frame, adjust_value, units
+                ))
+            for item in pending:
+                if isinstance(item, AnimCurveBlock):
+                    item.write(dst)
+                else:
+                    dst.write(item)
+            del pending[:]
+            del batch[:]
+
+        with io.open(self.main_file, 'r', encoding='latin-1', newline='') as src, \
+                io.open(file_path, 'w', encoding='latin-1', newline='') as dst:
+            for kind, lines in _blocks(src):
+                if kind is None:
+                    for line in lines:
+                        if line.startswith("currentUnit"):
+                            flush()  # the batched curves are cut in the previous units
+                            units = _scene_units(line, units)
+                        elif _REFERENCE.match(line):
+                            referenced = True
+                        pending.append(_rewrite_line(line, shot_name, playback))
+                    continue
+
+                node_type, name = kind
+                curve_count += 1
+                try:
+                    curve = AnimCurveBlock(node_type, name, lines)
+                except MaFileError:
+                    failed_anim_curves.append(name)
+                    pending.extend(lines)
+                    continue
+                pending.append(curve)
+                batch.append(curve)
+                if len(batch) >= BATCH_CURVES:
+                    flush()
+            flush()
+
+        # Maya would cut these curves differently, and would shift the referenced curves
+        # along with the others, so the shot is left to be exported in Maya
+        error = None
+        if approximated:
+            error = ("Can't cut {} anim curves whose tangents are unknown, e.g. \"{}\", "
+                     "export the shot in Maya instead.".format(len(approximated), approximated[0]))
+        elif referenced and adjust_value:
+            error = ("Can't normalize the referenced anim curves, which aren't stored in "
+                     "\"{}\", export the shot in Maya instead.".format(self.main_file))
+        if error:
+            os.remove(file_path)
+            return ShotResult(
+                shot_name, None, failed_anim_curves, [], error,
+                time.time() - start_time, curve_count, None
+            )
+        if referenced and self.logger:
+            self.logger.warning(
+                "The referenced anim curves of \"{}\" keep their keys outside of the shot.".format(
+                    shot_name
+                )
+            )
+        return ShotResult(
+            shot_name, file_path, failed_anim_curves, [], None,
+            time.time() - start_time, curve_count, os.path.getsize(file_path)
+        )
+
+
+def trim_blocks(blocks, start_frame, end_frame, adjust_value=0, units=DEFAULT_UNITS):
+    """
+    Applies :meth:`AnimCurveBlock.trim` to many curves at once through
+    :func:`kernel.trim_curves`. The values of the cut keys are evaluated
+    along each curve's tangents, and the values and per-key attributes
+    of the remaining keys are kept as written.
+
+    :param blocks: The anim curves to cut.
+    :type blocks: list[AnimCurveBlock]
+
+    :param units: The scene's units, see :meth:`AnimCurveBlock.evaluate`.
+    :type units: SceneUnits, optional
+
+    :return: The curves whose cut keys aren't exact.
+    :rtype: list[AnimCurveBlock]
+    """
+    approximated = []
+    start_values, end_values = [], []
+    for block in blocks:
+        if not block.times:
+            start_values.append(0.0)
+            end_values.append(0.0)
+            continue
+        start_value, start_exact = block.evaluate(start_frame, units)
+        end_value, end_exact = block.evaluate(end_frame, units)
+        start_values.append(start_value)
+        end_values.append(end_value)
+        if not (start_exact and end_exact):
+            approximated.append(block)
+
+    curves = kernel.PackedCurves.pack(
+        [(block.times, [float(value) for value in block.values]) for block in blocks]
+    )
+    trimmed = kernel.trim_curves(
+        curves, start_frame, end_frame, adjust_value, (start_values, end_values)
+    )
+    times = list(trimmed.times)
+    values = list(trimmed.values)
+    sources = list(trimmed.sources)
+    offsets = list(trimmed.offsets)
+
+    cut_frames = (start_frame, end_frame)
+    for b, block in enumerate(blocks):
+        first, old_first = offsets[b], curves.offsets[b]
+        new_values, key_attrs = [], {}
+        for j, source in enumerate(sources[first:offsets[b + 1]]):
+            if source < 0:
+                new_values.append(_number(values[first + j]))
+                on_cut = True
+            else:
+                i = source - old_first
+                new_values.append(block.values[i])
+                for attr, attr_values in block.key_attrs.items():
+                    if i in attr_values:
+                        key_attrs.setdefault(attr, {})[j] = attr_values[i]
+                on_cut = block.times[i] in cut_frames
+            if on_cut:
+                for attr in _TANGENT_VALUES:
+                    key_attrs.get(attr, {}).pop(j, None)
+                key_attrs.setdefault('kit', {})[j] = str(LINEAR_TANGENT)
+                key_attrs.setdefault('kot', {})[j] = str(LINEAR_TANGENT)
+
+        block.times = [float(time) for time in times[first:offsets[b + 1]]]
+        block.values = new_values
+        block.key_attrs = dict(
+            (attr, attr_values) for attr, attr_values in key_attrs.items() if attr_values
+        )
+    return approximated
+
+def _blocks(stream):
+    """
+    Groups the lines of a Maya ASCII file into anim curve nodes,
+    and runs of any other lines.
+
+    :yields: ((node type, name), lines) for anim curves, (None, lines) otherwise.
+    :rtype: tuple[tuple[str, str] | None, list[str]]
+    """
+    curve = None
+    lines = []
+    for line in stream:
+        if curve is not None and line[:1] in ("\t", " "):
+            lines.append(line)
+            continue
+        if curve is not None:
+            yield curve, lines
+            curve, lines = None, []
+
+        match = _CREATE_CURVE.match(line)
+        if match:
+            curve, lines = match.groups(), [line]
+        else:
+            yield None, [line]
+    if curve is not None:
+        yield curve, lines
+
+def _rewrite_line(line, shot_name, playback):
+    """
+    Sets the shot's playback range on the line that holds the scene's
+    `playbackOptions` command, and the shot's name in the file's header.
+
+    :return: The line to write.
+    :rtype: str
+    """
+    if "playbackOptions" in line:
+        return _PLAYBACK_FLAG.sub(
+            lambda match: match.group(1) + _number(playback[match.group(1)[1:-1]]), line
+        )
+    if line.startswith("//Name: "):
+        return "//Name: {}.ma".format(shot_name) + line[len(line.rstrip("\r\n")):]
+    return line
+
+def _scene_units(line, units):
+    """
+    :param line: A `currentUnit` command.
+    :type line: str
+
+    :param units: The units before the command.
+    :type units: SceneUnits | None
+
+    :return: The scene's units after the command, or None if any of them is unknown.
+    :rtype: SceneUnits | None
+    """
+    if units is None:
+        return None
+    for flag, name in _CURRENT_UNIT_FLAG.findall(line):
+        if flag == 't':
+            fps = re.match(r'(\d+(?:\.\d+)?)fps$', name)
+            value = float(fps.group(1)) if fps else _FPS.get(name)
+            units = units._replace(fps=value)
+        elif flag == 'l':
+            units = units._replace(linear=_LINEAR_UNITS.get(name))
+        else:
+            units = units._replace(angular=_ANGULAR_UNITS.get(name))
+    if None in units:
+        return None
+    return units
+
+def _bezier(p0, p1, p2, p3, time):
+    """
+    Evaluates a curve segment, as a cubic Bezier curve from key `p0` to key `p3`
+    with the handles `p1` and `p2`, at the given time, finding the point
+    at that time by bisection, as the handles may not be evenly spaced in time.
+
+    :return: The value of the segment at the time.
+    :rtype: float
+    """
+    def point(t, a, b, c, d):
+        u = 1.0 - t
+        return u * u * u * a + 3.0 * u * u * t * b + 3.0 * u * t * t * c + t * t * t * d
+
+    low, high = 0.0, 1.0
+    for _ in range(64):
+        middle = (low + high) / 2.0
+        if point(middle, p0[0], p1[0], p2[0], p3[0]) < time:
+            low = middle
+        else:
+            high = middle
+    return point((low + high) / 2.0, p0[1], p1[1], p2[1], p3[1])
+
+def _number(value):
+    """
+    :return: The value as Maya writes it; integral values without a fraction.
+    :rtype: str
+    """
+    return "%.10g" % value
+
+def _runs(indices):
+    """
+    :return: The (first, last) pairs of each run of consecutive indices.
+    :rtype: list[tuple[int, int]]
+    """
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index - 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return [tuple(run) for run in runs]
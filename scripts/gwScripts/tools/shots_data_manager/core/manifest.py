@@ -0,0 +1,201 @@
+
+import os
+import json
+import hashlib
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+
+from gwScripts.tools.shots_data_manager.core.preset import atomic_write
+from gwScripts.tools.shots_data_manager.core.shots import Shots
+
+
+MANIFEST_FILENAME = "shots_manifest.json"
+MANIFEST_VERSION = 1
+
+# the fingerprints are sums of the curves' digests, wrapped to the size of a digest
+_DIGEST_MODULUS = 2 ** 160
+
+
+class Manifest(OrderedDict):
+    """
+    A data class that records, per exported shot, the inputs its file was
+    exported from; the shot's range, the export settings and a fingerprint
+    of the main file's anim data around the shot, see :func:`fingerprint_shots`,
+    along with the size and modification time of the file it was saved to.
+    Stored in the export path, so that re-exports can skip the shots
+    whose files are still up to date. Shots are recorded by name, as their
+    files are, so the shots that share their name with another shot, and
+    overwrite each other's file, are never recorded, see :func:`shot_inputs`.
+    """
+    def __init__(self, export_path):
+        super(Manifest, self).__init__()
+        self.export_path = export_path
+
+    @property
+    def file_path(self):
+        return os.path.join(self.export_path, MANIFEST_FILENAME)
+
+    @classmethod
+    def load(cls, export_path):
+        """
+        Constructor method for the class.
+        Loads the manifest of an export path, or starts an empty one if there's
+        none, or if it can't be read, in which case every shot is exported again.
+
+        :param export_path: The directory the shots are exported to.
+        :type export_path: str
+
+        :return: The manifest of the export path.
+        :rtype: Manifest
+        """
+        manifest = cls(export_path)
+        try:
+            with open(manifest.file_path, 'r') as f:
+                data = json.load(f, object_pairs_hook=OrderedDict)
+        except (IOError, OSError, ValueError):
+            return manifest
+        if data.get('Version') == MANIFEST_VERSION:
+            manifest.update(data.get('Shots', {}))
+        return manifest
+
+    def save(self):
+        """
+        Writes the manifest to the export path, atomically, so that an interrupted
+        save leaves the previous manifest as it was.
+
+        :raises IOError: If the manifest can't be written.
+
+        :return: None
+        :rtype: None
+        """
+        data = OrderedDict([('Version', MANIFEST_VERSION), ('Shots', self)])
+        atomic_write(self.file_path, json.dumps(data, indent=4))
+
+    def is_current(self, shot_name, inputs):
+        """
+        :return: Whether the shot's file was exported from the same inputs,
+            and hasn't been changed or removed since.
+        :rtype: bool
+        """
+        entry = self.get(shot_name)
+        if not entry or entry['Inputs'] != inputs:
+            return False
+        file_path = entry['FilePath']
+        return (os.path.isfile(file_path)
+                and os.path.getsize(file_path) == entry['FileSize']
+                and os.path.getmtime(file_path) == entry['FileTime'])
+
+    def record(self, result, inputs):
+        """
+        Records the file of an exported shot along with the inputs it was exported from,
+        or forgets the shot if it failed to export, or if its inputs weren't fingerprinted.
+
+        :param result: The result of the exported shot.
+        :type result: ShotResult
+
+        :param inputs: The inputs of the shot, see :func:`shot_inputs`.
+        :type inputs: dict | None
+
+        :return: None
+        :rtype: None
+        """
+        if (inputs is None or result.error or not result.file_path
+                or not os.path.isfile(result.file_path)):
+            self.pop(result.shot_name, None)
+            return
+        self[result.shot_name] = OrderedDict([
+            ('Inputs', inputs),
+            ('FilePath', result.file_path),
+            ('FileSize', os.path.getsize(result.file_path)),
+            ('FileTime', os.path.getmtime(result.file_path)),
+        ])
+
+    def outdated(self, shots, inputs):
+        """
+        :param shots: The shots to export.
+        :type shots: Shots
+
+        :param inputs: The inputs of each shot, by shot name, see :func:`shot_inputs`.
+        :type inputs: dict[str, dict]
+
+        :return: The shots whose files aren't up to date, and the names of those that are.
+        :rtype: tuple[Shots, list[str]]
+        """
+        outdated = Shots()
+        current = []
+        for row in shots:
+            shot_name = shots.get_shot_name(row)
+            if shot_name in inputs and self.is_current(shot_name, inputs[shot_name]):
+                current.append(shot_name)
+                continue
+            outdated.insert_shot(
+                row, shot_name, shots.get_shot_start(row), shots.get_shot_end(row)
+            )
+        return outdated, current
+
+
+def fingerprint_shots(curve_keys, shots):
+    """
+    Fingerprints the anim data each shot is cut from, in a single pass over
+    the curves. A shot's fingerprint covers, on every curve, the keys within
+    the shot and the nearest key on either side of it, which set the values
+    of the cut keys, so that editing the animation of one shot leaves the
+    fingerprints of the other shots as they were. The curves' digests are
+    summed, so the order the curves are listed in doesn't matter.
+
+    :param curve_keys: The (name, times, values, tangents) of each anim curve,
+        with its keys sorted by time, see :func:`curves.query_curve_keys`.
+    :type curve_keys: Iterable[tuple[str, list[float], list[float], list]]
+
+    :param shots: The shots to fingerprint.
+    :type shots: Shots
+
+    :return: The fingerprint of each shot, by row.
+    :rtype: dict[int, str]
+    """
+    ranges = [(row, shots.get_shot_start(row), shots.get_shot_end(row)) for row in shots]
+    sums = dict((row, 0) for row, _, _ in ranges)
+    for name, times, values, tangents in curve_keys:
+        if not times:
+            continue
+        for row, start_frame, end_frame in ranges:
+            first = max(bisect_left(times, start_frame) - 1, 0)
+            last = min(bisect_right(times, end_frame) + 1, len(times))
+            digest = hashlib.sha1(repr(
+                (name, times[first:last], values[first:last], tangents[first:last])
+            ).encode('utf-8')).hexdigest()
+            sums[row] = (sums[row] + int(digest, 16)) % _DIGEST_MODULUS
+    return dict((row, "{:040x}".format(total)) for row, total in sums.items())
+
+def shot_inputs(shots, fingerprints, settings):
+    """
+    :param shots: The shots to export.
+    :type shots: Shots
+
+    :param fingerprints: The fingerprint of each shot, by row.
+    :type fingerprints: dict[int, str]
+
+    :param settings: The export settings that change the shots' files,
+        e.g. the main file, normalization and file type.
+    :type settings: OrderedDict
+
+    :return: The inputs of each shot, by shot name, without the shots that share
+        their name with another shot, which are always exported.
+    :rtype: dict[str, dict]
+    """
+    counts = Counter(shots.get_shot_name(row) for row in shots)
+    duplicates = set(shot_name for shot_name, count in counts.items() if count > 1)
+    inputs = {}
+    for row in shots:
+        shot_name = shots.get_shot_name(row)
+        if shot_name in duplicates:
+            continue
+        shot = OrderedDict([
+            ('StartFrame', shots.get_shot_start(row)),
+            ('EndFrame', shots.get_shot_end(row)),
+            ('Fingerprint', fingerprints[row]),
+        ])
+        shot.update(settings)
+        # normalize through JSON, so that inputs compare equal once reloaded
+        inputs[shot_name] = json.loads(json.dumps(shot), object_pairs_hook=OrderedDict)
+    return inputs
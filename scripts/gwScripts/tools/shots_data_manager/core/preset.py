@@ -1,6 +1,8 @@
 
+import os
 import json
-from collections import OrderedDict
+import uuid
+from collections import OrderedDict, namedtuple
 
 from gwScripts.tools.shots_data_manager.core.shots import Shots
 
@@ -11,6 +13,22 @@ try:
 except NameError:
     basestring = str
 
+# the version of the presets' structure, see `_MIGRATIONS`
+PRESET_VERSION = 2
+
+# presets with at least as many shots are saved compact by default, see :meth:`Preset.save`
+COMPACT_MIN_SHOTS = 1000
+
+# a shot as it's read from a preset, before it's added to the preset's shots
+_ShotRow = namedtuple('_ShotRow', ['shot_name', 'start_frame', 'end_frame'])
+_SHOT_KEYS = frozenset(_ShotRow._fields)
+
+
+class PresetVersionError(ValueError):
+    """
+    Raised when loading a preset saved by a newer version of the tool.
+    """
+
 
 class Preset(OrderedDict):
     """
@@ -20,6 +38,7 @@ class Preset(OrderedDict):
         super(Preset, self).__init__()
         self.file_path = file_path
 
+        self['Version'] = PRESET_VERSION
         self['Shots'] = None
         self['RenameShots'] = OrderedDict([
             ('Name', ""),
@@ -133,35 +152,170 @@ class Preset(OrderedDict):
         else:
             raise ValueError("SaveAs must be either 'ma' or 'mb'.")
 
-    def save(self):
+    def save(self, compact=None):
         """
         Save the preset into the preset's `file_path`.
+        The preset is written to a temporary file next to it first, then moved over it,
+        so that a failed write leaves the previous preset as it was.
+
+        :param compact: Whether to store the shots as columns of names, start and end frames,
+            without indentation, rather than a readable object per shot.
+            Defaults to compact for presets of `COMPACT_MIN_SHOTS` shots or more.
+        :type compact: bool, optional
 
         :return: Whether the operation succeeded or not.
         :rtype: tuple[bool, None | tuple[str, IOError]]
         """
+        if compact is None:
+            compact = self.shots is not None and len(self.shots) >= COMPACT_MIN_SHOTS
+        if compact:
+            text = json.dumps(self, separators=(',', ':'), default=_to_compact_json)
+        else:
+            text = json.dumps(self, indent=2, default=_to_json)
         try:
-            with open(self.file_path, 'w') as f:
-                json.dump(self, f, indent=2)
+            atomic_write(self.file_path, text)
             return True, None
-        except IOError as e:
+        except (IOError, OSError) as e:
             return False, (self.file_path, e)
 
     @classmethod
     def load(cls, file_path):
         """
         Constructor method for the class.
-        Load the preset from the given `file_path`.
+        Load the preset from the given `file_path`, migrating it from older versions.
+        The shots are added to the preset's shots as they're parsed, whether they were
+        saved compact or not, without building an intermediate dict per shot.
+
+        :raises PresetVersionError: If the preset was saved by a newer version of the tool.
+        :raises ValueError: If the file isn't a valid preset.
 
         :return: A preset object with the loaded data from `file_path`.
         :rtype: Preset
         """
         with open(file_path, 'r') as f:
-            loaded_data = json.load(f, object_pairs_hook=OrderedDict)
+            loaded_data = json.load(f, object_pairs_hook=_from_json)
+        if not isinstance(loaded_data, dict):
+            raise ValueError("The preset \"{}\" isn't a JSON object.".format(file_path))
+
+        version = loaded_data.get('Version', 1)
+        if version > PRESET_VERSION:
+            raise PresetVersionError("The preset \"{}\" is version {}, newer than {}.".format(
+                file_path, version, PRESET_VERSION
+            ))
+        while version < PRESET_VERSION:
+            loaded_data = _MIGRATIONS[version](loaded_data)
+            version = loaded_data['Version']
 
+        # merge the loaded sections over the defaults, which fill in any missing setting
         preset = cls(file_path)
-        preset.update(loaded_data)
+        for key, value in loaded_data.items():
+            if isinstance(preset.get(key), OrderedDict) and isinstance(value, dict):
+                preset[key].update(value)
+            else:
+                preset[key] = value
         # cast the shots information into a valid Shots object
-        preset.shots = Shots((int(row), shot) for row, shot in preset.shots.items())
+        if not isinstance(preset['Shots'], Shots):
+            preset.shots = Shots.from_dict(preset['Shots'] or {})
 
         return preset
+
+
+def _migrate_from_1(data):
+    """
+    Presets of version 1 had no version, and are otherwise the same as version 2.
+    """
+    data['Version'] = 2
+    return data
+
+
+# the function that migrates a preset's data from each older version to the next
+_MIGRATIONS = {
+    1: _migrate_from_1,
+}
+
+
+def _to_json(obj):
+    """
+    Serializes the objects the JSON encoder doesn't know, i.e. the preset's shots.
+    """
+    if isinstance(obj, Shots):
+        return obj.to_dict()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+def _to_compact_json(obj):
+    """
+    Serializes the preset's shots as columns of names, start and end frames.
+    """
+    if isinstance(obj, Shots):
+        return OrderedDict(zip((Shots.name, Shots.start, Shots.end), obj.columns()))
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+def _from_json(pairs):
+    """
+    Builds the preset's shots while the JSON is parsed; a shot becomes a light tuple,
+    and the object of these tuples, or of the shots' columns, becomes the shots.
+    Shots are recognized by their keys, in any order. An object mixing shots with
+    anything else is kept as is, for :meth:`Shots.from_dict` to validate.
+
+    :return: The shots, a shot, or the object's pairs as an OrderedDict.
+    :rtype: Shots | _ShotRow | OrderedDict
+    """
+    if len(pairs) == len(_SHOT_KEYS) and set(key for key, _ in pairs) == _SHOT_KEYS:
+        values = dict(pairs)
+        if all(isinstance(value, list) for value in values.values()):
+            return Shots.from_columns(values[Shots.name], values[Shots.start], values[Shots.end])
+        return _ShotRow(values[Shots.name], values[Shots.start], values[Shots.end])
+    if pairs and all(isinstance(value, _ShotRow) for _, value in pairs):
+        shots = Shots()
+        for row, shot in pairs:
+            shots.insert_shot(int(row), *shot)
+        return shots
+    return OrderedDict(
+        (key, OrderedDict(zip(_ShotRow._fields, value)) if isinstance(value, _ShotRow) else value)
+        for key, value in pairs
+    )
+
+def atomic_write(file_path, text):
+    """
+    Writes the text to a temporary file in the same directory, then renames it to the
+    given file path, so that the file is either fully written or left untouched.
+
+    :param file_path: The path of the file to write.
+    :type file_path: str
+
+    :param text: The text to write.
+    :type text: str
+
+    :raises IOError: If the file can't be written.
+
+    :return: None
+    :rtype: None
+    """
+    temp_path = os.path.join(os.path.dirname(os.path.abspath(file_path)), ".{}.{}.tmp".format(
+        os.path.basename(file_path), uuid.uuid4().hex
+    ))
+    # created with the same permissions as a new file, the umask applies as usual
+    f = os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), 'w')
+    try:
+        with f:
+            # keep the permissions of the file it replaces
+            if os.path.exists(file_path):
+                mode = os.stat(file_path).st_mode & 0o777
+                if hasattr(os, 'fchmod'):
+                    os.fchmod(f.fileno(), mode)
+                else:
+                    os.chmod(temp_path, mode)
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if hasattr(os, 'replace'):
+            os.replace(temp_path, file_path)
+        else:
+            # python 2 can't rename over an existing file on windows
+            if os.name == 'nt' and os.path.exists(file_path):
+                os.remove(file_path)
+            os.rename(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
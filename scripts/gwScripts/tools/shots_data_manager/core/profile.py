@@ -0,0 +1,367 @@
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+
+PROFILE_EXTENSION = ".profile.jsonl"
+
+# the stages that contain others, left out of the stages' totals so their time isn't counted twice
+PARENT_STAGES = ('shot',)
+
+# the profile being recorded, if any
+_active = None
+
+
+class Profile(object):
+    """
+    Records the time and the number of Maya commands spent in each stage of
+    an export run, e.g. reloading the main file, keying, cutting and saving,
+    and writes them as JSON lines; a "run" record with the run's settings and
+    totals, followed by a "stage" record for every stage that ran.
+
+    Stages are marked with :func:`stage`, which does nothing unless a profile
+    is being recorded, so the instrumented code pays nothing otherwise.
+    Commands are counted in the modules that call them through :func:`counted`.
+    """
+    def __init__(self, file_path=None, **run_info):
+        """
+        Initializes the profile.
+
+        :param file_path: The JSON lines file to write the profile to, or None to only record it.
+        :type file_path: str, optional
+
+        :param run_info: The settings of the run, stored in its "run" record.
+        :type run_info: dict
+
+        :return: None
+        :rtype: None
+        """
+        self.file_path = file_path
+        self.run_info = run_info
+        self.records = []
+        self.commands = 0
+        self.command_counts = {}
+        self.shot_name = None
+        self._start_time = None
+        self._started = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Starts recording the profile, for runs that don't fit in a `with` block,
+        e.g. those stepped through from Qt's event loop.
+
+        :return: The profile.
+        :rtype: Profile
+        """
+        global _active
+        self._start_time = time.time()
+        self._started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        _active = self
+        return self
+
+    def stop(self):
+        """
+        Stops recording the profile, and writes it to its file if it has one.
+        Does nothing if the profile isn't being recorded, e.g. if it was already stopped.
+
+        :return: None
+        :rtype: None
+        """
+        global _active
+        if _active is not self:
+            return
+        _active = None
+        if self.file_path:
+            self.write()
+
+    def stage(self, name):
+        """
+        :return: A context that records the time and commands spent in the stage.
+        :rtype: _Stage
+        """
+        return _Stage(self, name)
+
+    def count(self, command):
+        """
+        Counts a Maya command that ran while the profile was recorded.
+
+        :return: None
+        :rtype: None
+        """
+        self.commands += 1
+        self.command_counts[command] = self.command_counts.get(command, 0) + 1
+
+    def write(self):
+        """
+        Writes the profile to its file, creating its directory if needed.
+
+        :return: None
+        :rtype: None
+        """
+        dir_path = os.path.dirname(self.file_path)
+        if dir_path and not os.path.isdir(dir_path):
+            os.makedirs(dir_path)
+        run = dict(self.run_info)
+        run.update({
+            'type': 'run',
+            'started': self._started,
+            'seconds': time.time() - self._start_time,
+            'commands': self.commands,
+            'command_counts': self.command_counts,
+        })
+        with open(self.file_path, 'w') as f:
+            for record in [run] + self.records:
+                f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+class _Stage(object):
+    """
+    A context that appends a "stage" record to a profile once it exits.
+    The "shot" stage also tags the stages within it with the shot's name.
+    """
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self._start_time = None
+        self._commands = 0
+
+    def __enter__(self):
+        self._start_time = time.time()
+        self._commands = self.profile.commands
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.records.append({
+            'type': 'stage',
+            'stage': self.name,
+            'shot': self.profile.shot_name,
+            'seconds': time.time() - self._start_time,
+            'commands': self.profile.commands - self._commands,
+        })
+
+
+class _NoStage(object):
+    """
+    The context returned by :func:`stage` when no profile is recorded.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class _ShotStage(_Stage):
+    def __init__(self, profile, shot_name):
+        super(_ShotStage, self).__init__(profile, 'shot')
+        self.shot_name = shot_name
+
+    def __enter__(self):
+        self.profile.shot_name = self.shot_name
+        return super(_ShotStage, self).__enter__()
+
+    def __exit__(self, *exc_info):
+        super(_ShotStage, self).__exit__(*exc_info)
+        self.profile.shot_name = None
+
+
+class _CountedCommands(object):
+    """
+    A proxy of `maya.cmds` that counts every command called through it
+    in the profile being recorded, and hands out the commands as they are otherwise.
+    """
+    def __init__(self, cmds):
+        self._cmds = cmds
+
+    def __getattr__(self, name):
+        command = getattr(self._cmds, name)
+        if _active is None or not callable(command):
+            return command
+
+        def counted(*args, **kwargs):
+            if _active is not None:
+                _active.count(name)
+            return command(*args, **kwargs)
+        return counted
+
+
+_NO_STAGE = _NoStage()
+
+
+def counted(cmds):
+    """
+    Wraps a module's Maya commands, so that the commands it calls are counted
+    in the profile being recorded, if any:
+
+        import maya.cmds as cmds
+        cmds = profile.counted(cmds)
+
+    :param cmds: The `maya.cmds` module.
+    :type cmds: module
+
+    :return: The counted commands.
+    :rtype: _CountedCommands
+    """
+    return _CountedCommands(cmds)
+
+def stage(name):
+    """
+    Marks a stage of the export in the profile being recorded, if any:
+
+        with profile.stage('save'):
+            ...
+
+    :param name: The name of the stage.
+    :type name: str
+
+    :return: The context of the stage.
+    :rtype: _Stage | _NoStage
+    """
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name)
+
+def shot(shot_name):
+    """
+    Marks the export of a whole shot in the profile being recorded, if any,
+    tagging the stages within it with the shot's name.
+
+    :param shot_name: The name of the shot.
+    :type shot_name: str
+
+    :return: The context of the shot.
+    :rtype: _Stage | _NoStage
+    """
+    if _active is None:
+        return _NO_STAGE
+    return _ShotStage(_active, shot_name)
+
+def profile_path(dir_path, name="shots_data_manager"):
+    """
+    :return: A new file path for the profile of an export run in the given directory.
+    :rtype: str
+    """
+    return os.path.join(dir_path, "{}_{}_{}{}".format(
+        name, time.strftime("%Y%m%d-%H%M%S"), os.getpid(), PROFILE_EXTENSION
+    ))
+
+def read_profiles(paths):
+    """
+    Reads the records of every profile file in the given files and directories.
+
+    :param paths: Profile files, or directories to find them in.
+    :type paths: list[str]
+
+    :return: The records of each profile file, by file path.
+    :rtype: dict[str, list[dict]]
+    """
+    file_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths.extend(sorted(glob.glob(os.path.join(path, "*" + PROFILE_EXTENSION))))
+        else:
+            file_paths.append(path)
+
+    profiles = {}
+    for file_path in file_paths:
+        with open(file_path) as f:
+            profiles[file_path] = [json.loads(line) for line in f if line.strip()]
+    return profiles
+
+def summarize(profiles):
+    """
+    Aggregates the stages of all the profiles.
+
+    :param profiles: The records of each profile file.
+    :type profiles: dict[str, list[dict]]
+
+    :return: The (stage, runs, calls, total seconds, mean seconds, max seconds, commands)
+        of each stage, slowest in total first, without the `PARENT_STAGES`.
+    :rtype: list[tuple]
+    """
+    stages = {}
+    for records in profiles.values():
+        seen = set()
+        for record in records:
+            if record.get('type') != 'stage' or record['stage'] in PARENT_STAGES:
+                continue
+            name = record['stage']
+            summary = stages.setdefault(name, [0, 0, 0.0, 0.0, 0])
+            if name not in seen:
+                seen.add(name)
+                summary[0] += 1
+            summary[1] += 1
+            summary[2] += record['seconds']
+            summary[3] = max(summary[3], record['seconds'])
+            summary[4] += record['commands']
+    rows = [
+        (name, runs, calls, total, total / calls, longest, commands)
+        for name, (runs, calls, total, longest, commands) in stages.items()
+    ]
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+def report(paths, top=10, stream=sys.stdout):
+    """
+    Prints the slowest stages across the export runs of the given profiles,
+    followed by the most called Maya commands.
+
+    :return: The number of profiles read.
+    :rtype: int
+    """
+    profiles = read_profiles(paths)
+    shots = [record for records in profiles.values() for record in records
+             if record.get('type') == 'stage' and record['stage'] in PARENT_STAGES]
+    stream.write("{} export runs profiled, {} shots in {:.3f} seconds.\n\n".format(
+        len(profiles), len(shots), sum(record['seconds'] for record in shots)
+    ))
+    stream.write("{:<10} {:>6} {:>8} {:>12} {:>10} {:>10} {:>10}\n".format(
+        "stage", "runs", "calls", "total (s)", "mean (s)", "max (s)", "commands"
+    ))
+    for row in summarize(profiles)[:top]:
+        stream.write("{:<10} {:>6} {:>8} {:>12.3f} {:>10.4f} {:>10.4f} {:>10}\n".format(*row))
+
+    command_counts = {}
+    for records in profiles.values():
+        for record in records:
+            for command, count in record.get('command_counts', {}).items():
+                command_counts[command] = command_counts.get(command, 0) + count
+    if command_counts:
+        stream.write("\n{:<24} {:>10}\n".format("command", "calls"))
+        for command, count in sorted(command_counts.items(), key=lambda item: -item[1])[:top]:
+            stream.write("{:<24} {:>10}\n".format(command, count))
+    return len(profiles)
+
+def main(argv=None):
+    """
+    The command-line entry point of the report, run with any Python interpreter:
+
+        python shots_data_manager/core/profile.py
+        python shots_data_manager/core/profile.py /path/to/profiles --top 5
+
+    :return: The exit code; 1 if no profiles were found.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        description="Summarizes the slowest stages across profiled shot exports."
+    )
+    parser.add_argument('paths', nargs='*',
+                        default=[os.path.dirname(os.path.dirname(os.path.abspath(__file__)))],
+                        help="Profile files, or directories to find them in. "
+                             "Defaults to the tool's directory, next to its log file.")
+    parser.add_argument('--top', type=int, default=10, help="The number of stages to show.")
+    args = parser.parse_args(argv)
+    return 0 if report(args.paths, args.top) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,86 @@
 
-from collections import OrderedDict
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
 
 
-class Shots(OrderedDict):
+# the result of exporting a single shot, where `error` is the
+# error message if the shot failed to export, otherwise None,
+# followed by the seconds the shot took, the number of anim curves
+# processed and the size of the written file in bytes, or None if unknown
+ShotResult = namedtuple(
+    'ShotResult', ['shot_name', 'file_path', 'failed_anim_curves', 'pruned_anim_curves', 'error',
+                   'seconds', 'curve_count', 'file_size']
+)
+
+
+def exact_frame(frame):
+    """
+    Frame number as an integer if it is whole, otherwise as a float.
+
+    :param frame: The input frame number.
+    :type frame: int | float | str
+
+    :return: The frame number in its most exact form.
+    :rtype: int | float
+    """
+    _frame = float(frame)
+    return int(round(_frame)) if round(_frame) == _frame else _frame
+
+
+class Shots(object):
     """
     A data class that defines the shots' information structure.
+    The shots are stored as parallel columns of names, start and end frames,
+    rather than a dict per shot, so that sequences of thousands of shots
+    stay cheap to build, iterate and serialize. Rows are iterated in the
+    order they were inserted, and keep their row numbers, gaps included.
     """
+    __slots__ = ('_rows', '_names', '_starts', '_ends', '_index', '_by_start')
+
     name = "shot_name"
     start = "start_frame"
     end = "end_frame"
 
+    def __init__(self):
+        self._rows = []
+        self._names = []
+        self._starts = []
+        self._ends = []
+        # the column index of each row
+        self._index = {}
+        # the start frames and rows of the shots, sorted by start frame, built on demand
+        self._by_start = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(list(self._rows))
+
+    def __contains__(self, row):
+        return row in self._index
+
+    def __eq__(self, other):
+        if not isinstance(other, Shots):
+            return NotImplemented
+        return (self._rows == other._rows and self._names == other._names
+                and self._starts == other._starts and self._ends == other._ends)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{}({} shots)".format(type(self).__name__, len(self))
+
     def insert_shot(self, row, shot_name, start_frame, end_frame):
         """
-        Inserts new shot information as a nested OrderedDict in the given row.
+        Inserts new shot information in the given row,
+        replacing the shot already in that row, if any.
 
-        :param row: The number of the row in the dictionary (`self`) to
+        :param row: The number of the row in the shots (`self`) to
             add the new shot to.
         :type row: int
 
@@ -27,14 +93,22 @@ class Shots(OrderedDict):
         :param end_frame: The end frame of the new shot.
         :type end_frame: int
 
-        :return: Modified dictionary (`self`) with the new shot information
+        :return: Modified shots (`self`) with the new shot information
             included in the given row.
         :rtype: Shots
         """
-        self[row] = OrderedDict()
-        self[row][self.name] = shot_name
-        self[row][self.start] = start_frame
-        self[row][self.end] = end_frame
+        i = self._index.get(row)
+        if i is None:
+            self._index[row] = len(self._rows)
+            self._rows.append(row)
+            self._names.append(shot_name)
+            self._starts.append(start_frame)
+            self._ends.append(end_frame)
+        else:
+            self._names[i] = shot_name
+            self._starts[i] = start_frame
+            self._ends[i] = end_frame
+        self._by_start = None
         return self
 
     def get_shot_name(self, row):
@@ -47,7 +121,7 @@ class Shots(OrderedDict):
         :return: The shot's name.
         :rtype: str
         """
-        return self[row][self.name]
+        return self._names[self._index[row]]
 
     def get_shot_start(self, row):
         """
@@ -59,7 +133,7 @@ class Shots(OrderedDict):
         :return: The shot's start frame.
         :rtype: int | float
         """
-        return self[row][self.start]
+        return self._starts[self._index[row]]
 
     def get_shot_end(self, row):
         """
@@ -71,4 +145,187 @@ class Shots(OrderedDict):
         :return: The shot's end frame.
         :rtype: int | float
         """
-        return self[row][self.end]
+        return self._ends[self._index[row]]
+
+    def set_shot_name(self, row, shot_name):
+        """
+        Set a shot's name by row.
+
+        :param row: The row number.
+        :type row: int
+
+        :param shot_name: The shot's new name.
+        :type shot_name: str
+
+        :return: None
+        :rtype: None
+        """
+        self._names[self._index[row]] = shot_name
+
+    def set_shot_range(self, row, start_frame, end_frame):
+        """
+        Set a shot's start and end frames by row.
+
+        :param row: The row number.
+        :type row: int
+
+        :param start_frame: The shot's new start frame.
+        :type start_frame: int | float
+
+        :param end_frame: The shot's new end frame.
+        :type end_frame: int | float
+
+        :return: None
+        :rtype: None
+        """
+        i = self._index[row]
+        if self._starts[i] != start_frame:
+            self._by_start = None
+        self._starts[i] = start_frame
+        self._ends[i] = end_frame
+
+    def insert_rows(self, position, count):
+        """
+        Inserts empty shots into shots whose rows are numbered from 0,
+        see :meth:`from_columns`, shifting the rows after them.
+        The columns are edited in place.
+
+        :param position: The row of the first new shot.
+        :type position: int
+
+        :param count: The number of shots to insert.
+        :type count: int
+
+        :return: None
+        :rtype: None
+        """
+        self._names[position:position] = [""] * count
+        self._starts[position:position] = [0] * count
+        self._ends[position:position] = [0] * count
+        self._renumber()
+
+    def remove_rows(self, position, count):
+        """
+        Removes consecutive shots from shots whose rows are numbered from 0,
+        see :meth:`from_columns`, shifting the rows after them.
+        The columns are edited in place.
+
+        :param position: The row of the first shot to remove.
+        :type position: int
+
+        :param count: The number of shots to remove.
+        :type count: int
+
+        :return: None
+        :rtype: None
+        """
+        del self._names[position:position + count]
+        del self._starts[position:position + count]
+        del self._ends[position:position + count]
+        self._renumber()
+
+    def rows_by_start(self):
+        """
+        :return: The rows sorted by their shots' start frame, then by row.
+        :rtype: list[int]
+        """
+        return list(self._sorted_starts()[1])
+
+    def rows_starting_in(self, first_frame, last_frame):
+        """
+        Finds the shots that start within a frame range, with a binary search
+        over the shots sorted by start frame.
+
+        :param first_frame: The first frame of the range.
+        :type first_frame: int | float
+
+        :param last_frame: The last frame of the range, included.
+        :type last_frame: int | float
+
+        :return: The rows of the shots starting in the range, sorted by start frame.
+        :rtype: list[int]
+        """
+        starts, rows = self._sorted_starts()
+        return rows[bisect_left(starts, first_frame):bisect_right(starts, last_frame)]
+
+    def to_dict(self):
+        """
+        :return: The shots as nested dicts by row, as they're stored in a preset.
+        :rtype: OrderedDict
+        """
+        return OrderedDict(
+            (row, OrderedDict([(self.name, name), (self.start, start), (self.end, end)]))
+            for row, name, start, end in zip(self._rows, self._names, self._starts, self._ends)
+        )
+
+    def columns(self):
+        """
+        :return: Copies of the names, start frames and end frames of the shots, in row order.
+        :rtype: tuple[list[str], list[int | float], list[int | float]]
+        """
+        return list(self._names), list(self._starts), list(self._ends)
+
+    @classmethod
+    def from_columns(cls, names, starts, ends):
+        """
+        Constructor method for the class.
+        Builds the shots from their columns in one go, numbering their rows from 0.
+
+        :param names: The names of the shots.
+        :type names: Iterable[str]
+
+        :param starts: The start frames of the shots.
+        :type starts: Iterable[int | float]
+
+        :param ends: The end frames of the shots.
+        :type ends: Iterable[int | float]
+
+        :return: The shots of the given columns.
+        :rtype: Shots
+        """
+        shots = cls()
+        shots._names = list(names)
+        shots._starts = list(starts)
+        shots._ends = list(ends)
+        if not len(shots._names) == len(shots._starts) == len(shots._ends):
+            raise ValueError("The shots' columns must all have the same length.")
+        shots._renumber()
+        return shots
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Constructor method for the class.
+
+        :param data: The shots as nested dicts by row, see :meth:`to_dict`,
+            where the rows may be strings, as they're loaded from JSON.
+        :type data: dict
+
+        :raises ValueError: If a row or a shot is malformed.
+
+        :return: The shots of the given data.
+        :rtype: Shots
+        """
+        if not isinstance(data, dict):
+            raise ValueError("The shots must be an object of rows, not {!r}.".format(data))
+        shots = cls()
+        for row, shot in data.items():
+            try:
+                shots.insert_shot(int(row), shot[cls.name], shot[cls.start], shot[cls.end])
+            except (KeyError, TypeError) as e:
+                raise ValueError("Invalid shot in row {}: {!r}".format(row, e))
+        return shots
+
+    def _renumber(self):
+        """
+        Numbers the rows from 0 again, once shots were inserted or removed.
+        """
+        self._rows = list(range(len(self._names)))
+        self._index = dict(zip(self._rows, self._rows))
+        self._by_start = None
+
+    def _sorted_starts(self):
+        if self._by_start is None:
+            by_start = sorted(zip(self._starts, self._rows))
+            self._by_start = ([start for start, _ in by_start], [row for _, row in by_start])
+        return self._by_start
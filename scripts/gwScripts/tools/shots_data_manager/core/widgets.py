@@ -1,30 +1,260 @@
-
 try:
+    from PySide6 import QtCore
+    from PySide6 import QtGui
     from PySide6 import QtWidgets
 except:
+    from PySide2 import QtCore
+    from PySide2 import QtGui
     from PySide2 import QtWidgets
 
-from gwScripts.tools.shots_data_manager.core.shots import Shots
+from gwScripts.tools.shots_data_manager.core.intervals import ShotIntervals
+from gwScripts.tools.shots_data_manager.core.shots import Shots, exact_frame
 
 
-class Table(QtWidgets.QTableWidget):
+class ShotsModel(QtCore.QAbstractTableModel):
+    """
+    Table model over a :class:`Shots` store, one row per shot, with its rows numbered from 0.
+    Flags the shots whose frame ranges are invalid, overlap or leave a gap, as they're
+    edited, re-checking only the rows around the edited one, see :class:`ShotIntervals`.
     """
-    Custom QTableWidget for the ShotsDataManager.
+    HEADERS = ("Shot Name", "Start Frame", "End Frame")
+    PROBLEM_COLOR = QtGui.QColor(150, 60, 60)
+
+    def __init__(self, parent=None, problem_tooltips=None):
+        """
+        Initializes the model.
+
+        :param parent: Use to parent the model to another object.
+        :type parent: QtCore.QObject, optional
+
+        :param problem_tooltips: The tooltip of a flagged row for each problem
+            of :meth:`ShotIntervals.problems`.
+        :type problem_tooltips: dict[str, str], optional
+
+        :return: None
+        :rtype: None
+        """
+        super(ShotsModel, self).__init__(parent)
+        self.problem_tooltips = problem_tooltips or {}
+        self.shots = Shots()
+        self.intervals = ShotIntervals()
+        # the problems of the flagged rows, by row
+        self._problems = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.shots)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADERS[section]
+        return super(ShotsModel, self).headerData(section, orientation, role)
+
+    def flags(self, index):
+        return super(ShotsModel, self).flags(index) | QtCore.Qt.ItemIsEditable
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Override of :meth:`QtCore.QAbstractTableModel.data`.
+        Frames are returned as numbers, so that they're sorted and edited as such.
+        """
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            if column == 0:
+                return self.shots.get_shot_name(row)
+            frame = (self.shots.get_shot_start(row) if column == 1
+                     else self.shots.get_shot_end(row))
+            return exact_frame(frame)
+        if column == 0 or row not in self._problems:
+            return None
+        if role == QtCore.Qt.BackgroundRole:
+            return self.PROBLEM_COLOR
+        if role == QtCore.Qt.ToolTipRole:
+            return "\n".join(self.problem_tooltips.get(problem, problem)
+                             for problem in sorted(self._problems[row]))
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """
+        Override of :meth:`QtCore.QAbstractTableModel.setData`.
+        Updates a shot's name or frame, and the flags of the rows its new range affects.
+        """
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        if column == 0:
+            self.shots.set_shot_name(row, value)
+            self.dataChanged.emit(index, index)
+            return True
+
+        try:
+            frame = exact_frame(value)
+        except (TypeError, ValueError):
+            return False
+        start, end = self.shots.get_shot_start(row), self.shots.get_shot_end(row)
+        start, end = (frame, end) if column == 1 else (start, frame)
+        self.shots.set_shot_range(row, start, end)
+        self.dataChanged.emit(index, index)
+        self._flag_rows(self.intervals.set_shot(row, start, end))
+        return True
+
+    def insertRows(self, position, count, parent=QtCore.QModelIndex()):
+        """
+        Override of :meth:`QtCore.QAbstractTableModel.insertRows`.
+        Inserts empty shots, shifting the rows after them.
+        """
+        self.beginInsertRows(parent, position, position + count - 1)
+        self.shots.insert_rows(position, count)
+        self.endInsertRows()
+        self._reindex()
+        return True
+
+    def removeRows(self, position, count, parent=QtCore.QModelIndex()):
+        """
+        Override of :meth:`QtCore.QAbstractTableModel.removeRows`.
+        Removes shots, shifting the rows after them.
+        """
+        self.remove_rows(range(position, position + count))
+        return True
+
+    def remove_rows(self, rows):
+        """
+        Removes the shots of the given rows, one range of consecutive rows at a time,
+        from the last one, then flags the remaining rows once.
+
+        :param rows: The rows to remove.
+        :type rows: Iterable[int]
+
+        :return: None
+        :rtype: None
+        """
+        ranges = []
+        for row in sorted(set(rows)):
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        if not ranges:
+            return
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            self.shots.remove_rows(first, last - first + 1)
+            self.endRemoveRows()
+        self._reindex()
+
+    def populate(self, shots_data):
+        """
+        Replaces the model's shots with a copy of the given ones.
+
+        :param shots_data: The shots to display.
+        :type shots_data: Shots
+
+        :return: None
+        :rtype: None
+        """
+        self.beginResetModel()
+        self.shots = Shots.from_columns(*shots_data.columns())
+        self.intervals = ShotIntervals(self.shots)
+        self._problems = {}
+        for row in self.shots:
+            problems = self.intervals.problems(row)
+            if problems:
+                self._problems[row] = problems
+        self.endResetModel()
+
+    def rename_shots(self, names):
+        """
+        Renames all the shots, in a single change of the name column.
+
+        :param names: The new name of each row.
+        :type names: list[str]
+
+        :return: None
+        :rtype: None
+        """
+        if not names:
+            return
+        for row, shot_name in enumerate(names):
+            self.shots.set_shot_name(row, shot_name)
+        self.dataChanged.emit(self.index(0, 0), self.index(len(names) - 1, 0))
+
+    def _reindex(self):
+        """
+        Indexes the frame ranges of all the rows again, and flags them,
+        after rows were added or removed, which changes the rows' numbers.
+
+        :return: None
+        :rtype: None
+        """
+        self.intervals = ShotIntervals(self.shots)
+        self._problems = {}
+        self._flag_rows(self.shots)
+
+    def _flag_rows(self, rows):
+        """
+        Updates the problems of the given rows, signalling
+        the frame ranges whose flags changed.
+
+        :param rows: The rows to flag.
+        :type rows: Iterable[int]
+
+        :return: None
+        :rtype: None
+        """
+        for row in rows:
+            problems = self.intervals.problems(row) if row in self.intervals else set()
+            if problems == self._problems.get(row, set()):
+                continue
+            if problems:
+                self._problems[row] = problems
+            else:
+                del self._problems[row]
+            self.dataChanged.emit(self.index(row, 1), self.index(row, 2))
+
+
+class Table(QtWidgets.QTableView):
+    """
+    Custom QTableView for the ShotsDataManager, over a :class:`ShotsModel`.
     Implements and overrides methods to tailor its use for shot data manipulation.
+    The rows can be sorted by any column and filtered by shot name through a proxy model,
+    while the row numbers of the shots data stay those of the source model.
     """
-    def __init__(self, parent):
+    def __init__(self, parent, problem_tooltips=None):
         """
         Initializes the dialog.
 
         :param parent: Use to parent the dialog to another widget.
         :type parent: QtWidgets.QWidget
 
+        :param problem_tooltips: The tooltip of a flagged row for each problem
+            of :meth:`ShotIntervals.problems`.
+        :type problem_tooltips: dict[str, str], optional
+
         :return: None
         :rtype: None
         """
         super(Table, self).__init__(parent)
-        self.setColumnCount(3)
-        self.setHorizontalHeaderLabels(["Shot Name", "Start Frame", "End Frame"])
+        self.shots_model = ShotsModel(self, problem_tooltips)
+        self.proxy_model = QtCore.QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.shots_model)
+        self.proxy_model.setFilterKeyColumn(0)
+        self.proxy_model.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.setModel(self.proxy_model)
+        # start unsorted, in the order of the shots data
+        self.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+        self.setSortingEnabled(True)
+
+    @property
+    def intervals(self):
+        """
+        :return: The index of the shots' frame ranges, kept up to date as they're edited.
+        :rtype: ShotIntervals
+        """
+        return self.shots_model.intervals
 
     def populate(self, shots_data):
         """
@@ -38,16 +268,19 @@ class Table(QtWidgets.QTableWidget):
         """
         if not isinstance(shots_data, Shots):
             raise TypeError("Expected Shots instance, got {}".format(type(shots_data)))
+        self.shots_model.populate(shots_data)
+
+    def filter_shots(self, text):
+        """
+        Only shows the shots whose name contains the given text.
 
-        self.clear()
-        self.setRowCount(len(shots_data))
-        for row in range(self.rowCount()):
-            shot_name = shots_data.get_shot_name(row)
-            start_frame = self._exact_frame(shots_data.get_shot_start(row))
-            end_frame = self._exact_frame(shots_data.get_shot_end(row))
-            self.setItem(row, 0, QtWidgets.QTableWidgetItem(shot_name))
-            self.setItem(row, 1, QtWidgets.QTableWidgetItem(str(start_frame)))
-            self.setItem(row, 2, QtWidgets.QTableWidgetItem(str(end_frame)))
+        :param text: The text to look for, or an empty string to show all the shots.
+        :type text: str
+
+        :return: None
+        :rtype: None
+        """
+        self.proxy_model.setFilterFixedString(text)
 
     def rename_shots(self, name, start, incr, padd):
         """
@@ -68,41 +301,38 @@ class Table(QtWidgets.QTableWidget):
         :return: None
         :rtype: None
         """
-        for row in range(self.rowCount()):
-            shot_name = name + str(start + (incr * row)).zfill(padd)
-            self.setItem(row, 0, QtWidgets.QTableWidgetItem(str(shot_name)))
+        self.shots_model.rename_shots([
+            name + str(start + (incr * row)).zfill(padd)
+            for row in range(self.shots_model.rowCount())
+        ])
 
     def clear(self):
         """
-        Override of :meth:`QtWidgets.QTableWidget.clear`.
+        Clears the table, leaving a single empty row.
         """
-        self.setRowCount(0)
-        self.setRowCount(1)
+        self.populate(Shots().insert_shot(0, "", 0, 0))
 
     def insertRow(self):
         """
-        Override of :meth:`QtWidgets.QTableWidget.insertRow`.
-        Inserts the new row after the last selected item, if selected.
+        Inserts a new row after the last selected item, if selected.
         """
         if self.selected_items_rows:
-            super(Table, self).insertRow(max(self.selected_items_rows) + 1)
+            self.shots_model.insertRows(max(self.selected_items_rows) + 1, 1)
         else:
-            super(Table, self).insertRow(self.rowCount())
+            self.shots_model.insertRows(self.shots_model.rowCount(), 1)
 
     def removeRow(self):
         """
-        Override of :meth:`QtWidgets.QTableWidget.removeRow`.
         Removes the rows of selected items, if selected.
         """
         if self.selected_items_rows:
-            for i in sorted(self.selected_items_rows, reverse=True):
-                super(Table, self).removeRow(i)
-        else:
-            super(Table, self).removeRow(self.rowCount() - 1)
+            self.shots_model.remove_rows(self.selected_items_rows)
+        elif self.shots_model.rowCount():
+            self.shots_model.removeRows(self.shots_model.rowCount() - 1, 1)
 
     def resizeEvent(self, event):
         """
-        Override of :meth:`QtWidgets.QTableWidget.resizeEvent`.
+        Override of :meth:`QtWidgets.QTableView.resizeEvent`.
         Resizes the columns to the new size based on a fixed ratio.
         """
         super(Table, self).resizeEvent(event)
@@ -114,38 +344,18 @@ class Table(QtWidgets.QTableWidget):
     @property
     def selected_items_rows(self):
         """
-        :return: The row numbers for selected rows in the table.
+        :return: The row numbers for selected rows in the table, in the shots data.
         :rtype: list[int]
         """
-        return [item.row() for item in self.selectedIndexes()]
+        return [self.proxy_model.mapToSource(index).row() for index in self.selectedIndexes()]
 
     @property
     def shots_data(self):
         """
-        :return: The data of all the shots in the table, in a dict form.
+        :return: A copy of the data of all the shots in the table.
         :rtype: Shots
         """
-        shots_data = Shots()
-        for row in range(self.rowCount()):
-            name = "" if not self.item(row, 0) else self.item(row, 0).text()
-            start = 0 if not self.item(row, 1) else float(self.item(row, 1).text())
-            end = 0 if not self.item(row, 2) else float(self.item(row, 2).text())
-            shots_data.insert_shot(row, name, start, end)
-        return shots_data
-
-    @staticmethod
-    def _exact_frame(frame):
-        """
-        Frame number as an integer if it is whole, otherwise as a float.
-
-        :param frame: The input frame number.
-        :type frame: int | float
-
-        :return: The frame number in its most exact form.
-        :rtype: int | float
-        """
-        _frame = float(frame)
-        return int(round(_frame)) if round(_frame) == _frame else _frame
+        return Shots.from_columns(*self.shots_model.shots.columns())
 
 
 class NumericDelegate(QtWidgets.QStyledItemDelegate):
@@ -0,0 +1,133 @@
+
+import os
+import sys
+import json
+import argparse
+
+
+# prefixes the worker's messages, telling them apart from Maya's own output
+MARKER = "@gwShotsWorker "
+
+
+def send(message):
+    """
+    Sends a message to the parent process through stdout.
+
+    :param message: The message to send, must be JSON serializable.
+    :type message: dict
+
+    :return: None
+    :rtype: None
+    """
+    sys.stdout.write(MARKER + json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+def receive(line):
+    """
+    Parses a message sent with :func:`send`.
+
+    :param line: A line of the worker's output.
+    :type line: str
+
+    :return: The message, or None if the line isn't a worker message.
+    :rtype: dict | None
+    """
+    if not line.startswith(MARKER):
+        return None
+    return json.loads(line[len(MARKER):])
+
+def parse_args(argv=None):
+    """
+    :return: The parsed command-line arguments of the worker.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        description="Exports the shots sent through stdin from a main file, one per line."
+    )
+    parser.add_argument('main_file', help="The path of the saved main file.")
+    parser.add_argument('export_path', help="The directory to save the shots to.")
+    parser.add_argument('--normalize', type=int, default=None,
+                        help="The frame to move the start of every shot to.")
+    parser.add_argument('--file-type', default='mayaAscii', choices=['mayaAscii', 'mayaBinary'])
+    parser.add_argument('--mode', default='restore', choices=['reload', 'restore'])
+    parser.add_argument('--prune', action='store_true',
+                        help="Remove the anim curves that are static throughout each shot.")
+    parser.add_argument('--strategy', default='save', choices=['save', 'all', 'selected'])
+    parser.add_argument('--roots', nargs='+', default=None,
+                        help="The DAG roots to export with the \"selected\" strategy.")
+    parser.add_argument('--backend', default='cmds', choices=['cmds', 'api'],
+                        help="Edit the keys with keyframe commands, or with MFnAnimCurve.")
+    parser.add_argument('--profile', default=None,
+                        help="The directory to write the worker's export profile to.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    The entry point of a headless export worker, run with `mayapy`.
+    Opens the main file once, then exports each shot job read from stdin,
+    reporting every result back through stdout.
+
+    :return: The exit code.
+    :rtype: int
+    """
+    args = parse_args(argv)
+
+    # Maya must be initialized before any gwScripts module is imported
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), *[os.pardir] * 4)))
+    from gwScripts.tools.shots_data_manager.core import profile
+    from gwScripts.tools.shots_data_manager.core.export import ShotExporter
+
+    try:
+        exporter = ShotExporter(
+            args.main_file, args.export_path, args.normalize, args.file_type, args.mode,
+            args.prune, args.strategy, args.roots, args.backend
+        )
+        if not args.profile:
+            return serve(exporter)
+        with profile.Profile(
+            profile.profile_path(args.profile, "shots_data_manager_worker"),
+            main_file=args.main_file, mode=args.mode, strategy=args.strategy,
+            backend=args.backend, prune=args.prune, worker=os.getpid()
+        ):
+            return serve(exporter)
+    finally:
+        maya.standalone.uninitialize()
+
+def serve(exporter):
+    """
+    Opens the main file, then exports each shot job read from stdin until it's closed.
+
+    :param exporter: The exporter of the worker.
+    :type exporter: ShotExporter
+
+    :return: The exit code.
+    :rtype: int
+    """
+    try:
+        exporter.open_main_file()
+    except Exception as e:
+        send({'event': 'fatal', 'message': str(e)})
+        return 1
+    send({'event': 'ready', 'pid': os.getpid()})
+
+    for line in iter(sys.stdin.readline, ""):
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            result = exporter.export_shot(
+                job['shot_name'], job['start_frame'], job['end_frame']
+            )
+            send(dict(result._asdict(), event='done', row=job['row']))
+        except Exception as e:
+            send({'event': 'error', 'row': job['row'],
+                  'shot_name': job['shot_name'], 'message': str(e)})
+            # start the next shot from a clean main file
+            exporter.open_main_file(force=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,15 @@
 
+from collections import OrderedDict
+
 import maya.cmds as cmds
 
+from gwScripts.tools.shots_data_manager.core import profile
+from gwScripts.tools.shots_data_manager.core.curves import BACKENDS, STATIC_TOLERANCE, CurveIndex
 from gwScripts.tools.shots_data_manager.core.shots import Shots
 from gwScripts.utils.helpers import unique_list
 
+# counted while the export is profiled
+cmds = profile.counted(cmds)
 
 class Controller:
     """
@@ -43,9 +49,12 @@ class Controller:
             )
         return shots_data
 
-    def apply_shot(self, start_frame, end_frame, normalize):
+    @staticmethod
+    def apply_shot(start_frame, end_frame, normalize, curve_index=None, backend='cmds'):
         """
         The shot manipulation operations, based on the shot data passed.
+        Every step runs as a single command on all the anim curves at once,
+        or through `MFnAnimCurve` with the "api" backend.
 
         :param start_frame: The start frame of the shot.
         :type start_frame: int
@@ -56,29 +65,48 @@ class Controller:
         :param normalize: The normalization value by which to push all the keyframes back.
         :type normalize: int
 
+        :param curve_index: The index of the scene's anim curves, when exporting
+            several shots from the same main file. Built from the scene if not passed.
+        :type curve_index: CurveIndex, optional
+
+        :param backend: One of `BACKENDS`; how the keys are edited,
+            the "api" backend edits them through `MFnAnimCurve`,
+            see :func:`curves_api.apply_shot`.
+        :type backend: str, optional
+
         :return: List of curves that failed the keying operation, or empty list.
         :rtype: list[str]
         """
-        # query all anim curves and keyframe numbers in scene
-        anim_curves = cmds.ls(type=['animCurveTL', 'animCurveTA', 'animCurveTT', 'animCurveTU'])
-        anim_keyframes = list(dict.fromkeys(cmds.keyframe(anim_curves, q=True)))
-        anim_keyframes.sort()
+        if backend not in BACKENDS:
+            raise ValueError("Backend must be one of: {}.".format(", ".join(BACKENDS)))
+        if backend == 'api':
+            from gwScripts.tools.shots_data_manager.core import curves_api
+            return curves_api.apply_shot(start_frame, end_frame, normalize, curve_index)
 
-        # create keys for all anim curves at the cut frames
-        failed_anim_curves = []
-        for anim_curve in anim_curves:
-            if cmds.referenceQuery(anim_curve, inr=True):
-                continue
-            try:
-                cmds.setKeyframe(anim_curve, t=[start_frame, end_frame], itt='linear', ott='linear')
-            except:
-                failed_anim_curves.append(anim_curve)
+        # query all anim curves and the keyframe range in scene
+        if curve_index is None:
+            with profile.stage('index'):
+                curve_index = CurveIndex.from_scene()
+        anim_curves = curve_index.curves
+
+        # create keys for all non-referenced anim curves at the cut frames
+        with profile.stage('key'):
+            failed_anim_curves = Controller._set_cut_keys(
+                curve_index.local_curves, start_frame, end_frame
+            )
 
         # if needed, delete keys before and after the cut frames
-        if anim_keyframes[0] < start_frame:
-            cmds.cutKey(anim_curves, t=(anim_keyframes[0], start_frame-1))
-        if anim_keyframes[-1] > end_frame:
-            cmds.cutKey(anim_curves, t=(end_frame+1, anim_keyframes[-1]))
+        with profile.stage('cut'):
+            if curve_index.first_key is not None and curve_index.first_key < start_frame:
+                cmds.cutKey(
+                    curve_index.curves_before(start_frame),
+                    t=(curve_index.first_key, start_frame-1)
+                )
+            if curve_index.last_key is not None and curve_index.last_key > end_frame:
+                cmds.cutKey(
+                    curve_index.curves_after(end_frame),
+                    t=(end_frame+1, curve_index.last_key)
+                )
 
         # get adjusted cut positions, taking frame normalization into account
         adjust_value = 0
@@ -88,13 +116,186 @@ class Controller:
         adjusted_end_frame = end_frame + adjust_value
 
         # push all the existing animation to the correct frame
-        for anim_curve in anim_curves:
-            cmds.keyframe(anim_curve, e=True, r=True, tc=adjust_value)
+        if anim_curves and adjust_value:
+            with profile.stage('shift'):
+                cmds.keyframe(anim_curves, e=True, r=True, tc=adjust_value)
 
         # set time slider range at the cut
-        cmds.playbackOptions(
-            min=adjusted_start_frame, ast=adjusted_start_frame,
-            max=adjusted_end_frame, aet=adjusted_end_frame
-        )
+        with profile.stage('playback'):
+            cmds.playbackOptions(
+                min=adjusted_start_frame, ast=adjusted_start_frame,
+                max=adjusted_end_frame, aet=adjusted_end_frame
+            )
 
         return failed_anim_curves
+
+    @staticmethod
+    def _set_cut_keys(anim_curves, start_frame, end_frame):
+        """
+        Keys all the given anim curves at the cut frames with a single command.
+        If that fails, falls back to keying the curves one by one
+        in order to find out which of them failed.
+
+        :param anim_curves: The anim curves to key.
+        :type anim_curves: list[str]
+
+        :param start_frame: The start frame of the shot.
+        :type start_frame: int
+
+        :param end_frame: The end frame of the shot.
+        :type end_frame: int
+
+        :return: List of curves that failed the keying operation, or empty list.
+        :rtype: list[str]
+        """
+        if not anim_curves:
+            return []
+        try:
+            cmds.setKeyframe(anim_curves, t=[start_frame, end_frame], itt='linear', ott='linear')
+            return []
+        except:
+            pass
+
+        failed_anim_curves = []
+        for anim_curve in anim_curves:
+            try:
+                cmds.setKeyframe(anim_curve, t=[start_frame, end_frame], itt='linear', ott='linear')
+            except:
+                failed_anim_curves.append(anim_curve)
+        return failed_anim_curves
+
+    @staticmethod
+    def prune_shot(curve_index, skip=(), tolerance=STATIC_TOLERANCE):
+        """
+        Removes the anim curves that are static throughout the shot, once it was applied,
+        leaving their driven attributes at the same constant values.
+        Every key of a static curve holds the same value, with flat in and out tangents,
+        which means the curve no longer animates anything within the shot's range;
+        equal keys with sloped tangents still overshoot in between them.
+
+        :param curve_index: The index of the scene's anim curves.
+        :type curve_index: CurveIndex
+
+        :param skip: The curves to leave as they are, e.g. those that failed keying.
+        :type skip: list[str], optional
+
+        :param tolerance: The largest difference between key values of a static curve,
+            and the largest tangent angle of its keys, in degrees.
+        :type tolerance: float, optional
+
+        :return: List of the removed curves, or empty list.
+        :rtype: list[str]
+        """
+        skip = set(skip)
+        anim_curves = [curve for curve in curve_index.local_curves if curve not in skip]
+        key_ranges = Controller._query_key_ranges(anim_curves)
+        if key_ranges is None:
+            return Controller._prune_curves_one_by_one(anim_curves, tolerance)
+
+        values = cmds.keyframe(list(key_ranges), q=True, valueChange=True) or []
+        static_curves = []
+        for anim_curve, (first, last) in key_ranges.items():
+            curve_values = values[first:last]
+            if max(curve_values) - min(curve_values) <= tolerance:
+                static_curves.append(anim_curve)
+
+        # only the tangents of the curves with static values are queried
+        static_values = {}
+        if static_curves:
+            in_angles = cmds.keyTangent(static_curves, q=True, inAngle=True) or []
+            out_angles = cmds.keyTangent(static_curves, q=True, outAngle=True) or []
+            i = 0
+            for anim_curve in static_curves:
+                first, last = key_ranges[anim_curve]
+                count = last - first
+                angles = in_angles[i:i + count] + out_angles[i:i + count]
+                if all(abs(angle) <= tolerance for angle in angles):
+                    static_values[anim_curve] = values[first]
+                i += count
+        return Controller._delete_static_curves(static_values)
+
+    @staticmethod
+    def _query_key_ranges(anim_curves):
+        """
+        Queries the keys of all the given curves with two commands, splitting them
+        back into curves where their times stop increasing. Once a shot was applied,
+        every keyed curve starts at the shot's first frame, at or before the previous
+        curve's last key, so the split is exact whenever it finds every keyed curve.
+
+        :param anim_curves: The anim curves to query.
+        :type anim_curves: list[str]
+
+        :return: The (first, last) slice of each keyed curve's keys, in the order of
+            the curves, or None if the keys can't be split back into curves.
+        :rtype: OrderedDict[str, tuple[int, int]] | None
+        """
+        keyed_curves = cmds.keyframe(anim_curves, q=True, name=True) if anim_curves else None
+        if not keyed_curves:
+            return OrderedDict()
+        times = cmds.keyframe(keyed_curves, q=True) or []
+        starts = [0] + [i for i in range(1, len(times)) if times[i] <= times[i - 1]]
+        if len(starts) != len(keyed_curves):
+            return None
+        ends = starts[1:] + [len(times)]
+        return OrderedDict(zip(keyed_curves, zip(starts, ends)))
+
+    @staticmethod
+    def _prune_curves_one_by_one(anim_curves, tolerance):
+        """
+        The fallback of :meth:`prune_shot`, querying each curve's keys on its own.
+
+        :return: List of the removed curves, or empty list.
+        :rtype: list[str]
+        """
+        static_values = {}
+        for anim_curve in anim_curves:
+            values = cmds.keyframe(anim_curve, q=True, valueChange=True)
+            if not values or max(values) - min(values) > tolerance:
+                continue
+            angles = ((cmds.keyTangent(anim_curve, q=True, inAngle=True) or [])
+                      + (cmds.keyTangent(anim_curve, q=True, outAngle=True) or []))
+            if all(abs(angle) <= tolerance for angle in angles):
+                static_values[anim_curve] = values[0]
+        return Controller._delete_static_curves(static_values)
+
+    @staticmethod
+    def _delete_static_curves(static_values):
+        """
+        Deletes the static curves, holding their driven attributes at their values.
+
+        :param static_values: The value of each static curve.
+        :type static_values: dict[str, float]
+
+        :return: List of the removed curves, or empty list.
+        :rtype: list[str]
+        """
+        if not static_values:
+            return []
+
+        # find the attributes driven by the static curves with a single command
+        connections = cmds.listConnections(
+            list(static_values), s=False, d=True, plugs=True, connections=True
+        ) or []
+        driven_plugs = []
+        for source, destination in zip(connections[::2], connections[1::2]):
+            driven_plugs.append((destination, static_values[source.partition(".")[0]]))
+
+        pruned_curves = list(static_values)
+        try:
+            cmds.delete(pruned_curves)
+        except:
+            pruned_curves = []
+            for anim_curve in static_values:
+                try:
+                    cmds.delete(anim_curve)
+                    pruned_curves.append(anim_curve)
+                except:
+                    pass
+
+        # hold the last evaluated values, in case the attributes weren't left at them
+        for plug, value in driven_plugs:
+            try:
+                cmds.setAttr(plug, value)
+            except:
+                pass
+        return pruned_curves
@@ -1,22 +1,45 @@
 
 import os
+import time
+import sqlite3
+import multiprocessing
+from collections import OrderedDict
 
 import maya.cmds as cmds
 try:
+    from PySide6 import QtCore
     from PySide6 import QtGui
     from PySide6 import QtWidgets
     from PySide6.QtGui import QAction
 except:
+    from PySide2 import QtCore
     from PySide2 import QtGui
     from PySide2 import QtWidgets
     from PySide2.QtWidgets import QAction
 
-from gwScripts.tools.shots_data_manager.core.preset import Preset
+from gwScripts.tools.shots_data_manager.core import profile
+from gwScripts.tools.shots_data_manager.core.batch import BatchExporter
+from gwScripts.tools.shots_data_manager.core.catalog import PresetCatalog
+from gwScripts.tools.shots_data_manager.core.curves import BACKENDS, query_curve_keys
+from gwScripts.tools.shots_data_manager.core.export import (
+    EXPORT_STRATEGIES, SceneEditedError, ShotExporter
+)
+from gwScripts.tools.shots_data_manager.core.intervals import GAP, INVALID, OVERLAP
+from gwScripts.tools.shots_data_manager.core.jobs import ExportJob, ExportQueue
+from gwScripts.tools.shots_data_manager.core.manifest import (
+    Manifest, fingerprint_shots, shot_inputs
+)
+from gwScripts.tools.shots_data_manager.core.preset import Preset, PresetVersionError
 from gwScripts.tools.shots_data_manager.core.widgets import NumericDelegate, Table
+from gwScripts.utils import logutil
 from gwScripts.utils.dialog import Dialog
 from gwScripts.utils.helpers import open_dir, validate_string
 
 
+# the seconds to wait on the parallel workers before handing control back to the GUI
+EXPORT_POLL_SECONDS = 0.05
+
+
 class Window(Dialog):
     """
     A handy tool for Maya that allows splitting a scene into several
@@ -44,6 +67,8 @@ class Window(Dialog):
         self._unicode_error = False
         self._preset_path = ""
         self._export_path = ""
+        self.export_queue = ExportQueue(self)
+        self.export_progress = None
 
         # initialize shots data
         start_frame = int(cmds.playbackOptions(q=True, min=True))
@@ -84,14 +109,28 @@ class Window(Dialog):
         self.action_preset_load = QAction(self.settings.get('action_load_title'), self)
         self.action_preset_load.setShortcut(self.settings.get('action_load_shortcut'))
         self.action_preset_load.setStatusTip(self.settings.get('action_load_tooltip'))
+        self.action_preset_search = QAction(self.settings.get('action_search_title'), self)
+        self.action_preset_search.setShortcut(self.settings.get('action_search_shortcut'))
+        self.action_preset_search.setStatusTip(self.settings.get('action_search_tooltip'))
 
         # shots data
         self.shots_data_grpbox = QtWidgets.QGroupBox("", self)
 
-        self.shots_data_table = Table(parent=self.shots_data_grpbox)
+        self.shots_data_table = Table(
+            parent=self.shots_data_grpbox,
+            problem_tooltips={
+                INVALID: self.settings.get('shots_data_invalid_tooltip'),
+                OVERLAP: self.settings.get('shots_data_overlap_tooltip'),
+                GAP: self.settings.get('shots_data_gap_tooltip'),
+            }
+        )
         numeric_delegate = NumericDelegate(self.shots_data_table)
         self.shots_data_table.setItemDelegateForColumn(1, numeric_delegate)
         self.shots_data_table.setItemDelegateForColumn(2, numeric_delegate)
+        self.shots_data_filter_edt = QtWidgets.QLineEdit(self.shots_data_grpbox)
+        self.shots_data_filter_edt.setPlaceholderText(self.settings.get('shots_data_filter'))
+        self.shots_data_filter_edt.setToolTip(self.settings.get('shots_data_filter_tooltip'))
+        self.shots_data_filter_edt.setClearButtonEnabled(True)
 
         self.shots_data_insert_row_btn = QtWidgets.QPushButton(
             self.settings.get('shots_data_insert_row'), self.shots_data_grpbox
@@ -205,6 +244,61 @@ class Window(Dialog):
         self.settings_filetype_radgrp.addButton(self.settings_filetype_ma_radbtn)
         self.settings_filetype_radgrp.addButton(self.settings_filetype_mb_radbtn)
 
+        self.settings_restore_ckb = QtWidgets.QCheckBox(
+            self.settings.get('settings_restore'), self.settings_grpbox
+        )
+        self.settings_restore_ckb.setToolTip(self.settings.get('settings_restore_tooltip'))
+        self.settings_restore_ckb.setStatusTip(self.settings.get('settings_restore_tooltip'))
+        self.settings_restore_ckb.setChecked(True)
+
+        self.settings_prune_ckb = QtWidgets.QCheckBox(
+            self.settings.get('settings_prune'), self.settings_grpbox
+        )
+        self.settings_prune_ckb.setToolTip(self.settings.get('settings_prune_tooltip'))
+        self.settings_prune_ckb.setStatusTip(self.settings.get('settings_prune_tooltip'))
+
+        self.settings_incremental_ckb = QtWidgets.QCheckBox(
+            self.settings.get('settings_incremental'), self.settings_grpbox
+        )
+        self.settings_incremental_ckb.setToolTip(self.settings.get('settings_incremental_tooltip'))
+        self.settings_incremental_ckb.setStatusTip(
+            self.settings.get('settings_incremental_tooltip')
+        )
+        self.settings_incremental_ckb.setChecked(False)
+
+        self.settings_strategy_lbl = QtWidgets.QLabel(
+            self.settings.get('settings_strategy'), self.settings_grpbox
+        )
+        self.settings_strategy_cmbbox = QtWidgets.QComboBox(self.settings_grpbox)
+        for strategy in EXPORT_STRATEGIES:
+            self.settings_strategy_cmbbox.addItem(
+                self.settings.get('settings_strategies')[strategy], strategy
+            )
+        self.settings_strategy_cmbbox.setToolTip(self.settings.get('settings_strategy_tooltip'))
+        self.settings_strategy_cmbbox.setStatusTip(self.settings.get('settings_strategy_tooltip'))
+
+        self.settings_backend_lbl = QtWidgets.QLabel(
+            self.settings.get('settings_backend'), self.settings_grpbox
+        )
+        self.settings_backend_cmbbox = QtWidgets.QComboBox(self.settings_grpbox)
+        for backend in BACKENDS:
+            self.settings_backend_cmbbox.addItem(
+                self.settings.get('settings_backends')[backend], backend
+            )
+        self.settings_backend_cmbbox.setToolTip(self.settings.get('settings_backend_tooltip'))
+        self.settings_backend_cmbbox.setStatusTip(self.settings.get('settings_backend_tooltip'))
+
+        self.settings_workers_lbl = QtWidgets.QLabel(
+            self.settings.get('settings_workers'), self.settings_grpbox
+        )
+        self.settings_workers_lbl.setToolTip(self.settings.get('settings_workers_tooltip'))
+        self.settings_workers_lbl.setStatusTip(self.settings.get('settings_workers_tooltip'))
+        self.settings_workers_spnbox = QtWidgets.QSpinBox(self.settings_grpbox)
+        self.settings_workers_spnbox.setMinimum(1)
+        self.settings_workers_spnbox.setMaximum(multiprocessing.cpu_count())
+        self.settings_workers_spnbox.setToolTip(self.settings.get('settings_workers_tooltip'))
+        self.settings_workers_spnbox.setStatusTip(self.settings.get('settings_workers_tooltip'))
+
     def create_layouts(self):
         """
         Override of :meth:`Dialog.create_layouts`.
@@ -223,6 +317,7 @@ class Window(Dialog):
         menu_preset = QtWidgets.QMenu(self.settings.get('preset_menu'), menu_bar)
         menu_preset.addAction(self.action_preset_save)
         menu_preset.addAction(self.action_preset_load)
+        menu_preset.addAction(self.action_preset_search)
         menu_bar.addAction(menu_preset.menuAction())
 
         # shots data
@@ -234,6 +329,7 @@ class Window(Dialog):
         shots_data_edit_hlayout.addWidget(self.shots_data_clear_btn)
 
         shots_data_vlayout = QtWidgets.QVBoxLayout(self.shots_data_grpbox)
+        shots_data_vlayout.addWidget(self.shots_data_filter_edt)
         shots_data_vlayout.addWidget(self.shots_data_table)
         shots_data_vlayout.addLayout(shots_data_edit_hlayout)
 
@@ -277,10 +373,31 @@ class Window(Dialog):
         settings_filetype_hlayout.addWidget(self.settings_filetype_mb_radbtn)
         settings_filetype_hlayout.addItem(spacer_item())
 
+        settings_strategy_hlayout = QtWidgets.QHBoxLayout()
+        settings_strategy_hlayout.addWidget(self.settings_strategy_lbl)
+        settings_strategy_hlayout.addWidget(self.settings_strategy_cmbbox)
+        settings_strategy_hlayout.addItem(spacer_item())
+
+        settings_backend_hlayout = QtWidgets.QHBoxLayout()
+        settings_backend_hlayout.addWidget(self.settings_backend_lbl)
+        settings_backend_hlayout.addWidget(self.settings_backend_cmbbox)
+        settings_backend_hlayout.addItem(spacer_item())
+
+        settings_workers_hlayout = QtWidgets.QHBoxLayout()
+        settings_workers_hlayout.addWidget(self.settings_workers_lbl)
+        settings_workers_hlayout.addWidget(self.settings_workers_spnbox)
+        settings_workers_hlayout.addItem(spacer_item())
+
         settings_vlayout = QtWidgets.QVBoxLayout(self.settings_grpbox)
         settings_vlayout.addLayout(settings_export_path_hlayout)
         settings_vlayout.addLayout(settings_normalize_frames_hlayout)
         settings_vlayout.addLayout(settings_filetype_hlayout)
+        settings_vlayout.addLayout(settings_strategy_hlayout)
+        settings_vlayout.addLayout(settings_backend_hlayout)
+        settings_vlayout.addWidget(self.settings_restore_ckb)
+        settings_vlayout.addWidget(self.settings_prune_ckb)
+        settings_vlayout.addWidget(self.settings_incremental_ckb)
+        settings_vlayout.addLayout(settings_workers_hlayout)
 
         # actions
         buttons_hlayout = QtWidgets.QHBoxLayout()
@@ -305,6 +422,8 @@ class Window(Dialog):
         """
         self.action_preset_save.triggered.connect(self.preset_save)
         self.action_preset_load.triggered.connect(self.preset_load)
+        self.action_preset_search.triggered.connect(self.preset_search)
+        self.shots_data_filter_edt.textChanged.connect(self.shots_data_table.filter_shots)
         self.shots_data_insert_row_btn.clicked.connect(self.shots_data_table.insertRow)
         self.shots_data_remove_row_btn.clicked.connect(self.shots_data_table.removeRow)
         self.shots_data_extract_btn.clicked.connect(self.shots_data_from_selected)
@@ -318,8 +437,22 @@ class Window(Dialog):
         self.settings_export_path_edt.textChanged.connect(self._update_export_path)
         self.settings_normalize_frames_ckb.clicked.connect(self._update_normalize_frames)
         self.buttons_export_btn.clicked.connect(self.run_export_shots)
+        self.export_queue.job_started.connect(self._on_export_started)
+        self.export_queue.shot_exported.connect(self._on_shot_exported)
+        self.export_queue.job_finished.connect(self._on_export_finished)
         self.buttons_close_btn.clicked.connect(self.close)
 
+    def delete_ui(self):
+        """
+        Override of :meth:`Dialog.delete_ui`, cancelling the exports first,
+        so that they bring the main file back and stop their profiles.
+
+        :return: Whether the window was deleted or not.
+        :rtype: bool
+        """
+        self.export_queue.cancel()
+        return super(Window, self).delete_ui()
+
     def preset_save(self):
         """
         Save a preset (Json) file based on the GUI's shots data.
@@ -386,20 +519,8 @@ class Window(Dialog):
             if not load_path:
                 return
             self._preset_path = load_path[0]
-
-            try:
-                preset = Preset.load(self._preset_path)
-            except IOError:
-                self.logger.error("{}: \"{}\".".format(
-                    self.settings.get('load_preset_file_not_found_error'),
-                    self._preset_path
-                ))
-                return
-            except ValueError:
-                self.logger.error("{}: \"{}\".".format(
-                    self.settings.get('load_preset_json_decode_error'),
-                    self._preset_path
-                ))
+            preset = self._read_preset(self._preset_path)
+            if not preset:
                 return
 
         # populate the table based on the preset
@@ -429,6 +550,138 @@ class Window(Dialog):
         # confirmation
         self.info_dialog(title="Done!", message=self.settings.get('preset_loaded_confirm'))
 
+    def preset_search(self):
+        """
+        Searches the presets under a directory by shot name, through the directory's
+        preset catalog, see :class:`PresetCatalog`, and loads the preset of the chosen shot.
+
+        :return: None
+        :rtype: None
+        """
+        start_dir = (os.path.dirname(self._preset_path)
+                     if self._preset_path
+                     else cmds.workspace(q=True, rd=True))
+        root_path = cmds.fileDialog2(
+            dialogStyle=2,  # maya style, consistent across platforms
+            caption="Search Presets In...",
+            startingDirectory=start_dir,
+            fileMode=3  # the name of a directory
+                        # only directories are displayed in the dialog
+        )
+        if not root_path:
+            return
+
+        # bring the catalog up to date, only loading the new and modified presets
+        try:
+            catalog = PresetCatalog(root_path[0])
+        except sqlite3.Error as e:
+            self._log_catalog_error(root_path[0], e)
+            return
+        with catalog:
+            try:
+                updated, removed = catalog.refresh()
+            except sqlite3.Error as e:
+                self._log_catalog_error(root_path[0], e)
+                return
+            self.logger.info(self.settings.get('search_presets_refreshed_info').format(
+                updated, removed, catalog.file_path
+            ))
+
+            dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle(self.settings.get('search_presets_title'))
+            dialog.resize(int(self.settings.get('window_width') * 1.5), self.settings.get('window_height'))
+
+            search_edt = QtWidgets.QLineEdit(dialog)
+            search_edt.setPlaceholderText(self.settings.get('search_presets_placeholder'))
+            search_edt.setClearButtonEnabled(True)
+            results = QtWidgets.QTreeWidget(dialog)
+            results.setRootIsDecorated(False)
+            results.setHeaderLabels(["Shot Name", "Start Frame", "End Frame", "Preset", "Export Path"])
+            summary_lbl = QtWidgets.QLabel(dialog)
+
+            buttons = QtWidgets.QDialogButtonBox(
+                QtWidgets.QDialogButtonBox.Open|QtWidgets.QDialogButtonBox.Cancel, parent=dialog
+            )
+            open_btn = buttons.button(QtWidgets.QDialogButtonBox.Open)
+            buttons.accepted.connect(dialog.accept)
+            buttons.rejected.connect(dialog.reject)
+
+            def update_results(text):
+                matches = catalog.search(text)
+                results.clear()
+                for match in matches:
+                    item = QtWidgets.QTreeWidgetItem([
+                        match.shot_name, str(match.start_frame), str(match.end_frame),
+                        os.path.relpath(match.file_path, catalog.root_path), match.export_path or ""
+                    ])
+                    item.setData(0, QtCore.Qt.UserRole, match.file_path)
+                    results.addTopLevelItem(item)
+                summary_lbl.setText(self.settings.get('search_presets_summary').format(
+                    len(matches), len(set(match.file_path for match in matches))
+                ))
+                if matches:
+                    results.setCurrentItem(results.topLevelItem(0))
+                open_btn.setEnabled(bool(matches))
+
+            search_edt.textChanged.connect(update_results)
+            results.itemDoubleClicked.connect(dialog.accept)
+
+            layout = QtWidgets.QVBoxLayout(dialog)
+            layout.addWidget(search_edt)
+            layout.addWidget(results)
+            layout.addWidget(summary_lbl)
+            layout.addWidget(buttons)
+
+            update_results("")
+            accepted = dialog.exec_() == QtWidgets.QDialog.Accepted
+            item = results.currentItem()
+        if not accepted or item is None:
+            return
+
+        # only the chosen preset is loaded
+        self._preset_path = item.data(0, QtCore.Qt.UserRole)
+        preset = self._read_preset(self._preset_path)
+        if preset:
+            self.preset_load(preset)
+
+    def _log_catalog_error(self, root_path, error):
+        """
+        Logs why the preset catalog of a directory couldn't be opened or refreshed.
+
+        :return: None
+        :rtype: None
+        """
+        self.logger.error("{}: \"{}\".".format(
+            self.settings.get('search_presets_catalog_error'), root_path
+        ))
+        self.logger.error(error)
+
+    def _read_preset(self, file_path):
+        """
+        Loads a preset file, logging why it couldn't be loaded, if it failed.
+
+        :param file_path: The path of the preset file.
+        :type file_path: str
+
+        :return: The loaded preset, or None if it failed to load.
+        :rtype: Preset | None
+        """
+        try:
+            return Preset.load(file_path)
+        except IOError:
+            self.logger.error("{}: \"{}\".".format(
+                self.settings.get('load_preset_file_not_found_error'), file_path
+            ))
+        except PresetVersionError:
+            self.logger.error("{}: \"{}\".".format(
+                self.settings.get('load_preset_version_error'), file_path
+            ))
+        except ValueError:
+            self.logger.error("{}: \"{}\".".format(
+                self.settings.get('load_preset_json_decode_error'), file_path
+            ))
+        return None
+
     def shots_data_from_selected(self):
         """
         Prompts the user to apply the shots' data from selection, and sets it in the GUI.
@@ -510,13 +763,31 @@ class Window(Dialog):
 
     def run_export_shots(self):
         """
-        Runs the Maya files' export operation based on the shots data in the GUI.
-        Exists if canceled during scene validation.
+        Queues the Maya files' export operation based on the shots data in the GUI.
+        Exists if canceled during the shots' frame ranges or scene validation.
+        The export runs from Qt's event loop a shot at a time once the exports
+        queued before it are done, see :class:`ExportQueue`, so the GUI stays
+        responsive and more exports can be queued in the meantime.
 
         :return: None
         :rtype: None
         """
-        # validate the scene before export
+        # validate the shots' frame ranges, already indexed by the table as they were edited
+        intervals = self.shots_data_table.intervals
+        invalid, overlaps, gaps = intervals.invalid(), intervals.overlaps(), intervals.gaps()
+        if (invalid or overlaps or gaps) and not self.confirmation_dialog(
+            title=self.settings.get('export_frame_ranges_dialog_title'),
+            message=self.settings.get('export_frame_ranges_dialog_message').format(
+                len(invalid), len(overlaps), len(gaps)
+            )
+        ):
+            return
+
+        # validate the scene before export, the running export reads the main file as saved,
+        # so edits can't be saved under it, they'd be exported in the middle of a sequence
+        if self.export_queue and cmds.file(q=True, modified=True):
+            self.logger.warning(self.settings.get('export_busy_warning'))
+            return
         if cmds.file(q=True, modified=True):
             if not self.confirmation_dialog(
                 title=self.settings.get('export_shots_dialog_title'),
@@ -548,26 +819,255 @@ class Window(Dialog):
         save_as_filetype = ('mayaAscii'
                             if self.settings_filetype_ma_radbtn.isChecked()
                             else 'mayaBinary')
+        mode = 'restore' if self.settings_restore_ckb.isChecked() else 'reload'
+        prune = self.settings_prune_ckb.isChecked()
+        strategy = self.settings_strategy_cmbbox.currentData()
+        roots = None
+        if strategy == 'selected':
+            roots = cmds.ls(sl=True, long=True, type='dagNode')
+            if not roots:
+                self.logger.warning(self.settings.get('export_selected_warning'))
+                return
+        backend = self.settings_backend_cmbbox.currentData()
+        workers = self.settings_workers_spnbox.value()
+
+        # queue the export, prepared and run once the exports queued before it are done
+        job = ExportJob(self._start_export, context={
+            'main_file': main_file,
+            'export_path': self._export_path,
+            'shots_data': self.shots_data_table.shots_data,
+            'incremental': self.settings_incremental_ckb.isChecked(),
+            'normalize': normalize,
+            'save_as_filetype': save_as_filetype,
+            'mode': mode,
+            'prune': prune,
+            'strategy': strategy,
+            'roots': roots,
+            'backend': backend,
+            'workers': workers,
+        })
+        if self.export_queue:
+            self.logger.info(self.settings.get('export_queued_info').format(
+                len(job.context['shots_data']), len(self.export_queue)
+            ))
+        self.export_queue.enqueue(job)
+
+    def _start_export(self, job):
+        """
+        Starts a queued export; plans the shots to export from the main file
+        as it is now, then creates the exporter that exports them.
+
+        :param job: The export job to start.
+        :type job: ExportJob
+
+        :return: The results of the exported shots.
+        :rtype: Iterator[ShotResult | None]
+        """
+        context = job.context
+        main_file = context['main_file']
+        shots_data = context['shots_data']
+        # the shots are planned from the saved main file, as they are exported from it,
+        # the edits made since the export was queued are kept, cancelling it instead
+        job.total = len(shots_data)
+        if cmds.file(q=True, sn=True) != main_file or cmds.file(q=True, modified=True):
+            raise SceneEditedError(
+                "The scene was edited before the export of \"{}\" started.".format(main_file)
+            )
 
-        # run the export operation
-        for shot_data in self.shots_data_table.shots_data.values():
-            shot_name, start_frame, end_frame = shot_data.values()
-
-            if not main_file == cmds.file(q=True, sn=True):
-                cmds.file(main_file, force=True, loadReferenceDepth="all")
-            failed_anim_curves = self.controller.apply_shot(start_frame, end_frame, normalize)
-            if failed_anim_curves:
-                for anim_curve in failed_anim_curves:
-                    self.logger.warning("Skipping \"{}\": {}".format(
-                        anim_curve, self.settings.get('failed_anim_curve_warning')
+        # profile the stages of the run next to the tool's log file, if there is one,
+        # from the planning on, as fingerprinting the shots reads every key of the main file
+        profile_dir = logutil.get_log_dirpath(self.logger)
+        run_profile = profile.Profile(
+            profile.profile_path(profile_dir) if profile_dir else None,
+            main_file=main_file, shots=len(shots_data), mode=context['mode'],
+            prune=context['prune'], strategy=context['strategy'],
+            backend=context['backend'], workers=context['workers'],
+            incremental=context['incremental']
+        )
+        context['profile'] = run_profile.start()
+        # the profile stops with the export, even if the window is closed halfway through it
+        try:
+            context['start_time'] = time.time()
+
+            # skip the shots whose files were exported from the same inputs, see `Manifest`,
+            # the shots exported otherwise are forgotten, as their inputs aren't fingerprinted
+            manifest = Manifest.load(context['export_path'])
+            inputs = None
+            if context['incremental']:
+                with profile.stage('fingerprint'):
+                    inputs = shot_inputs(
+                        shots_data, fingerprint_shots(query_curve_keys(), shots_data),
+                        OrderedDict([
+                            ('MainFile', main_file), ('Normalize', context['normalize']),
+                            ('FileType', context['save_as_filetype']),
+                            ('Strategy', context['strategy']), ('Roots', context['roots']),
+                            ('Prune', context['prune'])
+                        ])
+                    )
+                shots_data, current = manifest.outdated(shots_data, inputs)
+                if current:
+                    self.logger.info(self.settings.get('skipped_shots_info').format(
+                        len(current), ", ".join(current)
                     ))
-            cmds.file(rename=os.path.join(self._export_path, shot_name))
-            cmds.file(save=True, force=True, type=save_as_filetype)
+            context.update(manifest=manifest, inputs=inputs, exported=0, total_size=0)
+            job.total = len(shots_data)
+            run_profile.run_info['exported_shots'] = job.total
+            if not shots_data:
+                run_profile.stop()
+                return iter(())
+
+            # run the export operation, in this session or spread over headless workers,
+            # the workers are polled so that the UI stays responsive while they export
+            options = dict(
+                mode=context['mode'], prune=context['prune'], strategy=context['strategy'],
+                roots=context['roots'], backend=context['backend']
+            )
+            if context['workers'] > 1:
+                exporter = BatchExporter(
+                    main_file, context['export_path'], context['normalize'],
+                    context['save_as_filetype'], workers=context['workers'],
+                    profile_dir=profile_dir, **options
+                )
+                results = exporter.export(shots_data, poll=EXPORT_POLL_SECONDS)
+            else:
+                exporter = ShotExporter(
+                    main_file, context['export_path'], context['normalize'],
+                    context['save_as_filetype'], controller=self.controller,
+                    logger=self.logger, **options
+                )
+                results = exporter.export(shots_data)
+        except BaseException:
+            run_profile.stop()
+            raise
+        return _profiled(results, run_profile)
+
+    def _on_export_started(self, job):
+        """
+        Shows the progress of the export that just started.
+
+        :param job: The started export job.
+        :type job: ExportJob
+
+        :return: None
+        :rtype: None
+        """
+        if self.export_progress is None:
+            self.export_progress = QtWidgets.QProgressDialog(self)
+            self.export_progress.setWindowTitle(self.settings.get('export_progress_title'))
+            self.export_progress.setCancelButtonText(self.settings.get('export_progress_cancel'))
+            # keep the dialog up in between the queued exports
+            self.export_progress.setAutoReset(False)
+            self.export_progress.setAutoClose(False)
+            self.export_progress.setMinimumDuration(0)
+            self.export_progress.canceled.connect(self.export_queue.cancel)
+        self.export_progress.setMaximum(max(job.total, 1))
+        self.export_progress.setValue(0)
+        self.export_progress.setLabelText(self.settings.get('export_progress_label').format(
+            job.total, self.export_queue.pending
+        ))
+        self.export_progress.show()
+
+    def _on_shot_exported(self, job, result):
+        """
+        Logs and records an exported shot, and updates the export's progress.
+
+        :param job: The running export job.
+        :type job: ExportJob
+
+        :param result: The result of the exported shot.
+        :type result: ShotResult
 
-        # finalize
-        cmds.file(main_file, force=True, loadReferenceDepth="all")
-        open_dir(self._export_path)
-        self.logger.info(self.settings.get('export_shots_confirm'))
+        :return: None
+        :rtype: None
+        """
+        context = job.context
+        self._log_export_result(result)
+        inputs = context['inputs']
+        context['manifest'].record(result, inputs.get(result.shot_name) if inputs else None)
+        if not result.error:
+            context['exported'] += 1
+            context['total_size'] += result.file_size or 0
+            self.export_progress.setLabelText(self.settings.get('export_progress_shot_label').format(
+                job.done, job.total, result.shot_name, result.seconds or 0.0,
+                result.curve_count or 0, (result.file_size or 0) / 1048576.0,
+                self.export_queue.pending
+            ))
+        self.export_progress.setValue(job.done)
+
+    def _on_export_finished(self, job):
+        """
+        Wraps up an export that finished, failed or was cancelled;
+        saves its manifest and profile, and logs its summary.
+
+        :param job: The finished export job.
+        :type job: ExportJob
+
+        :return: None
+        :rtype: None
+        """
+        context = job.context
+        if 'manifest' in context:
+            context['manifest'].save()
+        run_profile = context.get('profile')
+        if run_profile is not None:
+            run_profile.stop()
+            if run_profile.file_path:
+                self.logger.info(self.settings.get('export_profile_info').format(
+                    run_profile.file_path
+                ))
+        if isinstance(job.error, SceneEditedError):
+            # the queued exports would reopen the main file over the edits as well
+            self.export_queue.cancel()
+        if not self.export_queue and self.export_progress is not None:
+            self.export_progress.hide()
+
+        if isinstance(job.error, SceneEditedError):
+            self.logger.warning(self.settings.get('export_scene_edited_warning').format(
+                job.done, job.total
+            ))
+        elif job.error:
+            self.logger.error(self.settings.get('export_failed_error').format(job.error))
+        elif job.cancelled:
+            self.logger.warning(self.settings.get('export_cancelled_warning').format(
+                job.done, job.total
+            ))
+        elif not job.total:
+            self.logger.info(self.settings.get('export_up_to_date_info'))
+        else:
+            self.logger.info(self.settings.get('export_summary_info').format(
+                context['exported'], time.time() - context['start_time'],
+                context['total_size'] / 1048576.0
+            ))
+            open_dir(context['export_path'])
+            self.logger.info(self.settings.get('export_shots_confirm'))
+
+    def _log_export_result(self, result):
+        """
+        Logs the result of an exported shot; its file, timing and the curves it skipped or pruned.
+
+        :param result: The result of the exported shot.
+        :type result: ShotResult
+
+        :return: None
+        :rtype: None
+        """
+        if result.error:
+            self.logger.error("Failed to export \"{}\": {}".format(
+                result.shot_name, result.error
+            ))
+            return
+        self.logger.info(self.settings.get('exported_shot_info').format(
+            result.file_path, result.seconds or 0.0, result.curve_count or 0,
+            (result.file_size or 0) / 1048576.0
+        ))
+        if result.pruned_anim_curves:
+            self.logger.info(self.settings.get('pruned_anim_curves_info').format(
+                len(result.pruned_anim_curves), result.shot_name
+            ))
+        for anim_curve in result.failed_anim_curves:
+            self.logger.warning("Skipping \"{}\": {}".format(
+                anim_curve, self.settings.get('failed_anim_curve_warning')
+            ))
 
     def _update_shot_name_display(self):
         """
@@ -644,3 +1144,18 @@ class Window(Dialog):
                 self.rename_shots_num_incr_spnbox.value(),
                 self.rename_shots_num_padd_spnbox.value()
         )
+
+
+def _profiled(results, run_profile):
+    """
+    Yields the results of an export, then stops its profile once the export
+    finished, failed or was closed, e.g. when its queue is cancelled or deleted.
+
+    :yields: The results of the export.
+    :rtype: ShotResult
+    """
+    try:
+        for result in results:
+            yield result
+    finally:
+        run_profile.stop()
@@ -0,0 +1,52 @@
+
+import os
+
+import maya.cmds as cmds
+
+
+PLUGIN_NAME = "gw_modifier_cmd"
+PLUGIN_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plugins", PLUGIN_NAME + ".py"
+)
+COMMAND_NAME = "gwModifierCmd"
+
+# modifiers waiting to be picked up by the plugin's command
+_pending = []
+
+
+def commit(modifier):
+    """
+    Executes an OpenMaya modifier as a single undoable command.
+    Any object with the `doIt()` and `undoIt()` methods of a modifier
+    may be committed, with `doIt()` called again to redo it.
+    The modifier is handed over to the "gwModifierCmd" command of the
+    "gw_modifier_cmd" plugin, which runs it and registers it in Maya's
+    undo queue, so that all of its operations are undone in one step.
+
+    :param modifier: The modifier to execute.
+    :type modifier: maya.api.OpenMaya.MDGModifier
+
+    :return: None
+    :rtype: None
+    """
+    if not cmds.pluginInfo(PLUGIN_NAME, q=True, loaded=True):
+        cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+
+    _pending.append(modifier)
+    try:
+        getattr(cmds, COMMAND_NAME)()
+    finally:
+        # never leave a modifier behind if the command failed
+        del _pending[:]
+
+def take():
+    """
+    Retrieve the modifier that is waiting to be executed.
+    Meant to be called by the plugin's command only.
+
+    :return: The pending modifier.
+    :rtype: maya.api.OpenMaya.MDGModifier
+    """
+    if not _pending:
+        raise RuntimeError("No pending modifier, use `apiundo.commit()` to execute modifiers.")
+    return _pending.pop()
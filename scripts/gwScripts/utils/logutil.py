@@ -66,6 +66,23 @@ def get_logger(module_name, module_filepath=None):
 
     return logger
 
+def get_log_dirpath(logger):
+    """
+    Retrieves the directory of a logger's log file, e.g. to write
+    other run artifacts next to it. The module's log file is preferred
+    over the package's "main" log file, as it's added last.
+
+    :param logger: A logger set up by `get_logger`.
+    :type logger: logging.Logger
+
+    :return: The directory of the logger's log file, or None if it has none.
+    :rtype: str | None
+    """
+    for handler in reversed(logger.handlers):
+        if isinstance(handler, logging.FileHandler):
+            return os.path.dirname(handler.baseFilename)
+    return None
+
 def _get_file_handler(log_filename, log_dirpath, mode='w'):
     """
     Creates and configures a FileHandler for logging.
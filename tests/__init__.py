@@ -0,0 +1,18 @@
+"""
+Headless regression tests for the gwScripts tools, run with any Python interpreter:
+
+    python -m unittest discover tests
+
+The tools are imported against the fake `maya.cmds` of the benchmarks,
+installed once for all the tests, see :func:`fake_maya.install`.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "benchmarks"))
+
+import fake_maya  # noqa: E402
+
+# the fake scene shared by every test, cleared with `SCENE.new()`
+SCENE = fake_maya.install()
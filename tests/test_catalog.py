@@ -0,0 +1,59 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import tests  # noqa: F401, installs the fake Maya
+from gwScripts.tools.shots_data_manager.core import catalog
+from gwScripts.tools.shots_data_manager.core.preset import Preset
+from gwScripts.tools.shots_data_manager.core.shots import Shots
+
+
+class TestPresetCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        shots = Shots()
+        for row, shot_name in enumerate(("sh010_Intro", "sh020_chase", "sh030")):
+            shots.insert_shot(row, shot_name, row * 100, row * 100 + 99)
+        preset = Preset(os.path.join(self.dir_path, "seq.json"))
+        preset.shots = shots
+        preset.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_search(self):
+        with catalog.PresetCatalog(self.dir_path) as presets:
+            self.assertEqual(presets.refresh(), (1, 0))
+            self.assertEqual([match.shot_name for match in presets.search("INTRO")],
+                             ["sh010_Intro"])
+            self.assertEqual([match.shot_name for match in presets.search("0_", frame=150)],
+                             ["sh020_chase"])
+
+    def test_rebuilds_older_versions(self):
+        connection = sqlite3.connect(os.path.join(self.dir_path, catalog.CATALOG_FILENAME))
+        connection.execute("CREATE TABLE presets (id INTEGER PRIMARY KEY)")
+        connection.execute("PRAGMA user_version = {:d}".format(catalog.CATALOG_VERSION - 1))
+        connection.commit()
+        connection.close()
+        with catalog.PresetCatalog(self.dir_path) as presets:
+            self.assertEqual(presets.refresh(), (1, 0))
+            self.assertEqual(len(presets.search()), 3)
+
+    def test_no_name_index(self):
+        # a match within the names can't use an index, which would only slow down the refresh
+        with catalog.PresetCatalog(self.dir_path) as presets:
+            connection = presets._connection
+            indexed = set(
+                column for (index,) in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'shots'"
+                )
+                for _, _, column in connection.execute("PRAGMA index_info({})".format(index))
+            )
+        self.assertNotIn('shot_name', indexed)
+
+
+if __name__ == '__main__':
+    unittest.main()
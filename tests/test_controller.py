@@ -0,0 +1,63 @@
+import unittest
+
+from tests import SCENE
+from gwScripts.tools.shots_data_manager.core.curves import CurveIndex
+from gwScripts.tools.shots_data_manager.ui.controller import Controller
+
+
+class TestPruneShot(unittest.TestCase):
+
+    def setUp(self):
+        SCENE.new()
+        SCENE.add_node('transform', 'ctrl')
+        SCENE.add_curve('ctrl_translateX', [(0, 1.0), (10, 1.0)], node='ctrl')
+        SCENE.add_curve('ctrl_translateY', [(0, 1.0), (10, 1.0)], node='ctrl', angle=30.0)
+        SCENE.add_curve('ctrl_translateZ', [(0, 1.0), (10, 2.0)], node='ctrl')
+        self.curve_index = CurveIndex(['ctrl_translateX', 'ctrl_translateY', 'ctrl_translateZ'])
+
+    def test_prunes_flat_curves(self):
+        pruned = Controller.prune_shot(self.curve_index)
+        self.assertEqual(pruned, ['ctrl_translateX'])
+        self.assertEqual(SCENE.getAttr('ctrl.translateX'), 1.0)
+
+    def test_keeps_sloped_tangents(self):
+        # equal keys with sloped tangents still move in between them
+        Controller.prune_shot(self.curve_index)
+        self.assertEqual(SCENE.keys('ctrl_translateY'), [(0.0, 1.0), (10.0, 1.0)])
+
+    def test_bulk_queries(self):
+        SCENE.reset_calls()
+        Controller.prune_shot(self.curve_index)
+        self.assertEqual(SCENE.calls['keyframe'], 3)
+        self.assertEqual(SCENE.calls['keyTangent'], 2)
+
+    def test_unaligned_curves(self):
+        # curves that weren't cut to the same range are queried one by one
+        SCENE.add_curve('ctrl_rotateX', [(20, 1.0), (30, 1.0)], node='ctrl')
+        self.curve_index = CurveIndex(self.curve_index.curves + ['ctrl_rotateX'])
+        self.assertEqual(Controller.prune_shot(self.curve_index), ['ctrl_translateX', 'ctrl_rotateX'])
+
+    def test_skip(self):
+        self.assertEqual(Controller.prune_shot(self.curve_index, skip=['ctrl_translateX']), [])
+
+
+class TestCurveIndex(unittest.TestCase):
+
+    def setUp(self):
+        SCENE.new()
+        SCENE.add_curve('curveA', [(0, 0.0), (5, 1.0), (10, 0.0)])
+        SCENE.add_curve('curveB', [(0, 0.0), (10, 1.0)])
+        self.curve_index = CurveIndex.from_scene()
+
+    def test_matches_scene(self):
+        self.assertTrue(self.curve_index.matches_scene())
+
+    def test_key_moved_across_curves(self):
+        # the same number of keys in total, over the same range
+        SCENE.cutKey('curveA', t=(5, 5))
+        SCENE.setKeyframe('curveB', t=5)
+        self.assertFalse(self.curve_index.matches_scene())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import logging
+import tempfile
+import unittest
+
+from tests import SCENE
+from bench_export import build_fake_scene
+from gwScripts.tools.shots_data_manager.core import export
+from gwScripts.tools.shots_data_manager.core.shots import Shots
+from gwScripts.tools.shots_data_manager.ui.controller import Controller
+
+
+class _Records(logging.Handler):
+
+    def __init__(self):
+        super(_Records, self).__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestShotExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.roots = build_fake_scene(SCENE, 2, 1, 3, 300)
+        self.dir_path = tempfile.mkdtemp()
+        self.main_file = os.path.join(self.dir_path, "main.ma")
+        SCENE.file(rename=self.main_file)
+        SCENE.file(save=True, type='mayaAscii')
+        self.shots = Shots()
+        for row in range(3):
+            self.shots.insert_shot(row, "shot{:03}".format(row + 1), row * 100, row * 100 + 99)
+        self.records = _Records()
+        self.logger = logging.getLogger("test_export")
+        self.logger.addHandler(self.records)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.records)
+        shutil.rmtree(self.dir_path)
+
+    def exporter(self, **kwargs):
+        kwargs.setdefault('mode', 'restore')
+        return export.ShotExporter(
+            self.main_file, self.dir_path, normalize=0, logger=self.logger, **kwargs
+        )
+
+    def export(self, **kwargs):
+        return list(self.exporter(**kwargs).export(self.shots))
+
+    def test_restores_in_memory(self):
+        for strategy in export.EXPORT_STRATEGIES:
+            results = self.export(strategy=strategy,
+                                  roots=self.roots if strategy == 'selected' else None)
+            self.assertEqual([result.error for result in results], [None] * len(self.shots))
+            self.assertEqual(self.records.messages, [], strategy)
+            self.assertEqual(SCENE.file(q=True, sn=True), self.main_file)
+            self.assertFalse(SCENE.file(q=True, modified=True))
+
+    def test_restores_file_type(self):
+        results = self.export(strategy='save', file_type='mayaBinary')
+        self.assertEqual([result.error for result in results], [None] * len(self.shots))
+        self.assertEqual(SCENE.file(q=True, type=True), ['mayaAscii'])
+
+    def test_keeps_edits_in_between_shots(self):
+        for mode in export.EXPORT_MODES:
+            results = self.exporter(mode=mode).export(self.shots)
+            next(results)
+            SCENE.add_node('transform', 'edit')
+            with self.assertRaises(export.SceneEditedError):
+                next(results)
+            self.assertEqual(SCENE.ls('edit'), ['edit'], mode)
+            SCENE.file(self.main_file, open=True, force=True)
+
+    def test_cancel_keeps_edits(self):
+        results = self.exporter().export(self.shots)
+        next(results)
+        SCENE.add_node('transform', 'edit')
+        results.close()
+        self.assertEqual(SCENE.ls('edit'), ['edit'])
+    def test_failed_shot(self):
+        class FailingController(Controller):
+            @staticmethod
+            def apply_shot(start_frame, *args):
+                result = Controller.apply_shot(start_frame, *args)
+                if start_frame == 100:
+                    raise RuntimeError("Failed to apply the shot.")
+                return result
+
+        for mode in export.EXPORT_MODES:
+            results = self.export(mode=mode, controller=FailingController)
+            self.assertEqual([result.error for result in results],
+                             [None, "Failed to apply the shot.", None], mode)
+            self.assertIsNone(results[1].file_path)
+            self.assertEqual(SCENE.file(q=True, sn=True), self.main_file)
+            self.assertFalse(SCENE.file(q=True, modified=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+import tests  # noqa: F401, installs the fake Maya
+from gwScripts.tools.shots_data_manager.core.intervals import GAP, INVALID, OVERLAP, ShotIntervals
+from gwScripts.tools.shots_data_manager.core.shots import Shots
+
+
+class TestShotIntervals(unittest.TestCase):
+
+    def setUp(self):
+        self.shots = Shots()
+        for row, (start, end) in enumerate([(0, 99), (100, 199), (150, 249), (300, 399), (5, 0)]):
+            self.shots.insert_shot(row, "sh{:03}".format(row), start, end)
+        self.intervals = ShotIntervals(self.shots)
+
+    def test_problems(self):
+        self.assertEqual([self.intervals.problems(row) for row in self.shots],
+                         [set(), {OVERLAP}, {OVERLAP}, {GAP}, {INVALID}])
+        self.assertEqual(self.intervals.overlaps(), [(1, 2)])
+        self.assertEqual(self.intervals.gaps(), [(250, 299)])
+
+    def test_set_shot(self):
+        self.assertEqual(self.intervals.set_shot(2, 200, 299), {0, 1, 2, 3})
+        self.assertEqual(self.intervals.overlaps(), [])
+        self.assertEqual(self.intervals.rows_at(250), [2])
+
+    def test_insert_and_remove_rows(self):
+        shots = Shots.from_columns(*self.shots.columns())
+        shots.insert_rows(1, 2)
+        shots.remove_rows(4, 2)
+        self.assertEqual(shots.columns(), (["sh000", "", "", "sh001", "sh004"],
+                                           [0, 0, 0, 100, 5], [99, 0, 0, 199, 0]))
+        self.assertEqual(ShotIntervals(shots).overlaps(), [(0, 1), (0, 2), (1, 2)])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        ranges = {}
+        intervals = ShotIntervals()
+        for _ in range(500):
+            row = rng.randrange(100)
+            start = rng.randrange(10000)
+            # a few long shots, which overlap most of the others
+            end = start + rng.choice((rng.randrange(-5, 200),) * 20 + (rng.randrange(5000),))
+            ranges[row] = (start, end)
+            intervals.set_shot(row, start, end)
+
+            first = rng.randrange(-100, 10100)
+            last = first + rng.randrange(300)
+            expected = sorted(
+                (start, row) for row, (start, end) in ranges.items()
+                if start <= end and start <= last and end >= first
+            )
+            self.assertEqual(intervals.rows_overlapping(first, last),
+                             [row for _, row in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
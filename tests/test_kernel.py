@@ -0,0 +1,79 @@
+import random
+import unittest
+
+import tests  # noqa: F401, installs the fake Maya
+from gwScripts.tools.shots_data_manager.core import kernel
+
+
+def _curves(curve_count, key_count, seed=0):
+    """
+    :return: Random curves with some empty ones, packed for both kernels.
+    :rtype: tuple[PackedCurves, PackedCurves]
+    """
+    rng = random.Random(seed)
+    curves = []
+    for i in range(curve_count):
+        times = sorted(rng.sample(range(key_count * 10), key_count if i % 5 else 0))
+        curves.append((
+            [float(t) for t in times],
+            [rng.uniform(-100, 100) for _ in times],
+            [rng.choice((2, 5, 17, 18)) for _ in times],
+            [rng.choice((2, 5, 17, 18)) for _ in times],
+        ))
+    return (kernel.PackedCurves.pack(curves, use_numpy=False),
+            kernel.PackedCurves.pack(curves))
+
+def _keys(curves):
+    """
+    :return: The keys of each curve, with their tangents and sources, as lists.
+    :rtype: list[list[tuple]]
+    """
+    keys = []
+    for i in range(len(curves)):
+        start, end = int(curves.offsets[i]), int(curves.offsets[i + 1])
+        keys.append([
+            (float(curves.times[j]), round(float(curves.values[j]), 9),
+             int(curves.in_tangents[j]), int(curves.out_tangents[j]), int(curves.sources[j]))
+            for j in range(start, end)
+        ])
+    return keys
+
+
+class TestTrimCurves(unittest.TestCase):
+
+    def test_scalar_cut(self):
+        curves = kernel.PackedCurves.pack([
+            ([0.0, 10.0, 20.0], [0.0, 10.0, 20.0], [2, 2, 2], [2, 5, 2]),
+            ([], [], [], []),
+        ], use_numpy=False)
+        trimmed = kernel.trim_curves_scalar(curves, 5, 15, adjust_value=-5)
+        self.assertEqual(trimmed.curve(0), ([0.0, 5.0, 10.0], [5.0, 10.0, 10.0]))
+        self.assertEqual(trimmed.curve(1), ([], []))
+        self.assertEqual(trimmed.sources, [-1, 1, -1])
+
+    def test_cut_values(self):
+        curves = kernel.PackedCurves.pack([
+            ([0.0, 10.0], [0.0, 10.0]), ([5.0, 20.0], [1.0, 2.0]),
+        ], use_numpy=False)
+        trimmed = kernel.trim_curves_scalar(curves, 5, 15, cut_values=([4.0, 0.0], [6.0, 1.5]))
+        self.assertEqual(trimmed.curve(0), ([5.0, 10.0, 15.0], [4.0, 10.0, 6.0]))
+        self.assertEqual(trimmed.curve(1), ([5.0, 15.0], [1.0, 1.5]))
+        self.assertEqual(trimmed.sources, [-1, 1, -1, 2, -1])
+
+    @unittest.skipIf(kernel.numpy is None, "NumPy isn't installed.")
+    def test_matches_scalar(self):
+        scalar_curves, packed_curves = _curves(300, 100)
+        cut_values = ([float(i) for i in range(300)], [-float(i) for i in range(300)])
+        for start_frame, end_frame in ((250, 749), (0, 99), (-50, 50), (500, 500)):
+            for values in (None, cut_values):
+                expected = kernel.trim_curves_scalar(
+                    scalar_curves, start_frame, end_frame, 1001 - start_frame, values
+                )
+                actual = kernel.trim_curves(
+                    packed_curves, start_frame, end_frame, 1001 - start_frame, values
+                )
+                self.assertEqual(_keys(expected), _keys(actual), (start_frame, end_frame))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from gwScripts.tools.shots_data_manager.core import mafile
+
+
+_HEADER = ('//Maya ASCII 2022 scene\n//Name: main.ma\nrequires maya "2022";\n'
+           'currentUnit -l centimeter -a degree -t film;\n')
+
+
+def _curve(name, tangents, *statements, **kwargs):
+    """
+    :return: The text of a curve keyed at (0, 0) and (10, 10), or at the given keys,
+        with the given tangent type.
+    :rtype: str
+    """
+    keys = kwargs.get('keys', ((0, 0), (10, 10)))
+    return ''.join([
+        'createNode animCurveTU -n "{}";\n'.format(name),
+        '\tsetAttr ".tan" {};\n\tsetAttr ".wgt" no;\n'.format(tangents),
+        '\tsetAttr -s {0} ".ktv[0:{1}]"  {2};\n'.format(
+            len(keys), len(keys) - 1, " ".join("{} {}".format(*key) for key in keys)
+        ),
+    ] + ['\t{}\n'.format(statement) for statement in statements])
+
+
+class TestMaShotSplitter(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.main_file = os.path.join(self.dir_path, "main.ma")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def split(self, *curves, **kwargs):
+        with open(self.main_file, 'w') as f:
+            f.write(_HEADER + kwargs.get('references', '') + ''.join(curves))
+        splitter = mafile.MaShotSplitter(self.main_file, self.dir_path,
+                                         normalize=kwargs.get('normalize'))
+        result = splitter.export_shot("shot", kwargs.get('start_frame', 5), 10)
+        if result.error:
+            return result, None
+        with open(result.file_path) as f:
+            return result, dict(
+                (kind[1], mafile.AnimCurveBlock(kind[0], kind[1], lines))
+                for kind, lines in mafile._blocks(f) if kind
+            )
+
+    def test_linear(self):
+        _, curves = self.split(_curve("linear", 2))
+        self.assertEqual(curves["linear"].values[0], "5")
+
+    def test_flat(self):
+        _, curves = self.split(_curve("flat", 3), start_frame=2)
+        self.assertAlmostEqual(float(curves["flat"].values[0]), 1.04)
+
+    def test_stored_tangents(self):
+        # flat out of the first key, two units per frame into the second, in seconds
+        _, curves = self.split(_curve(
+            "fixed", 1, 'setAttr -s 2 ".kox[0]"  1;', 'setAttr -s 2 ".koy[0]"  0;',
+            'setAttr -s 2 ".kix[1]"  1;', 'setAttr -s 2 ".kiy[1]"  48;'
+        ))
+        self.assertAlmostEqual(float(curves["fixed"].values[0]), 2.5)
+
+    def test_spline(self):
+        _, curves = self.split(_curve("spline", 4, keys=((0, 0), (10, 10), (20, 30))))
+        self.assertAlmostEqual(float(curves["spline"].values[0]), 4.375)
+
+    def test_auto(self):
+        # flat on the first key and on the peak
+        _, curves = self.split(_curve("auto", 18, keys=((0, 0), (10, 10), (20, 0))),
+                               start_frame=2)
+        self.assertAlmostEqual(float(curves["auto"].values[0]), 1.04)
+
+    def test_unknown_tangents_fail(self):
+        result, _ = self.split(_curve("linear", 2), _curve("slow", 6))
+        self.assertIn("slow", result.error)
+        self.assertIsNone(result.file_path)
+        self.assertFalse(os.path.exists(os.path.join(self.dir_path, "shot.ma")))
+
+    def test_references(self):
+        references = 'file -rdi 1 -ns "char" -rfn "charRN" "char.ma";\n'
+        result, _ = self.split(_curve("linear", 2), references=references)
+        self.assertIsNone(result.error)
+        result, _ = self.split(_curve("linear", 2), references=references, normalize=1001)
+        self.assertIn("referenced", result.error)
+
+    def test_scene_units(self):
+        units = mafile._scene_units(
+            "currentUnit -l meter -a degree -t 29.97fps;", mafile.DEFAULT_UNITS
+        )
+        self.assertEqual(units.fps, 29.97)
+        self.assertEqual(units.linear, 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
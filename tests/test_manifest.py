@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from gwScripts.tools.shots_data_manager.core.manifest import Manifest, fingerprint_shots, shot_inputs
+from gwScripts.tools.shots_data_manager.core.shots import ShotResult, Shots
+
+
+class TestManifestRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir_path, "shot001.ma")
+        with open(self.file_path, 'w') as f:
+            f.write("//Maya ASCII scene")
+        self.result = ShotResult("shot001", self.file_path, [], [], None, 1.0, 10, 18)
+        self.inputs = {'StartFrame': 0, 'EndFrame': 99, 'Fingerprint': "0" * 40}
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def test_record(self):
+        manifest = Manifest(self.dir_path)
+        manifest.record(self.result, self.inputs)
+        self.assertTrue(manifest.is_current("shot001", self.inputs))
+
+    def test_forget_without_inputs(self):
+        # shots exported without fingerprinting their inputs are no longer current
+        manifest = Manifest(self.dir_path)
+        manifest.record(self.result, self.inputs)
+        manifest.record(self.result, None)
+        self.assertNotIn("shot001", manifest)
+
+
+    def test_save(self):
+        manifest = Manifest(self.dir_path)
+        manifest.record(self.result, self.inputs)
+        manifest.save()
+        self.assertTrue(Manifest.load(self.dir_path).is_current("shot001", self.inputs))
+        self.assertEqual(sorted(os.listdir(self.dir_path)), ["shot001.ma", "shots_manifest.json"])
+
+    def test_duplicate_names(self):
+        # shots sharing a name overwrite each other's file, so they're always exported
+        shots = Shots()
+        for row, shot_name in enumerate(["shot001", "shot002", "shot001"]):
+            shots.insert_shot(row, shot_name, row * 100, row * 100 + 99)
+        curve_keys = [("curveA", [0.0, 150.0, 250.0], [0.0, 1.0, 0.0], [(), (), ()])]
+        fingerprints = fingerprint_shots(curve_keys, shots)
+        self.assertEqual(sorted(fingerprints), [0, 1, 2])
+        inputs = shot_inputs(shots, fingerprints, {})
+        self.assertEqual(list(inputs), ["shot002"])
+
+        manifest = Manifest(self.dir_path)
+        manifest.record(self.result, inputs.get("shot001"))
+        outdated, current = manifest.outdated(shots, inputs)
+        self.assertEqual(len(outdated), 3)
+        self.assertEqual(current, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from tests import SCENE  # noqa: F401, installs the fake maya
+from gwScripts.tools.shots_data_manager.core.preset import Preset
+from gwScripts.tools.shots_data_manager.core.shots import Shots
+
+
+class TestPresetLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.dir_path, "preset.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir_path)
+
+    def write(self, text):
+        with open(self.file_path, 'w') as f:
+            f.write(text)
+
+    def test_round_trip(self):
+        shots = Shots()
+        for row in range(3):
+            shots.insert_shot(row, "sh{:03}".format((row + 1) * 10), row * 100, row * 100 + 99)
+        for compact in (False, True):
+            preset = Preset(self.file_path)
+            preset.shots = shots
+            self.assertEqual(preset.save(compact=compact), (True, None))
+            self.assertEqual(Preset.load(self.file_path).shots, shots)
+
+    def test_shot_keys_in_any_order(self):
+        # a hand-edited preset, whose second shot lists its keys in another order
+        self.write(
+            '{"Shots": {'
+            '"0": {"shot_name": "sh010", "start_frame": 0, "end_frame": 99}, '
+            '"1": {"start_frame": 100, "shot_name": "sh020", "end_frame": 199}}}'
+        )
+        shots = Preset.load(self.file_path).shots
+        self.assertEqual([(shots.get_shot_name(row), shots.get_shot_start(row),
+                           shots.get_shot_end(row)) for row in shots],
+                         [("sh010", 0, 99), ("sh020", 100, 199)])
+
+    def test_first_shot_out_of_order(self):
+        self.write(json.dumps({"Shots": {
+            "0": {"end_frame": 99, "start_frame": 0, "shot_name": "sh010"},
+        }}))
+        shots = Preset.load(self.file_path).shots
+        self.assertEqual((shots.get_shot_name(0), shots.get_shot_start(0),
+                          shots.get_shot_end(0)), ("sh010", 0, 99))
+
+    def test_malformed_shot_fails(self):
+        self.write(json.dumps({"Shots": {
+            "0": {"shot_name": "sh010", "start_frame": 0, "end_frame": 99},
+            "1": {"shot_name": "sh020", "start_frame": 100},
+        }}))
+        with self.assertRaises(ValueError):
+            Preset.load(self.file_path)
+
+    @unittest.skipIf(os.name == 'nt', "File modes are POSIX only.")
+    def test_save_keeps_file_mode(self):
+        umask = os.umask(0o022)
+        try:
+            preset = Preset(self.file_path)
+            preset.save()
+            self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o644)
+            os.chmod(self.file_path, 0o600)
+            preset.save()
+            self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o600)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.listdir(self.dir_path), ["preset.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
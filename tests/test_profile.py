@@ -0,0 +1,38 @@
+import unittest
+
+from tests import SCENE
+from gwScripts.tools.shots_data_manager.core import profile
+from gwScripts.tools.shots_data_manager.core.curves import CurveIndex
+from gwScripts.tools.shots_data_manager.ui.controller import Controller
+
+
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        SCENE.new()
+        SCENE.add_curve('curveA', [(0, 0.0), (10, 1.0), (20, 0.0)])
+
+    def test_counts_commands(self):
+        with profile.Profile() as run_profile:
+            with profile.shot("sh010"):
+                Controller.apply_shot(5, 15, None, CurveIndex.from_scene())
+        self.assertEqual(run_profile.command_counts['cutKey'], 2)
+        commands = run_profile.commands
+
+        # the profile no longer counts, nor records stages, once stopped
+        Controller.apply_shot(5, 15, None, CurveIndex.from_scene())
+        run_profile.stop()
+        self.assertEqual(run_profile.commands, commands)
+        self.assertIs(profile.stage('key'), profile._NO_STAGE)
+
+    def test_summary_leaves_out_parent_stages(self):
+        with profile.Profile() as run_profile:
+            with profile.shot("sh010"):
+                Controller.apply_shot(5, 15, None, CurveIndex.from_scene())
+        stages = [row[0] for row in profile.summarize({'run': run_profile.records})]
+        self.assertNotIn('shot', stages)
+        self.assertIn('cut', stages)
+
+
+if __name__ == '__main__':
+    unittest.main()